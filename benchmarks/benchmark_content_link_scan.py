@@ -0,0 +1,69 @@
+"""
+Benchmark scanning note content for local file links.
+
+Compares building separate soups for img and href links and then running the markdown link regex, the approach
+used before scan_content_for_local_links, with the single pass scanner.  Generated markdown notes contain a mix of
+markdown links, html img and a tags, web links and ordinary html so the scanners have realistic text to skip over.
+
+Run from the root of the project
+
+    PYTHONPATH=src python benchmarks/benchmark_content_link_scan.py
+    PYTHONPATH=src python benchmarks/benchmark_content_link_scan.py --links 10 100 1000 --repeat 20
+
+"""
+import argparse
+import timeit
+
+import content_link_management
+
+
+def make_note_content(number_of_links):
+    lines = []
+    for n in range(number_of_links):
+        lines.append(f'<p>Paragraph {n} with <strong>some</strong> text and a <span>span</span>.</p>')
+        link_type = n % 4
+        if link_type == 0:
+            lines.append(f'<img src="attachments/image%20{n}.png" width="200" />')
+        elif link_type == 1:
+            lines.append(f'<a href="attachments/file%20{n}.pdf">file {n}</a>')
+        elif link_type == 2:
+            lines.append(f'![attachment {n}](attachments/attachment%20{n}.pdf "tool tip")')
+        else:
+            lines.append(f'<a href="https://www.example.com/page/{n}">web link {n}</a>')
+
+    return '\n'.join(lines)
+
+
+def scan_with_separate_soups(content):
+    return (content_link_management.set_of_html_img_file_paths_from(content)
+            | content_link_management.set_of_html_href_file_paths_from(content)
+            | content_link_management.set_of_markdown_file_paths_from(content))
+
+
+def scan_in_one_pass(content):
+    local_links = content_link_management.scan_content_for_local_links(content)
+    return local_links.img | local_links.href | local_links.markdown
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark scanning note content for local file links.')
+    parser.add_argument('--links', type=int, nargs='+', default=[10, 100, 1000],
+                        help='number of links in the generated note content for each run')
+    parser.add_argument('--repeat', type=int, default=20, help='number of times each note is scanned')
+    args = parser.parse_args()
+
+    print(f'{"links":>8} {"found":>8} {"soups ms":>10} {"one pass ms":>12} {"speed up":>9}')
+    for number_of_links in args.links:
+        content = make_note_content(number_of_links)
+        found = scan_with_separate_soups(content)
+        if scan_in_one_pass(content) != found:
+            raise RuntimeError('scan_content_for_local_links found different links')
+
+        soups = timeit.timeit(lambda: scan_with_separate_soups(content), number=args.repeat) / args.repeat
+        one_pass = timeit.timeit(lambda: scan_in_one_pass(content), number=args.repeat) / args.repeat
+        print(f'{number_of_links:>8} {len(found):>8} {soups * 1e3:>10.2f} {one_pass * 1e3:>12.2f} '
+              f'{soups / one_pass:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
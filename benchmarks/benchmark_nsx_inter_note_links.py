@@ -0,0 +1,85 @@
+"""
+Benchmark resolving links between nsx note pages with NSXInterNoteLinkProcessor.
+
+Generates note pages that each link to a number of other pages, some by title and some using renamed link text that
+can only be matched using the link id, and times building, matching and resolving the links as the number of notes
+grows.  With indexed matching the time per link should stay roughly constant as the number of notes doubles.
+
+Run from the root of the project
+
+    PYTHONPATH=src python benchmarks/benchmark_nsx_inter_note_links.py
+    PYTHONPATH=src python benchmarks/benchmark_nsx_inter_note_links.py --notes 1000 2000 4000 8000 --links 5
+
+"""
+import argparse
+from dataclasses import dataclass
+import random
+import time
+
+from nsx_inter_note_link_processor import NSXInterNoteLinkProcessor
+
+
+@dataclass
+class BenchmarkNotePage:
+    title: str
+    original_title: str
+    raw_content: str
+    parent_notebook_id: str
+    notebook_folder_name: str
+    file_name: str
+
+
+def make_note_pages(number_of_notes, links_per_note, renamed_link_ratio=0.2, seed=1):
+    randomiser = random.Random(seed)
+    titles = [f'Page {n} title' for n in range(number_of_notes)]
+    note_pages = []
+    for n, title in enumerate(titles):
+        links = []
+        for _ in range(links_per_note):
+            target = randomiser.randrange(number_of_notes)
+            link_text = titles[target]
+            if randomiser.random() < renamed_link_ratio:
+                link_text = f'Page {target} renamed'
+            links.append(f'<div><a href="notestation://remote/self/id-{target}">{link_text}</a></div>')
+
+        notebook = f'notebook-{n % 10}'
+        note_pages.append(BenchmarkNotePage(title=title,
+                                            original_title=title,
+                                            raw_content=f'<div>{title}</div>{"".join(links)}',
+                                            parent_notebook_id=notebook,
+                                            notebook_folder_name=notebook,
+                                            file_name=f'page-{n}-title.md',
+                                            ))
+    return note_pages
+
+
+def time_link_resolution(note_pages):
+    start = time.perf_counter()
+    link_processor = NSXInterNoteLinkProcessor()
+    link_processor.make_list_of_links(note_pages)
+    link_processor.match_link_title_to_notes(note_pages)
+    link_processor.match_renamed_links_using_link_ref_id()
+    return time.perf_counter() - start, len(link_processor.replacement_links)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark nsx inter note link matching.')
+    parser.add_argument('--notes', type=int, nargs='+', default=[1000, 2000, 4000, 8000],
+                        help='number of note pages to generate for each run')
+    parser.add_argument('--links', type=int, default=5, help='number of links in each note page')
+    args = parser.parse_args()
+
+    previous = None
+    print(f'{"notes":>8} {"links":>8} {"matched":>8} {"seconds":>9} {"us/link":>8} {"scaling":>8}')
+    for number_of_notes in args.notes:
+        note_pages = make_note_pages(number_of_notes, args.links)
+        seconds, matched = time_link_resolution(note_pages)
+        number_of_links = number_of_notes * args.links
+        scaling = f'{seconds / previous:.2f}x' if previous else ''
+        print(f'{number_of_notes:>8} {number_of_links:>8} {matched:>8} {seconds:>9.3f} '
+              f'{seconds / number_of_links * 1e6:>8.1f} {scaling:>8}')
+        previous = seconds
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import os
+from pathlib import Path
+import shutil
+import sys
+import threading
+
+import config
+import file_stat_cache
+
+
+def what_module_is_this():
+    return __name__
+
+
+FICLONE = 0x40049409  # linux ioctl request to reflink a file, from linux/fs.h
+
+
+def copy_file(source: Path, target: Path):
+    shutil.copy(source, target)
+
+
+def hardlink_file(source: Path, target: Path):
+    """Hard link target to source, copying the file if a link can not be made, for example across file systems"""
+    try:
+        if os.path.lexists(target):
+            os.unlink(target)
+        os.link(source, target)
+    except OSError:
+        shutil.copy(source, target)
+
+
+def reflink_file(source: Path, target: Path):
+    """
+    Make target a copy on write clone of source where supported, otherwise copy the file.
+
+    The clone is made in a temporary file that then replaces target, so a target that is a hard link to the source,
+    from an earlier conversion using hardlink, is replaced rather than the shared file being truncated.
+    """
+    temporary_target = Path(target).with_name(f'.{Path(target).name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        if not _clone_file(source, temporary_target):
+            shutil.copy(source, temporary_target)
+        os.replace(temporary_target, target)
+    finally:
+        if os.path.lexists(temporary_target):
+            os.unlink(temporary_target)
+
+
+def _clone_file(source: Path, target: Path) -> bool:
+    if not sys.platform.startswith('linux'):
+        return False
+
+    try:
+        import fcntl
+        with open(source, 'rb') as source_file, open(target, 'wb') as target_file:
+            fcntl.ioctl(target_file.fileno(), FICLONE, source_file.fileno())
+        shutil.copymode(source, target)
+    except OSError:
+        return False
+
+    return True
+
+
+COPY_FUNCTIONS = {
+    'copy': copy_file,
+    'hardlink': hardlink_file,
+    'reflink': reflink_file,
+}
+
+
+class AttachmentCopier:
+    """
+    Copy attachments from the source folder to the same relative location in the export folder.
+
+    Each attachment is copied once however many notes link to it.  Target folders are created once, in the calling
+    thread, and the copies are made on a pool of threads as copying is dominated by file IO.  Call wait, or use
+    the copier as a context manager, to wait for the copies to finish.
+
+    Parameters
+    ----------
+    source_absolute_root : Path
+        Folder the attachments are copied from.
+    export_folder_absolute : Path
+        Folder the attachments are copied to.
+    copy_mode : str
+        'copy', 'hardlink' or 'reflink'.  Links fall back to copying the file if they can not be made.
+    max_workers : int
+        Optional maximum number of copy threads.
+
+    """
+    def __init__(self, source_absolute_root: Path, export_folder_absolute: Path, copy_mode: str = 'copy',
+                 max_workers=None):
+        self.logger = logging.getLogger(f'{config.yanom_globals.app_name}.'
+                                        f'{what_module_is_this()}.'
+                                        f'{self.__class__.__name__}'
+                                        )
+        self.logger.setLevel(config.yanom_globals.logger_level)
+        self._source_absolute_root = source_absolute_root
+        self._export_folder_absolute = export_folder_absolute
+        self._copy_file = COPY_FUNCTIONS[copy_mode]
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='attachment_copy')
+        self._scheduled_attachments = set()
+        self._created_folders = set()
+        self._copies = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.wait()
+
+    @property
+    def copy_count(self):
+        return len(self._copies)
+
+    def schedule(self, attachment: Path):
+        """Schedule a copy of an attachment unless it has already been scheduled during this run"""
+        if attachment in self._scheduled_attachments:
+            return
+
+        self._scheduled_attachments.add(attachment)
+
+        if not file_stat_cache.is_file(attachment):
+            self.logger.warning(f'Unable to copy attachment "{attachment}" - It does not exist or is a directory.')
+            return
+
+        target = Path(self._export_folder_absolute, attachment.relative_to(self._source_absolute_root))
+        if target.parent not in self._created_folders:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            self._created_folders.add(target.parent)
+
+        self._copies.append(self._executor.submit(self._copy, attachment, target))
+
+    def _copy(self, attachment: Path, target: Path):
+        try:
+            self._copy_file(attachment, target)
+        except OSError as e:
+            self.logger.warning(f'Unable to copy attachment "{attachment}" - {e}')
+
+    def wait(self):
+        """Wait for all scheduled copies to finish"""
+        self._executor.shutdown(wait=True)
+        for copy in self._copies:
+            copy.result()
@@ -0,0 +1,143 @@
+import base64
+from functools import lru_cache
+import hashlib
+import importlib
+from importlib import metadata
+import json
+import logging
+from pathlib import Path
+import threading
+from typing import Optional
+
+import config
+from disk_cache import DiskCache
+
+
+def what_module_is_this():
+    return __name__
+
+
+_cache = None
+
+
+def _library_version(library_name):
+    # read from the package metadata so charts in the cache are reused without importing matplotlib or pandas
+    try:
+        return metadata.version(library_name)
+    except metadata.PackageNotFoundError:
+        # frozen packages may not include the package metadata
+        return importlib.import_module(library_name).__version__
+
+
+@lru_cache(maxsize=None)
+def _library_versions():
+    return [_library_version('matplotlib'), _library_version('pandas')]
+
+
+class ChartCache:
+    """
+    Cache of the png image, csv data and html data table generated for a chart.
+
+    Notes copied from a template often contain identical charts, so the parts generated for a chart are kept keyed
+    by a hash of the chart configuration and data, and are reused for every other chart with the same configuration
+    and data.  Parts are held in memory for the conversion and, optionally, in a size bounded on disk cache that is
+    used by later conversions.
+
+    Parameters
+    ----------
+    cache_directory : Path
+        Optional folder of the on disk cache, if None charts are only cached in memory.
+    max_size_bytes : int
+        Maximum size of the on disk cache.
+
+    """
+    def __init__(self, cache_directory: Optional[Path] = None, max_size_bytes: int = 0):
+        self.logger = logging.getLogger(f'{config.yanom_globals.app_name}.'
+                                        f'{what_module_is_this()}.'
+                                        f'{self.__class__.__name__}'
+                                        )
+        self.logger.setLevel(config.yanom_globals.logger_level)
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._disk_cache = None
+        self.renders_avoided = 0
+        if cache_directory is not None:
+            try:
+                self._disk_cache = DiskCache(cache_directory, max_size_bytes)
+            except OSError as e:
+                self.logger.warning(f"Unable to use chart cache directory {cache_directory} - {e}")
+
+    @staticmethod
+    def make_key(*chart_details) -> str:
+        """Return a key for a chart from its configuration, data and the options used to generate it"""
+        # the library versions are included as they can change the rendered image
+        key_data = json.dumps([_library_versions(), chart_details], sort_keys=True, default=str)
+        return hashlib.sha256(key_data.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> dict:
+        """Return the cached parts of a chart, 'png', 'csv' and 'table', an empty dictionary if none are cached"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is None and self._disk_cache:
+            entry = self._read_from_disk(key)
+            if entry:
+                with self._lock:
+                    self._entries.setdefault(key, entry)
+
+        return dict(entry or {})
+
+    def update(self, key: str, **parts):
+        """Add the parts generated for a chart, pass all of them in one call so the chart is written to disk once"""
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            entry.update(parts)
+            entry = dict(entry)
+
+        if self._disk_cache:
+            self._write_to_disk(key, entry)
+
+    def record_render_avoided(self):
+        with self._lock:
+            self.renders_avoided += 1
+
+    def _read_from_disk(self, key: str) -> dict:
+        entry_text = self._disk_cache.get(key)
+        if entry_text is None:
+            return {}
+
+        try:
+            entry = json.loads(entry_text)
+            if 'png' in entry:
+                entry['png'] = base64.b64decode(entry['png'])
+        except (ValueError, TypeError) as e:
+            self.logger.warning(f"Ignoring unreadable chart cache entry {key} - {e}")
+            return {}
+
+        return entry
+
+    def _write_to_disk(self, key: str, entry: dict):
+        if 'png' in entry:
+            entry['png'] = base64.b64encode(entry['png']).decode('ascii')
+
+        self._disk_cache.put(key, json.dumps(entry))
+
+
+def start(cache_directory: Optional[Path] = None, max_size_bytes: int = 0) -> ChartCache:
+    """Start a new chart cache, returned by current() until end() is called"""
+    global _cache
+    _cache = ChartCache(cache_directory, max_size_bytes)
+    return _cache
+
+
+def end():
+    global _cache
+    _cache = None
+
+
+def current() -> ChartCache:
+    """Return the chart cache in use, starting an in memory cache if none has been started"""
+    if _cache is None:
+        start()
+
+    return _cache
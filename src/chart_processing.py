@@ -1,15 +1,14 @@
 from abc import ABC, abstractmethod
 import ast
+from concurrent.futures import Future
 import io
 import logging
 import re
 
-from bs4 import BeautifulSoup
-import matplotlib.pyplot as pyplot
-import pandas as pd
-
+import chart_cache
+import chart_renderer
 import config
-from helper_functions import add_strong_between_tags
+from helper_functions import add_strong_between_tags, make_soup_from_html
 from sn_attachment import ChartStringNSAttachment, ChartImageNSAttachment
 
 
@@ -56,7 +55,7 @@ class ChartProcessor(ABC):
         self._create_csv = create_csv
         self._create_data_table = create_data_table
         self._processed_html = self._raw_html
-        self._soup = BeautifulSoup(self._raw_html, 'html.parser')
+        self._soup = make_soup_from_html(self._raw_html, html_parser='html.parser')
         self._attachments = {}
         self._charts = []  # used for regression testing
         self._chart_config = {}
@@ -86,9 +85,13 @@ class ChartProcessor(ABC):
             self._charts.append(chart)
             self._set_chart_config(chart)
             self._retrieve_chart_data(tag, chart)
-            self._create_required_replacement_chart_elements(chart)
+            self._create_required_replacement_chart_elements(chart, self._chart_cache_key(tag))
             self._add_new_chart_elements_to_html(tag, chart)
 
+    @abstractmethod
+    def _chart_cache_key(self, tag):  # pragma: no cover
+        pass
+
     def _add_new_chart_elements_to_html(self, tag, chart):
         search_for = str(tag)
         replace_with = self._new_chart_elements_html(chart)
@@ -97,25 +100,49 @@ class ChartProcessor(ABC):
     def _new_chart_elements_html(self, chart):
         elements_to_add = ''
         if self._create_image:
-            elements_to_add = elements_to_add + f"<p>{self._note.attachments[f'{id(chart)}.png'].html_link}</p>"
+            elements_to_add = elements_to_add \
+                              + f"<p>{self._note.attachments[self._chart_file_name(chart, 'png')].html_link}</p>"
         if self._create_csv:
-            elements_to_add = elements_to_add + f"<p>{self._note.attachments[f'{id(chart)}.csv'].html_link}</p>"
+            elements_to_add = elements_to_add \
+                              + f"<p>{self._note.attachments[self._chart_file_name(chart, 'csv')].html_link}</p>"
         if self._create_data_table:
             elements_to_add = elements_to_add + f"<p>{chart.html_chart_data_table}</p>"
 
         return elements_to_add
 
-    def _create_required_replacement_chart_elements(self, chart):
+    def _create_required_replacement_chart_elements(self, chart, cache_key):
+        cache = chart_cache.current()
+        cached_parts = cache.get(cache_key)
+        generated_parts = {}
+
         if self._create_image:
+            if 'png' in cached_parts:
+                chart.use_rendered_png(cached_parts['png'])
+                cache.record_render_avoided()
             chart.plot_chart()
             self._generate_png_attachment(chart)
 
         if self._create_csv:
-            chart.make_csv_chart_data_string()
+            if 'csv' in cached_parts:
+                chart.set_csv_chart_data_string(cached_parts['csv'])
+            else:
+                chart.make_csv_chart_data_string()
+                generated_parts['csv'] = chart.csv_chart_data_string
             self._generate_csv_attachment(chart)
 
         if self._create_data_table:
-            chart.make_html_chart_data_table()
+            if 'table' in cached_parts:
+                chart.set_html_chart_data_table(cached_parts['table'])
+            else:
+                chart.make_html_chart_data_table()
+                generated_parts['table'] = chart.html_chart_data_table
+
+        # the generated parts are added together so the chart is written to the cache once
+        if self._create_image and 'png' not in cached_parts:
+            chart_renderer.when_rendered(chart.png_render,
+                                         lambda png: cache.update(cache_key, png=png, **generated_parts))
+        elif generated_parts:
+            cache.update(cache_key, **generated_parts)
 
     @abstractmethod
     def _create_chart_object(self):  # pragma: no cover
@@ -134,19 +161,23 @@ class ChartProcessor(ABC):
     def _set_chart_config(self, chart):  # pragma: no cover
         pass
 
+    def _chart_file_name(self, chart, suffix):
+        # named from the note id and chart position so names are unique and the same on every run
+        return f"{self._note.note_id}-chart-{self._charts.index(chart) + 1}.{suffix}"
+
     def _generate_csv_attachment(self, chart):
         self.logger.debug("Generate chart csv file")
-        self._note.attachments[f"{id(chart)}.csv"] = ChartStringNSAttachment(self._note, f"{id(chart)}.csv",
-                                                                             chart.csv_chart_data_string)
-        self._note.attachments[f"{id(chart)}.csv"].process_attachment()
+        file_name = self._chart_file_name(chart, 'csv')
+        self._note.attachments[file_name] = ChartStringNSAttachment(self._note, file_name,
+                                                                    chart.csv_chart_data_string)
+        self._note.attachments[file_name].process_attachment()
         self._note.attachment_count += 1
 
     def _generate_png_attachment(self, chart):
         self.logger.debug("Generate chart image attachment")
-
-        self._note.attachments[f"{id(chart)}.png"] = ChartImageNSAttachment(self._note, f"{id(chart)}.png",
-                                                                            chart.png_img_buffer)
-        self._note.attachments[f"{id(chart)}.png"].process_attachment()
+        file_name = self._chart_file_name(chart, 'png')
+        self._note.attachments[file_name] = ChartImageNSAttachment(self._note, file_name, chart.png_render)
+        self._note.attachments[file_name].process_attachment()
         self._note.image_count += 1
 
     @property
@@ -169,20 +200,25 @@ class ChartProcessor(ABC):
             self.y_category_labels = []
             self._csv_chart_data_string = str
             self._html_chart_data_table = str
-            self._chart_fig = None
-            self._png_img_buffer = None
+            self._png_render = None
+            self._rendered_png = None
 
         @abstractmethod
         def plot_chart(self):  # pragma: no cover
+            """Start rendering the chart image, the png data is available from png_render once rendered"""
             pass
 
-        @staticmethod
-        def fig_to_img_buf(fig):
-            """Convert a Matplotlib figure to png format in an io.Bytes buffer and return it"""
-            buf = io.BytesIO()
-            fig.savefig(buf, format='png')  # png is often smaller than jpeg for plots
-            buf.seek(0)
-            return buf
+        def use_rendered_png(self, png):
+            """Use the png data of an identical chart rendered earlier instead of rendering the chart again"""
+            self._rendered_png = png
+
+        def _render(self, draw, *args):
+            if self._rendered_png is None:
+                return chart_renderer.render(draw, *args)
+
+            rendered = Future()
+            rendered.set_result(self._rendered_png)
+            return rendered
 
         @staticmethod
         def remove_chart_frame(ax):
@@ -192,10 +228,11 @@ class ChartProcessor(ABC):
             ax.spines['left'].set_visible(False)
             return ax
 
-        def set_title_and_axes(self, ax):
-            ax.set_title(self._x_axis_title, y=-0.15, fontdict=None)
-            ax.set_ylabel(self._y_axis_title)
-            ax.set_ylim(self._df.min().min() * 0.9, self._df.max().max() * 1.1)
+        @staticmethod
+        def set_title_and_axes(ax, df, x_axis_title, y_axis_title):
+            ax.set_title(x_axis_title, y=-0.15, fontdict=None)
+            ax.set_ylabel(y_axis_title)
+            ax.set_ylim(df.min().min() * 0.9, df.max().max() * 1.1)
             return ax
 
         def make_html_chart_data_table(self):
@@ -219,13 +256,28 @@ class ChartProcessor(ABC):
         def set_df(self, value):
             self._df = value
 
+        def set_csv_chart_data_string(self, value):
+            self._csv_chart_data_string = value
+
+        def set_html_chart_data_table(self, value):
+            self._html_chart_data_table = value
+
         @property
         def csv_chart_data_string(self):
             return self._csv_chart_data_string
 
+        @property
+        def png_render(self):
+            """Future of the png data of the chart image"""
+            return self._png_render
+
         @property
         def png_img_buffer(self):
-            return self._png_img_buffer
+            """The chart image as png in an io.BytesIO buffer, waiting for the chart to be rendered if need be"""
+            if self._png_render is None:
+                return None
+
+            return io.BytesIO(self._png_render.result())
 
         @property
         def html_chart_data_table(self):
@@ -239,38 +291,43 @@ class ChartProcessor(ABC):
         def plot_chart(self):
             self.logger.debug("Creating pie chart")
             self.__format_data_for_pie_chart()
-            explode = [0.02 for _ in range(len(self._df.index))]
-            fig, ax = pyplot.subplots()
-            pyplot.title(self._title)
-            pyplot.gca().axis("equal")
-            pie = pyplot.pie(self._df['sum'], autopct='%1.2f%%', pctdistance=1.2, explode=explode)
-            labels = self.y_category_labels
-            pyplot.legend(pie[0], labels, bbox_to_anchor=(1, 1), loc="upper right",
-                          bbox_transform=pyplot.gcf().transFigure)
-            self._png_img_buffer = self.fig_to_img_buf(fig)
+            self._png_render = self._render(self.draw_pie_chart, self._title, self._df['sum'],
+                                            self.y_category_labels)
+
+        @staticmethod
+        def draw_pie_chart(fig, ax, title, sums, labels):
+            explode = [0.02 for _ in range(len(sums.index))]
+            ax.set_title(title)
+            ax.axis("equal")
+            pie = ax.pie(sums, autopct='%1.2f%%', pctdistance=1.2, explode=explode)
+            ax.legend(pie[0], labels, bbox_to_anchor=(1, 1), loc="upper right", bbox_transform=fig.transFigure)
 
     class LineChart(Chart):
         def plot_chart(self):
             self.logger.debug("Creating line chart")
-            df_transposed = self._df.copy().T
-            fig2, ax = pyplot.subplots()
-            ax = self.set_title_and_axes(ax)
-            ax = self.remove_chart_frame(ax)
+            self._png_render = self._render(self.draw_line_chart, self._df, self._title,
+                                            self._x_axis_title, self._y_axis_title)
+
+        @staticmethod
+        def draw_line_chart(fig, ax, df, title, x_axis_title, y_axis_title):
+            df_transposed = df.copy().T
+            ax = ChartProcessor.Chart.set_title_and_axes(ax, df, x_axis_title, y_axis_title)
+            ax = ChartProcessor.Chart.remove_chart_frame(ax)
             x_ticks = [x for x in range(len(df_transposed.index))]
-            plot = df_transposed.plot(kind='line', grid=True, ax=ax, rot=0, xticks=x_ticks, title=self._title)
-            fig = plot.get_figure()
-            self._png_img_buffer = self.fig_to_img_buf(fig)
+            df_transposed.plot(kind='line', grid=True, ax=ax, rot=0, xticks=x_ticks, title=title)
 
     class BarChart(Chart):
         def plot_chart(self):
             self.logger.debug("Creating bar chart")
-            df_transposed = self._df.copy().T
-            fig2, ax = pyplot.subplots()
-            ax = self.set_title_and_axes(ax)
-            ax = self.remove_chart_frame(ax)
-            plot = df_transposed.plot(kind='bar', grid=True, ax=ax, rot=0, title=self._title)
-            fig = plot.get_figure()
-            self._png_img_buffer = self.fig_to_img_buf(fig)
+            self._png_render = self._render(self.draw_bar_chart, self._df, self._title,
+                                            self._x_axis_title, self._y_axis_title)
+
+        @staticmethod
+        def draw_bar_chart(fig, ax, df, title, x_axis_title, y_axis_title):
+            df_transposed = df.copy().T
+            ax = ChartProcessor.Chart.set_title_and_axes(ax, df, x_axis_title, y_axis_title)
+            ax = ChartProcessor.Chart.remove_chart_frame(ax)
+            df_transposed.plot(kind='bar', grid=True, ax=ax, rot=0, title=title)
 
 
 class NSXChartProcessor(ChartProcessor):
@@ -292,8 +349,13 @@ class NSXChartProcessor(ChartProcessor):
         raw_data = ast.literal_eval(raw_data)
         chart.x_category_labels = raw_data.pop(0)[1:]
         chart.y_category_labels = [item.pop(0) for item in raw_data]
+        import pandas as pd  # imported when a chart is found as it is slow to import
         chart.set_df(pd.DataFrame(raw_data, columns=chart.x_category_labels, index=chart.y_category_labels))
 
+    def _chart_cache_key(self, tag):
+        return chart_cache.ChartCache.make_key(self._chart_config, tag.attrs['chart-data'], self._create_image,
+                                               self._create_csv, self._create_data_table)
+
     def _set_chart_config(self, chart):
         chart.set_title(self._chart_config['title'])
         chart.set_x_axis_title(self._chart_config['xAxisTitle'])
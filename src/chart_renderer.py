@@ -0,0 +1,185 @@
+import concurrent.futures
+from concurrent.futures import Future, ProcessPoolExecutor
+import io
+import logging
+import threading
+
+import config
+
+
+def what_module_is_this():
+    return __name__
+
+
+_renderer = None
+
+
+def _pyplot():
+    """Import pyplot using the Agg backend, matplotlib is slow to import so is imported when a chart is rendered"""
+    import matplotlib
+    matplotlib.use('Agg')  # charts are only saved as png files so no gui backend or display is needed
+    from matplotlib import pyplot
+    return pyplot
+
+
+def render_png(draw, *args) -> bytes:
+    """Draw a chart on a new figure, using draw(figure, axes, *args), and return it as png data"""
+    pyplot = _pyplot()
+    figure, axes = pyplot.subplots()
+    try:
+        draw(figure, axes, *args)
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format='png')  # png is often smaller than jpeg for plots
+        return buffer.getvalue()
+    finally:
+        pyplot.close(figure)  # pyplot keeps every open figure so they are closed once saved
+
+
+class ChartRenderer:
+    """
+    Render chart images to png, either as they are requested or on a pool of worker processes.
+
+    render() returns a Future of the png data.  With no workers the chart is rendered before render() returns, with
+    workers the chart is rendered while the caller carries on, for example converting the note the chart is in.
+    Each chart is drawn on a new figure which is closed once saved.
+
+    Parameters
+    ----------
+    workers : int
+        Number of worker processes, 0 renders charts in the calling process.  The pool is started when the first
+        chart is rendered.
+
+    """
+    def __init__(self, workers=0):
+        self.logger = logging.getLogger(f'{config.yanom_globals.app_name}.'
+                                        f'{what_module_is_this()}.'
+                                        f'{self.__class__.__name__}'
+                                        )
+        self.logger.setLevel(config.yanom_globals.logger_level)
+        self._workers = workers
+        self._executor = None
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+
+    def render(self, draw, *args) -> Future:
+        """Return a Future of the png data of the chart drawn by draw(figure, axes, *args)"""
+        if not self._workers:
+            rendered = Future()
+            rendered.set_result(render_png(draw, *args))
+            return rendered
+
+        if self._executor is None:
+            self.logger.debug(f'Starting {self._workers} chart rendering processes')
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+
+        return self._track(self._executor.submit(render_png, draw, *args))
+
+    def when_rendered(self, rendered: Future, store) -> Future:
+        """Call store(png data) once a chart is rendered, returning a Future that is done once store has returned"""
+        stored = Future()
+
+        def store_rendered_chart(_):
+            try:
+                stored.set_result(store(rendered.result()))
+            except Exception as e:
+                stored.set_exception(e)
+
+        self._track(stored)
+        rendered.add_done_callback(store_rendered_chart)
+        return stored
+
+    def when_all_done(self, futures, action) -> Future:
+        """Call action() once every future is done, returning a Future that is done once action has returned"""
+        futures = list(futures)
+        finished = Future()
+        remaining = [len(futures)]
+        remaining_lock = threading.Lock()
+
+        def run_action():
+            try:
+                for future in futures:
+                    future.result()  # action is not called if a render or store failed
+                finished.set_result(action())
+            except Exception as e:
+                finished.set_exception(e)
+
+        def count_done(_):
+            with remaining_lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            run_action()
+
+        self._track(finished)
+        if not futures:
+            run_action()
+        for future in futures:
+            future.add_done_callback(count_done)
+        return finished
+
+    def _track(self, future: Future) -> Future:
+        with self._pending_lock:
+            self._pending.add(future)
+        future.add_done_callback(self._untrack)
+        return future
+
+    def _untrack(self, future: Future):
+        with self._pending_lock:
+            self._pending.discard(future)
+
+    def wait(self, futures=None):
+        """Wait for the given renders, or every render and store not yet finished, raising any error they raised"""
+        if futures is None:
+            with self._pending_lock:
+                futures = set(self._pending)
+
+        concurrent.futures.wait(futures)
+        for future in futures:
+            future.result()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+def start(workers=0) -> ChartRenderer:
+    """Start the chart renderer used by render(), when_rendered(), when_all_done() and wait()"""
+    global _renderer
+    _renderer = ChartRenderer(workers)
+    return _renderer
+
+
+def stop():
+    """Wait for any charts still being rendered and stop the chart renderer"""
+    global _renderer
+    if _renderer is not None:
+        _renderer.wait()
+        _renderer.shutdown()
+    _renderer = None
+
+
+def render(draw, *args) -> Future:
+    if _renderer is None:
+        start()
+
+    return _renderer.render(draw, *args)
+
+
+def when_rendered(rendered: Future, store) -> Future:
+    if _renderer is None:
+        start()
+
+    return _renderer.when_rendered(rendered, store)
+
+
+def when_all_done(futures, action) -> Future:
+    if _renderer is None:
+        start()
+
+    return _renderer.when_all_done(futures, action)
+
+
+def wait(futures=None):
+    if _renderer is not None:
+        _renderer.wait(futures)
@@ -2,9 +2,8 @@ from abc import ABC, abstractmethod
 import logging
 import re
 
-from bs4 import BeautifulSoup
-
 import config
+import helper_functions
 
 
 def what_module_is_this():
@@ -13,7 +12,7 @@ def what_module_is_this():
 
 def enable_checklist_tags(html_content):
     """Enable input tags"""
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = helper_functions.make_soup_from_html(html_content, html_parser='html.parser')
     input_tags = soup.find_all('input', type="checkbox")
     for tag in input_tags:
         del tag['disabled']
@@ -76,7 +75,7 @@ class ChecklistProcessor(ABC):
         self._raw_html = html_content
         self._processed_html = ''
         self._list_of_checklist_items = []
-        self._soup = BeautifulSoup(self._raw_html, 'html.parser')
+        self._soup = helper_functions.make_soup_from_html(self._raw_html, html_parser='html.parser')
         self._checklist_pre_processing()
 
     @property
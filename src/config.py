@@ -11,6 +11,7 @@ class YanomGlobals:
         self._default_export_folder = 'notes'
         self._logger_level = logging.INFO
         self._is_silent = False
+        self._html_parser = 'html.parser'
         self._data_dir = 'data'
         self._version = '1.7.0'
         self._app_sub_name = 'Note-O-Matic'
@@ -47,6 +48,14 @@ class YanomGlobals:
     def is_silent(self, value: bool):
         self._is_silent = value
 
+    @property
+    def html_parser(self):
+        return self._html_parser
+
+    @html_parser.setter
+    def html_parser(self, value: str):
+        self._html_parser = value
+
     @property
     def data_dir(self):
         return self._data_dir
@@ -5,7 +5,6 @@ import sys
 
 import config
 import helper_functions
-from interactive_cli import InvalidConfigFileCommandLineInterface
 from conversion_settings import ConversionSettings
 
 
@@ -91,6 +90,7 @@ class ConfigData(ConfigParser):
             return False
 
     def ask_user_to_choose_new_default_config_file(self):
+        from interactive_cli import InvalidConfigFileCommandLineInterface  # only needed for an invalid config file
         ask_what_to_do = InvalidConfigFileCommandLineInterface()
         what_to_do = ask_what_to_do.run_cli()
         if what_to_do == 'exit':
@@ -176,6 +176,14 @@ class ConfigData(ConfigParser):
         self._conversion_settings.keep_nimbus_row_and_column_headers = \
             self.getboolean('nimbus_options', 'keep_nimbus_row_and_column_headers')
         self._conversion_settings.unrecognised_tag_format = self['nimbus_options']['unrecognised_tag_format']
+        self._conversion_settings.pandoc_workers = self['performance_options']['pandoc_workers']
+        self._conversion_settings.pandoc_cache_size_mb = self['performance_options']['pandoc_cache_size_mb']
+        self._conversion_settings.html_parser = self['performance_options']['html_parser']
+        self._conversion_settings.copy_mode = self['performance_options']['copy_mode']
+        self._conversion_settings.stream_nsx_notes = self.getboolean('performance_options', 'stream_nsx_notes')
+        self._conversion_settings.chart_workers = self['performance_options']['chart_workers']
+        self._conversion_settings.chart_cache_size_mb = self['performance_options']['chart_cache_size_mb']
+        self._conversion_settings.html_fast_path = self.getboolean('performance_options', 'html_fast_path')
 
     def _write_config_file(self):
         ini_path = Path(self.conversion_settings.working_directory, 'data', self._config_file)
@@ -372,6 +380,36 @@ class ConfigData(ConfigParser):
                 'unrecognised_tag_format': self._conversion_settings.unrecognised_tag_format,
 
             },
+            'performance_options': {
+                '    # pandoc_workers 1 or more converts notes using a long running pandoc server, one server is started by': None,
+                '    # each conversion process, use --workers to convert notes in parallel.  0 will start a new pandoc process': None,
+                '    # for every note.  Requires pandoc 2.18 or later, for pandoc 2.18 and 2.19 a copy or link of pandoc named': None,
+                '    # pandoc-server is also required.': None,
+                'pandoc_workers': self._conversion_settings.pandoc_workers,
+                '    # pandoc_cache_size_mb is the maximum size in MB of the cache of pandoc conversion results': None,
+                '    # unchanged notes are not re-converted by pandoc on later runs.  0 disables the cache.': None,
+                'pandoc_cache_size_mb': self._conversion_settings.pandoc_cache_size_mb,
+                '    # html_parser is the parser used to read html, valid entries are auto, lxml or html.parser': None,
+                '    # auto uses the faster lxml parser if it is installed, else the python html.parser is used': None,
+                'html_parser': self._conversion_settings.html_parser,
+                '    # copy_mode is how attachments are placed in the export folder, valid entries are copy, hardlink or reflink': None,
+                '    # hardlink and reflink avoid duplicating attachments when the export folder is on the same file system': None,
+                '    # as the source.  a hardlinked attachment is the same file as the source, changes to one change both.': None,
+                '    # if a link can not be made the attachment is copied': None,
+                'copy_mode': self._conversion_settings.copy_mode,
+                '    # stream_nsx_notes True converts nsx notes one at a time keeping memory use low for large nsx files': None,
+                '    # False keeps the content of every note in memory until all the notes in a nsx file are converted': None,
+                'stream_nsx_notes': self._conversion_settings.stream_nsx_notes,
+                '    # chart_workers is the number of processes used to render nsx chart images alongside note conversion': None,
+                '    # 0 renders each chart image when it is found in a note.': None,
+                'chart_workers': self._conversion_settings.chart_workers,
+                '    # chart_cache_size_mb is the maximum size in MB of the on disk cache of rendered nsx charts, charts': None,
+                '    # are always cached during a conversion.  0 disables the on disk cache used by later runs.': None,
+                'chart_cache_size_mb': self._conversion_settings.chart_cache_size_mb,
+                '    # html_fast_path True converts simple html and nsx notes to gfm or obsidian markdown without pandoc': None,
+                '    # False converts every note with pandoc, the fast path is experimental': None,
+                'html_fast_path': self._conversion_settings.html_fast_path,
+            },
         }
 
     @property
@@ -1,13 +1,28 @@
 from collections import namedtuple
+from html.parser import HTMLParser
 import os.path
 from pathlib import Path
 import re
 from typing import Iterable
 from urllib.parse import urlparse, unquote
 
-from bs4 import BeautifulSoup
-
+import file_stat_cache
 import helper_functions
+from note_path_index import NotePathIndex
+
+MARKDOWN_LINK_PATTERN = re.compile(r'''
+    \[[^]]*]\(     # match the '[alt text](' part of the markdown link
+    (              # start capturing group
+    [^) ]*         # match many characters up to ) or up to a space [ ]
+    )              # close capturing group
+    (?:            # start non capturing group
+    \)|            # match literal ) or single space
+    )              # close non capturing group
+''', re.MULTILINE | re.VERBOSE)
+
+MARKDOWN_LINK_TAG_PATTERN = re.compile(r'\[.*?]\(.*?\)')
+
+LocalLinks = namedtuple('LocalLinks', 'img, href, markdown')
 
 
 def absolute_path_from_relative_path(file: Path, link: str) -> Path:
@@ -47,7 +62,7 @@ def update_href_link_suffix_in_content(content: str, output_suffix: str, links_t
         The updated content
 
     """
-    soup = BeautifulSoup(content, 'html.parser')
+    soup = helper_functions.make_soup_from_html(content, html_parser='html.parser')
     for a_tag in soup.findAll(href=True):
         url_path = Path(urlparse(a_tag['href']).path)
         if url_path in links_to_update:
@@ -82,7 +97,7 @@ def update_relative_links_to_absolute_links(content_file_path: Path, link_set: s
     for link in link_set:
         link = Path(link)
         if not Path(link).is_absolute():
-            link = absolute_path_from_relative_path(content_file_path, str(link))
+            link = NotePathIndex.absolute_link_path(content_file_path, str(link))
 
         new_link_set.add(link)
 
@@ -116,11 +131,9 @@ def scan_html_content_for_all_paths(content: str):
 
     """
 
-    set_of_html_img_formatted_paths = set_of_html_img_file_paths_from(content)
+    local_links = scan_content_for_local_links(content, include_markdown_links=False)
 
-    set_of_html_href_formatted_paths = set_of_html_href_file_paths_from(content)
-
-    return set_of_html_img_formatted_paths | set_of_html_href_formatted_paths
+    return local_links.img | local_links.href
 
 
 def scan_markdown_content_for_all_paths(content: str):
@@ -153,11 +166,63 @@ def scan_markdown_content_for_all_paths(content: str):
         Set containing local file links.
 
     """
-    set_of_md_formatted_paths = set_of_markdown_file_paths_from(content)
+    local_links = scan_content_for_local_links(content)
+
+    return local_links.markdown | local_links.img | local_links.href
+
+
+class _LocalLinkScanner(HTMLParser):
+    """Collect local img src and href links from the start tags found by one pass of python's html tokeniser"""
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.img_paths = set()
+        self.href_paths = set()
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+
+        src = attributes.get('src')
+        if src:
+            url = urlparse(src)
+            if url.scheme in ('', 'file') and url.path:
+                self.img_paths.add(unquote(url.path))
+
+        href = attributes.get('href')
+        if href:
+            url = urlparse(href)
+            if url.scheme in ('', 'file') and url.path:
+                self.href_paths.add(helper_functions.unescape(unquote(href)))
+
+
+def scan_content_for_local_links(content: str, include_markdown_links: bool = True) -> namedtuple:
+    """
+    Search content for local file links in html src and href attributes and markdown links in a single pass.
+
+    The html is tokenised once and only the attributes of the start tags are inspected, no document tree is built.
+    The links found are the same as those returned by set_of_html_img_file_paths_from,
+    set_of_html_href_file_paths_from and set_of_markdown_file_paths_from.
+
+    Parameters
+    ==========
+    content : str
+        String containing html or markdown formatted text.
+    include_markdown_links : bool
+        If False markdown formatted links are not searched for.
+
+    Returns
+    =======
+    namedtuple : (img: set[str], href: set[str], markdown: set[str])
+        namedtuple containing sets of local src, href and markdown links
+
+    """
+    scanner = _LocalLinkScanner()
+    if '<' in content:
+        scanner.feed(content)
+        scanner.close()
 
-    set_of_html_paths = scan_html_content_for_all_paths(content)
+    markdown_links = set_of_markdown_file_paths_from(content) if include_markdown_links else set()
 
-    return set_of_md_formatted_paths | set_of_html_paths
+    return LocalLinks(scanner.img_paths, scanner.href_paths, markdown_links)
 
 
 def set_of_html_href_file_paths_from(content):
@@ -178,7 +243,7 @@ def set_of_html_href_file_paths_from(content):
         set of local href link paths
 
     """
-    soup = BeautifulSoup(content, 'html.parser')
+    soup = helper_functions.make_soup_from_html(content)
 
     url_paths = set()
     for a_tag in soup.findAll(href=True):
@@ -211,7 +276,7 @@ def set_of_html_img_file_paths_from(content: str) -> set[str]:
 
     """
 
-    soup = BeautifulSoup(content, 'html.parser')
+    soup = helper_functions.make_soup_from_html(content)
     url_paths = {
         unquote(urlparse(i_tag['src']).path)
         for i_tag in soup.findAll(src=True)
@@ -247,17 +312,7 @@ def set_of_markdown_file_paths_from(content: str) -> set[str]:
         set of local link strings
     """
 
-    regex_md_pattern = re.compile(r'''
-        \[[^]]*]\(     # match the '[alt text](' part of the markdown link
-        (              # start capturing group
-        [^) ]*         # match many characters up to ) or up to a space [ ]
-        )              # close capturing group
-        (?:            # start non capturing group
-        \)|            # match literal ) or single space
-        )              # close non capturing group
-    ''', re.MULTILINE | re.VERBOSE)
-
-    matches_md = regex_md_pattern.findall(content)
+    matches_md = MARKDOWN_LINK_PATTERN.findall(content)
 
     set_of_md_formatted_links = set()
 
@@ -283,7 +338,8 @@ def remove_content_links_from_links(content_file_path: Path,
         calculate absolute paths for any relative paths provided.
     content_links : Iterable[Path}
         Iterable of Path objects for the paths each note being processed and will be removed from the
-        links set if present.
+        links set if present.  A NotePathIndex shared by all notes in a conversion is used as is, other iterables
+        are indexed for this call.
     links :
         Iterable of Path objects that contains a mixture of links between to note pages and to images and attachments.
 
@@ -293,18 +349,9 @@ def remove_content_links_from_links(content_file_path: Path,
         Set of links that does not contain links between note pages.
 
     """
-    links = set(links)
-    links_to_remove = set()
-    for link in links:
-        abs_link = Path(link)
-        if not Path(link).is_absolute():
-            abs_link = absolute_path_from_relative_path(content_file_path, link)
+    note_path_index = NotePathIndex.from_paths(content_links)
 
-        if abs_link in content_links:
-            links_to_remove.add(link)
-
-    links.difference_update(links_to_remove)
-    return links
+    return {link for link in links if not note_path_index.is_note_link(content_file_path, link)}
 
 
 def split_set_existing_non_existing_links(content_file_path: Path, links: set[str]) -> namedtuple:
@@ -333,15 +380,15 @@ def split_set_existing_non_existing_links(content_file_path: Path, links: set[st
 
     for link in links:
         if Path(link).is_absolute():
-            if Path(link).exists():
+            if file_stat_cache.exists(link):
                 existing_links.add(link)
             else:
                 non_existing_links.add(link)
             continue
 
-        absolute_link_path = absolute_path_from_relative_path(content_file_path, link)
+        absolute_link_path = NotePathIndex.absolute_link_path(content_file_path, link)
 
-        if absolute_link_path.exists():
+        if file_stat_cache.exists(absolute_link_path):
             existing_links.add(link)
             continue
 
@@ -390,7 +437,7 @@ def split_existing_links_copyable_non_copyable(content_file_path: Path,
     for link in links_to_split:
         abs_link = Path(link)
         if not Path(link).is_absolute():
-            abs_link = absolute_path_from_relative_path(content_file_path, link)
+            abs_link = NotePathIndex.absolute_link_path(content_file_path, link)
 
         if root_for_copyable_paths in abs_link.parents:
             copyable_attachment_path_set.add(link)
@@ -456,6 +503,7 @@ def update_content_with_new_paths(content: str,
         Modified content string with new paths
 
     """
+    new_paths = {}
     for original_link in path_set:
         if Path(original_link).is_absolute():  # no need to change as an absolute path
             continue
@@ -470,10 +518,9 @@ def update_content_with_new_paths(content: str,
             )
             new_path = new_relative_path
 
-        content = update_html_link_src(content, original_link, new_path)
-        content = update_markdown_link_src(content, original_link, new_path)
+        new_paths[original_link] = new_path
 
-    return content
+    return update_links_in_content(content, new_paths)
 
 
 def process_attachments(path_to_content_file: Path, set_of_links: set[str], note_paths: set[Path],
@@ -569,10 +616,9 @@ def process_attachments(path_to_content_file: Path, set_of_links: set[str], note
 
 
 def find_local_file_links_in_content(file_type, content):
-    if file_type == 'html':
-        return scan_html_content_for_all_paths(content)
+    local_links = scan_content_for_local_links(content, include_markdown_links=file_type != 'html')
 
-    return scan_markdown_content_for_all_paths(content)
+    return local_links.img | local_links.href | local_links.markdown
 
 
 def get_attachment_paths(source_absolute_root, file_type, file, files_to_convert, content) -> namedtuple:
@@ -615,7 +661,7 @@ def get_attachment_paths(source_absolute_root, file_type, file, files_to_convert
         Path to the file the content has come from
     files_to_convert : Iterable[Path]
         Iterable of Path objects representing all files in a conversion job, used to exclude content files from the
-        set of attachments
+        set of attachments.  Pass the NotePathIndex for the conversion to avoid indexing the files for each note.
     content : str
         Note content
 
@@ -637,43 +683,94 @@ def get_attachment_paths(source_absolute_root, file_type, file, files_to_convert
 
     attachment_links = process_attachments(file,
                                            set_of_links,
-                                           set(files_to_convert),
+                                           NotePathIndex.from_paths(files_to_convert),
                                            source_absolute_root)
 
     return attachment_links
 
 
-def update_html_link_src(content: str, old_name: str, new_name: Path) -> str:
-    soup = BeautifulSoup(content, 'html.parser')
+def update_links_in_content(content: str, new_paths: dict[str, Path], update_markdown_links: bool = True) -> str:
+    """
+    Replace the old link paths in a content string with new paths.
+
+    All html href links are updated using one parse of the content and all markdown links are updated using one
+    regex pass, however many links are being replaced.
+
+    Parameters
+    ==========
+    content : str
+        Content containing html and optionally markdown formatted links to be updated.
+    new_paths : dict[str, Path]
+        New paths for links keyed by the old link path as it appears in the content.
+    update_markdown_links : bool
+        If False only html links are updated.
+
+    Returns
+    =======
+    str
+        Content with updated links
+
+    """
+    if not new_paths:
+        return content
+
+    content = update_html_link_srcs(content, new_paths)
+    if update_markdown_links:
+        content = update_markdown_link_srcs(content, new_paths)
+
+    return content
+
+
+def update_html_link_srcs(content: str, new_paths: dict[str, Path]) -> str:
+    soup = helper_functions.make_soup_from_html(content, html_parser='html.parser')
     for a_tag in soup.findAll(href=True):
         url_path = urlparse(a_tag['href']).path
-        if url_path == old_name:
-            a_tag['href'] = helper_functions.path_to_posix_str(new_name)
+        if url_path in new_paths:
+            a_tag['href'] = helper_functions.path_to_posix_str(new_paths[url_path])
             # do not return early after finding link as content may have more than one link to the renamed file
 
     return str(soup)
 
 
+def update_markdown_link_srcs(content: str, new_paths: dict[str, Path]) -> str:
+    def replace_link(match):
+        tag = match.group(0)
+        src = tag.rsplit('(', 1)[1].rstrip(')')
+        if src in new_paths:
+            return tag.replace(src, helper_functions.path_to_posix_str(new_paths[src]))
+
+        return tag
+
+    return MARKDOWN_LINK_TAG_PATTERN.sub(replace_link, content)
+
+
+def update_html_link_src(content: str, old_name: str, new_name: Path) -> str:
+    return update_html_link_srcs(content, {old_name: new_name})
+
+
 def update_markdown_link_src(content: str, old_name: str, new_name: Path) -> str:
-    tags = re.findall(r'\[.*?]\(.*?\)', content)
+    return update_markdown_link_srcs(content, {old_name: new_name})
 
-    if not tags:
-        return content
 
-    for tag in tags:
-        src = tag.rsplit('(', 1)[1].rstrip(')')
-        if src == old_name:
-            new_image_tag = tag.replace(old_name, helper_functions.path_to_posix_str(new_name))
-            content = content.replace(tag, new_image_tag)
+def get_set_of_all_files(path: Path) -> set[Path]:
+    """
+    Return a set of paths for every file in path and its sub folders using one os.scandir walk.
 
-    return content
+    Symbolic links to files are included, symbolic links to folders are not followed.
 
+    """
+    set_of_all_files = set()
+    folders_to_walk = [path]
+    while folders_to_walk:
+        folder = folders_to_walk.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        set_of_all_files.add(Path(entry.path))
+                    elif entry.is_dir(follow_symlinks=False):
+                        folders_to_walk.append(entry.path)
+        except OSError:
+            pass  # folders that can not be read are skipped
 
-def get_set_of_all_files(path: Path):
-    set_of_all_files = {
-        Path(file)
-        for file
-        in path.rglob('*')
-        if Path(file).is_file()
-    }
     return set_of_all_files
@@ -0,0 +1,345 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import config
+
+
+def what_module_is_this():
+    return __name__
+
+
+MANIFEST_FILE_NAME = '.yanom_manifest.json'
+MANIFEST_VERSION = 1
+
+# settings that change how fast a conversion runs but not what it writes
+_SETTINGS_NOT_AFFECTING_OUTPUT = {'logger', '_pandoc_workers', '_pandoc_cache_size_mb', '_copy_mode',
+                                  '_stream_nsx_notes', '_chart_workers', '_chart_cache_size_mb'}
+
+_PATH_ATTACHMENT_DETAILS = {'copyable_absolute'}
+
+
+def manifest_exists(export_folder_absolute: Union[Path, str]) -> bool:
+    return Path(export_folder_absolute, MANIFEST_FILE_NAME).is_file()
+
+
+def manifest_matches(export_folder_absolute: Union[Path, str], source_absolute_root: Optional[Path],
+                     conversion_input: Optional[str]) -> bool:
+    """Return True if the export folder holds the manifest of a conversion of the same source and conversion input"""
+    try:
+        manifest = json.loads(Path(export_folder_absolute, MANIFEST_FILE_NAME).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return False
+
+    return isinstance(manifest, dict) \
+        and manifest.get('source') == _source_to_json(source_absolute_root) \
+        and manifest.get('conversion_input') == conversion_input
+
+
+def _source_to_json(source_absolute_root: Optional[Path]) -> Optional[str]:
+    return None if source_absolute_root is None else str(source_absolute_root)
+
+
+def settings_fingerprint(conversion_settings) -> str:
+    """Return a hash of the conversion settings that affect the converted output"""
+    settings = sorted((key, repr(value)) for key, value in vars(conversion_settings).items()
+                      if key not in _SETTINGS_NOT_AFFECTING_OUTPUT)
+
+    return hashlib.md5(repr(settings).encode('utf-8')).hexdigest()
+
+
+def file_md5(path: Union[Path, str]) -> str:
+    md5 = hashlib.md5()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b''):
+            md5.update(block)
+
+    return md5.hexdigest()
+
+
+def list_files(folder: Union[Path, str], include_folders: bool = False) -> set[str]:
+    """
+    Return the paths, relative to folder, of every file in folder and its sub folders.
+
+    If include_folders is True the sub folders are also returned, with a trailing "/".
+    """
+    files = set()
+    folders_to_walk = [os.path.abspath(folder)]
+    root_length = len(folders_to_walk[0]) + 1
+    while folders_to_walk:
+        current_folder = folders_to_walk.pop()
+        try:
+            with os.scandir(current_folder) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        folders_to_walk.append(entry.path)
+                        if include_folders:
+                            files.add(f'{Path(entry.path[root_length:]).as_posix()}/')
+                    elif entry.name != MANIFEST_FILE_NAME:
+                        files.add(Path(entry.path[root_length:]).as_posix())
+        except OSError:
+            continue
+
+    return files
+
+
+def attachment_details_to_json(attachment_details: dict) -> dict:
+    return {name: sorted(str(link) for link in links) for name, links in attachment_details.items()}
+
+
+def attachment_details_from_json(attachment_details: dict) -> dict:
+    return {name: {Path(link) for link in links} if name in _PATH_ATTACHMENT_DETAILS else set(links)
+            for name, links in attachment_details.items()}
+
+
+class ConversionManifest:
+    """
+    Record of what a conversion wrote to the export folder, used to only reconvert changed sources on the next run.
+
+    The manifest is saved as a json file in the export folder.  Each source, a note file or a note archive, has an
+    entry keyed by its path relative to the conversion source folder holding a fingerprint of the source and the
+    files, relative to the export folder, written for it.  A source is unchanged if its size and modification time
+    match the fingerprint, or if only the modification time differs and the md5 hash of its content matches.
+
+    Every source is treated as changed if the conversion settings have changed since the manifest was saved, or if
+    a full conversion is requested.  The outputs of a changed source are removed before it is reconverted so the
+    new outputs are written to the same names, and the outputs of sources that no longer exist are removed.
+
+    The manifest also records the source folder and conversion input.  A manifest saved by a conversion of another
+    source or input is ignored, so none of the files that conversion wrote are removed.
+
+    Parameters
+    ----------
+    export_folder_absolute : Path
+        Folder the conversion writes to and the manifest is saved in.
+    settings_fingerprint : str
+        Hash of the conversion settings used for this conversion.
+    full : bool
+        If True every source is reconverted.
+    source_absolute_root : Path
+        Folder the sources are converted from.
+    conversion_input : str
+        Conversion input of the sources, for example 'nsx' or 'html'.
+
+    """
+    def __init__(self, export_folder_absolute: Path, settings_fingerprint: str, full: bool = False,
+                 source_absolute_root: Optional[Path] = None, conversion_input: Optional[str] = None):
+        self.logger = logging.getLogger(f'{config.yanom_globals.app_name}.'
+                                        f'{what_module_is_this()}.'
+                                        f'{self.__class__.__name__}'
+                                        )
+        self.logger.setLevel(config.yanom_globals.logger_level)
+        self._export_folder_absolute = Path(export_folder_absolute)
+        self._settings_fingerprint = settings_fingerprint
+        self._source = _source_to_json(source_absolute_root)
+        self._conversion_input = conversion_input
+        self._previous_entries = {}
+        self._entries = {}
+        self._checked_fingerprints = {}
+        self.skipped_count = 0
+        self.removed_count = 0
+
+        previous_settings_fingerprint = self._load()
+        self._reuse_outputs = not full and previous_settings_fingerprint == settings_fingerprint
+        if self._previous_entries and not self._reuse_outputs:
+            self.logger.info('All notes will be converted, the conversion settings have changed or a full '
+                             'conversion was requested')
+
+    @property
+    def path(self) -> Path:
+        return Path(self._export_folder_absolute, MANIFEST_FILE_NAME)
+
+    def _load(self) -> Optional[str]:
+        try:
+            manifest = json.loads(self.path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f'Unable to read the conversion manifest "{self.path}" - {e}')
+            return None
+
+        if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+            self.logger.warning(f'Ignoring conversion manifest "{self.path}" - it is not a supported version')
+            return None
+
+        if manifest.get('source') != self._source or manifest.get('conversion_input') != self._conversion_input:
+            self.logger.warning(f'Ignoring conversion manifest "{self.path}" - it is for a conversion of another '
+                                f'source or conversion input')
+            return None
+
+        self._previous_entries = manifest.get('sources', {})
+        return manifest.get('settings')
+
+    def fingerprint(self, source: Path) -> dict:
+        """Return the fingerprint of a source, hashing its content only if its size and modification time changed"""
+        key = str(source)
+        if key in self._checked_fingerprints:
+            return self._checked_fingerprints[key]
+
+        source_stat = source.stat()
+        fingerprint = {'size': source_stat.st_size, 'mtime_ns': source_stat.st_mtime_ns}
+        self._checked_fingerprints[key] = fingerprint
+        return fingerprint
+
+    def is_unchanged(self, key: str, source: Path) -> bool:
+        """Return True if the source has not changed, and its outputs still exist, since the manifest was saved"""
+        entry = self._previous_entries.get(key)
+        if not self._reuse_outputs or entry is None:
+            return False
+
+        try:
+            fingerprint = self.fingerprint(source)
+            previous_fingerprint = entry['fingerprint']
+            if fingerprint['size'] != previous_fingerprint['size']:
+                return False
+
+            if fingerprint['mtime_ns'] != previous_fingerprint['mtime_ns']:
+                fingerprint.setdefault('md5', file_md5(source))
+                if fingerprint['md5'] != previous_fingerprint.get('md5'):
+                    return False
+        except (OSError, KeyError, TypeError):
+            return False
+
+        fingerprint.setdefault('md5', previous_fingerprint.get('md5'))
+
+        return all(Path(self._export_folder_absolute, output).exists()
+                   for output in entry.get('outputs', []) + entry.get('attachments', []))
+
+    def keep(self, key: str, source: Path):
+        """Keep the entry, and outputs, of an unchanged source"""
+        entry = dict(self._previous_entries[key])
+        entry['fingerprint'] = self.fingerprint(source)
+        self._entries[key] = entry
+        self.skipped_count += 1
+
+    def record(self, key: str, source: Path, outputs: Iterable[Union[Path, str]],
+               attachments: Iterable[Union[Path, str]] = (), attachment_details: Optional[dict] = None):
+        """
+        Record the outputs of a converted source.
+
+        Parameters
+        ----------
+        key : str
+            Path of the source relative to the conversion source folder.
+        source : Path
+            Absolute path to the source.
+        outputs : Iterable[Path or str]
+            Files written for the source, absolute or relative to the export folder.  Folders created for the source
+            are given relative to the export folder with a trailing "/" and are removed with it if they are empty.
+        attachments : Iterable[Path or str]
+            Attachment files copied for the source, which may be shared with other sources.
+        attachment_details : dict
+            Optional attachment link details of each note written for the source, keyed by the note path.
+
+        """
+        try:
+            fingerprint = self.fingerprint(source)
+            fingerprint.setdefault('md5', file_md5(source))
+        except OSError as e:
+            self.logger.warning(f'Unable to fingerprint "{source}" it will be reconverted next time - {e}')
+            return
+
+        entry = {
+            'fingerprint': fingerprint,
+            'outputs': sorted({self._relative_output(output) for output in outputs}),
+            'attachments': sorted({self._relative_output(attachment) for attachment in attachments}),
+        }
+        if attachment_details is not None:
+            entry['attachment_details'] = {str(note): attachment_details_to_json(details)
+                                           for note, details in attachment_details.items()}
+        self._entries[key] = entry
+
+    def _relative_output(self, output: Union[Path, str]) -> str:
+        if isinstance(output, str) and output.endswith('/'):
+            return output  # a folder from list_files
+
+        output = Path(output)
+        if output.is_absolute():
+            output = output.relative_to(self._export_folder_absolute)
+
+        return output.as_posix()
+
+    def previous_keys(self) -> set[str]:
+        return set(self._previous_entries)
+
+    def outputs(self, key: str) -> list[str]:
+        """Return the files, relative to the export folder, written for a source"""
+        entry = self._entries.get(key) or self._previous_entries.get(key, {})
+        return entry.get('outputs', [])
+
+    def attachment_details(self, key: str) -> dict:
+        """Return the attachment link details recorded for the notes of a source, keyed by note path"""
+        entry = self._entries.get(key) or self._previous_entries.get(key, {})
+        return {Path(note): attachment_details_from_json(details)
+                for note, details in entry.get('attachment_details', {}).items()}
+
+    def remove_previous_outputs(self, key: str):
+        """Remove the files written for a source by an earlier conversion, before it is reconverted"""
+        entry = self._previous_entries.get(key)
+        if entry is None:
+            return
+
+        self._remove_outputs(key, entry)
+
+    def remove_deleted_sources(self, current_keys: Iterable[str]):
+        """Remove the files written for sources that are no longer found and drop their entries"""
+        current_keys = set(current_keys)
+        for key in sorted(set(self._previous_entries) - current_keys):
+            self.logger.info(f'Removing the converted files of deleted source "{key}"')
+            self._remove_outputs(key, self._previous_entries.pop(key))
+            self._entries.pop(key, None)
+            self.removed_count += 1
+
+    def _remove_outputs(self, key: str, entry: dict):
+        attachments_in_use = {attachment
+                              for entries in (self._previous_entries, self._entries)
+                              for other_key, other_entry in entries.items() if other_key != key
+                              for attachment in other_entry.get('attachments', [])}
+        files_to_remove = set(entry.get('outputs', []))
+        files_to_remove.update(attachment for attachment in entry.get('attachments', [])
+                               if attachment not in attachments_in_use)
+
+        # folders are removed after the files they contain, and only if they are then empty
+        for file in sorted(files_to_remove, key=lambda output: (output.endswith('/'), -output.count('/'))):
+            path = Path(self._export_folder_absolute, file)
+            if file.endswith('/'):
+                self._remove_empty_folders(path)
+                continue
+
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                self.logger.warning(f'Unable to remove previously converted file "{path}" - {e}')
+                continue
+
+            self._remove_empty_folders(path.parent)
+
+    def _remove_empty_folders(self, folder: Path):
+        while folder != self._export_folder_absolute and self._export_folder_absolute in folder.parents:
+            try:
+                folder.rmdir()
+            except OSError:
+                return
+            folder = folder.parent
+
+    def save(self):
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'settings': self._settings_fingerprint,
+            'source': self._source,
+            'conversion_input': self._conversion_input,
+            'sources': dict(sorted(self._entries.items())),
+        }
+        try:
+            self.path.write_text(json.dumps(manifest, indent=1), encoding='utf-8')
+        except OSError as e:
+            self.logger.warning(f'Unable to save the conversion manifest "{self.path}" - {e}')
+            return
+
+        self.logger.info(f'Conversion manifest saved, {self.skipped_count} unchanged sources skipped, '
+                         f'{self.removed_count} deleted sources removed')
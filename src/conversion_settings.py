@@ -10,7 +10,9 @@ from typing import Literal
 
 import config
 from config import yanom_globals
+import conversion_manifest
 import helper_functions
+import nsx_checkpoint
 from embeded_file_types import EmbeddedFileTypes
 from helper_functions import generate_clean_directory_name, find_working_directory
 
@@ -89,6 +91,25 @@ class ConversionSettings:
         False leave as relative
     __metadata_time_format : str
         strftime formatted string to format a date and time
+    _pandoc_workers : int
+        1 or more converts notes using a long running pandoc server, one server is started by each conversion
+        process.  0 will start a new pandoc process for every note converted.
+    _pandoc_cache_size_mb : int
+        Maximum size in MB of the on disk cache of pandoc conversion results.  0 disables the cache.
+    _html_parser : str
+        Html parser used to parse note content.  'auto' uses lxml if it is installed else 'html.parser'.
+    _copy_mode : str
+        How attachments are placed in the export folder, 'copy', 'hardlink' or 'reflink'.  Links fall back to a copy.
+    _stream_nsx_notes : bool
+        If True nsx notes are read, converted, written and released one at a time so memory use does not grow
+        with the size of the nsx file, if False the content of every note is kept until the nsx file is converted.
+    _chart_workers : int
+        Number of processes used to render nsx chart images while notes are converted.  0 renders each chart as it is found.
+    _chart_cache_size_mb : int
+        Maximum size in MB of the on disk cache of rendered nsx charts.  0 only caches charts during a conversion.
+    _html_fast_path : bool
+        If True simple html notes, paragraphs and headings of text, bold or emphasised text, links and line breaks,
+        are converted to gfm without running pandoc.  The result is the same as the pandoc conversion.
 
     Methods
     -------
@@ -159,6 +180,16 @@ class ConversionSettings:
             'embed_these_video_types': '',
             'keep_nimbus_row_and_column_headers': ('True', 'False'),
             'unrecognised_tag_format': ('html', 'text'),
+        },
+        'performance_options': {
+            'pandoc_workers': '',
+            'pandoc_cache_size_mb': '',
+            'html_parser': ('auto', 'lxml', 'html.parser'),
+            'copy_mode': ('copy', 'hardlink', 'reflink'),
+            'stream_nsx_notes': ('True', 'False'),
+            'chart_workers': '',
+            'chart_cache_size_mb': '',
+            'html_fast_path': ('True', 'False'),
         }
     }
 
@@ -199,6 +230,7 @@ class ConversionSettings:
         self.chart_csv = True
         self.chart_data_table = True
         self._export_folder = 'notes'
+        self._requested_export_folder_absolute = None
         self._attachment_folder_name = 'attachments'
         self._allow_spaces_in_file_names = True
         self._filename_spaces_replaced_by = '-'
@@ -221,6 +253,14 @@ class ConversionSettings:
                                               self._embed_these_audio_types, self._embed_these_video_types)
         self._keep_nimbus_row_and_column_headers = False
         self._unrecognised_tag_format = 'html'
+        self._pandoc_workers = 0
+        self._html_fast_path = False
+        self._chart_cache_size_mb = 0
+        self._chart_workers = 0
+        self._stream_nsx_notes = False
+        self._copy_mode = 'copy'
+        self._html_parser = 'auto'
+        self._pandoc_cache_size_mb = 0
 
     def __str__(self):
         return repr(self.__dict__)
@@ -411,6 +451,14 @@ class ConversionSettings:
         self._metadata_time_format = '%Y-%m-%d %H:%M:%S%Z'
         self._file_created_text = 'created'
         self._file_modified_text = 'updated'
+        self._pandoc_workers = 0
+        self._html_fast_path = False
+        self._chart_cache_size_mb = 0
+        self._chart_workers = 0
+        self._stream_nsx_notes = False
+        self._copy_mode = 'copy'
+        self._html_parser = 'auto'
+        self._pandoc_cache_size_mb = 0
 
     @staticmethod
     def _get_folder_paths(provided_folder: Path, root_path: Path):
@@ -504,6 +552,8 @@ class ConversionSettings:
 
         if self._source_absolute_root.exists():
             self.logger.info(f'Using {self._source_absolute_root} as source path')
+            if self._requested_export_folder_absolute is not None:
+                self._set_export_folder_absolute()
             return
 
         msg = f"Invalid source location - {provided_source} " \
@@ -522,6 +572,8 @@ class ConversionSettings:
         value = value.strip()
         if value in self._valid_conversion_inputs:
             self._conversion_input = value
+            if self._requested_export_folder_absolute is not None:
+                self._set_export_folder_absolute()
             return
 
         raise ValueError(f"Invalid value provided for for conversion input. "
@@ -635,12 +687,30 @@ class ConversionSettings:
 
         self.exit_if_path_is_to_file(absolute_export_folder, provided_export_folder)
 
-        self._export_folder_absolute = helper_functions.next_available_directory_name(absolute_export_folder)
-
-        self._export_folder = helper_functions.relative_path_for(self._export_folder_absolute, root_path)
+        self._requested_export_folder_absolute = absolute_export_folder
+        self._set_export_folder_absolute()
 
         self.logger.info(f'For the provided attachment folder name of "{provided_export_folder}" '
                          f'the cleaned name used is {self._export_folder}')
+
+    def _set_export_folder_absolute(self):
+        """
+        Use the requested export folder if it holds an earlier, or interrupted, conversion of the same source and
+        conversion input, which is updated in place, otherwise use the next available empty folder.
+
+        Called again when the source or conversion input change, so an earlier conversion of another source is
+        never updated, and so has its files removed, whichever order the settings are set in.
+        """
+        requested_export_folder = self._requested_export_folder_absolute
+        if nsx_checkpoint.checkpoint_exists(requested_export_folder) \
+                or conversion_manifest.manifest_matches(requested_export_folder, self._source_absolute_root,
+                                                        self._conversion_input):
+            self._export_folder_absolute = requested_export_folder
+        else:
+            self._export_folder_absolute = helper_functions.next_available_directory_name(requested_export_folder)
+
+        root_path = Path(self._working_directory, config.yanom_globals.data_dir)
+        self._export_folder = helper_functions.relative_path_for(self._export_folder_absolute, root_path)
         self.logger.info(f'Using {self._export_folder_absolute} as export path')
 
     def exit_if_path_is_invalid(self, absolute_export_folder, provided_export_folder):
@@ -912,3 +982,81 @@ class ConversionSettings:
     @file_modified_text.setter
     def file_modified_text(self, value: str):
         self._file_modified_text = value
+
+    @property
+    def pandoc_workers(self):
+        return self._pandoc_workers
+
+    @pandoc_workers.setter
+    def pandoc_workers(self, value):
+        self._pandoc_workers = max(int(value), 0)
+
+    @property
+    def pandoc_cache_size_mb(self):
+        return self._pandoc_cache_size_mb
+
+    @pandoc_cache_size_mb.setter
+    def pandoc_cache_size_mb(self, value):
+        self._pandoc_cache_size_mb = max(int(value), 0)
+
+    @property
+    def html_parser(self):
+        return self._html_parser
+
+    @html_parser.setter
+    def html_parser(self, value):
+        value = value.strip()
+        if value in self.validation_values['performance_options']['html_parser']:
+            self._html_parser = value
+            return
+
+        raise ValueError(f"Invalid value provided for html parser. "
+                         f"Attempted to use {value}, valid values are "
+                         f"{self.validation_values['performance_options']['html_parser']}")
+
+    @property
+    def copy_mode(self):
+        return self._copy_mode
+
+    @copy_mode.setter
+    def copy_mode(self, value):
+        value = value.strip()
+        if value in self.validation_values['performance_options']['copy_mode']:
+            self._copy_mode = value
+            return
+
+        raise ValueError(f"Invalid value provided for copy mode. "
+                         f"Attempted to use {value}, valid values are "
+                         f"{self.validation_values['performance_options']['copy_mode']}")
+
+    @property
+    def stream_nsx_notes(self):
+        return self._stream_nsx_notes
+
+    @stream_nsx_notes.setter
+    def stream_nsx_notes(self, value):
+        self._stream_nsx_notes = bool(value)
+
+    @property
+    def chart_workers(self):
+        return self._chart_workers
+
+    @chart_workers.setter
+    def chart_workers(self, value):
+        self._chart_workers = max(int(value), 0)
+
+    @property
+    def chart_cache_size_mb(self):
+        return self._chart_cache_size_mb
+
+    @chart_cache_size_mb.setter
+    def chart_cache_size_mb(self, value):
+        self._chart_cache_size_mb = max(int(value), 0)
+
+    @property
+    def html_fast_path(self):
+        return self._html_fast_path
+
+    @html_fast_path.setter
+    def html_fast_path(self, value):
+        self._html_fast_path = bool(value)
@@ -0,0 +1,112 @@
+from collections import OrderedDict
+import logging
+import os
+from pathlib import Path
+import threading
+
+import config
+
+
+def what_module_is_this():
+    return __name__
+
+
+class DiskCache:
+    """
+    Size bounded on disk cache of text entries.
+
+    Each entry is stored in a file named by its key, so results generated in one conversion can be reused by later
+    conversions.  The size and last use of each entry are kept in memory, when the cache grows beyond its maximum size
+    the least recently used entries are removed until it is below the low water mark, so the next entries can be added
+    without evicting again.
+
+    Parameters
+    ----------
+    cache_directory : Path
+        Folder the cache entries are stored in.
+    max_size_bytes : int
+        Maximum size of the cache entries.
+
+    """
+    LOW_WATER_MARK = 0.9
+
+    def __init__(self, cache_directory, max_size_bytes):
+        self.logger = logging.getLogger(f'{config.yanom_globals.app_name}.'
+                                        f'{what_module_is_this()}.'
+                                        f'{self.__class__.__name__}'
+                                        )
+        self.logger.setLevel(config.yanom_globals.logger_level)
+        self._directory = Path(cache_directory)
+        self._max_size = max_size_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._directory.mkdir(parents=True, exist_ok=True)
+        # entry sizes keyed by cache key, ordered from least to most recently used
+        self._entries = OrderedDict((path.name, size) for _, size, path in sorted(self._cache_entries()))
+        self._current_size = sum(self._entries.values())
+
+    def _entry_path(self, key):
+        return Path(self._directory, key[:2], key)
+
+    def get(self, key):
+        path = self._entry_path(key)
+        try:
+            data = path.read_bytes()
+            result = data.decode('utf-8')
+            os.utime(path)  # mark as most recently used for later runs
+        except (OSError, UnicodeDecodeError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self._record_use(key, len(data))
+        return result
+
+    def put(self, key, result):
+        path = self._entry_path(key)
+        data = result.encode('utf-8')
+        temp_path = path.with_name(f'{key}.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            path.parent.mkdir(exist_ok=True)
+            temp_path.write_bytes(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Unable to write cache entry {path} - {e}")
+            return
+
+        with self._lock:
+            self._record_use(key, len(data))
+            if self._current_size > self._max_size:
+                self._evict_least_recently_used()
+
+    def _record_use(self, key, size):
+        self._current_size += size - self._entries.pop(key, 0)
+        self._entries[key] = size
+
+    def _cache_entries(self):
+        entries = []
+        for path in self._directory.glob('*/*'):
+            if path.suffix == '.tmp':
+                continue  # being written by another conversion
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict_least_recently_used(self):
+        while self._entries and self._current_size > self._max_size * self.LOW_WATER_MARK:
+            key, size = self._entries.popitem(last=False)
+            self._current_size -= size
+            try:
+                self._entry_path(key).unlink()
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                self.logger.warning(f"Unable to remove cache entry {self._entry_path(key)} - {e}")
+
+        self.logger.debug(f"Cache in {self._directory} reduced to {self._current_size} bytes")
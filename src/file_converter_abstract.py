@@ -172,28 +172,27 @@ class FileConverter(ABC):
     def update_content_for_renamed_file(self, renamed_file: RenamedFile):
         # replace relative and absolute version as either may exist in the content
         # html replacement is always used as html formatted links can be in any of the input formats
-        self._pre_processed_content = content_link_management.update_html_link_src(
+        #  if input is markdown also replace name in any markdown formatted links
+        self._pre_processed_content = content_link_management.update_links_in_content(
             self._pre_processed_content,
-            str(renamed_file.original_absolute),
-            renamed_file.new_absolute,
+            {
+                str(renamed_file.original_absolute): renamed_file.new_absolute,
+                str(renamed_file.original_relative): renamed_file.new_relative,
+            },
+            update_markdown_links=self._conversion_settings.conversion_input == 'markdown',
         )
-        self._pre_processed_content = content_link_management.update_html_link_src(
-            self._pre_processed_content,
-            str(renamed_file.original_relative),
-            renamed_file.new_relative,
-        )
-        if self._conversion_settings.conversion_input == 'markdown':
-            #  if input is markdown also replace name in any markdown formatted links
-            self._pre_processed_content = content_link_management.update_markdown_link_src(
-                self._pre_processed_content,
-                str(renamed_file.original_absolute),
-                renamed_file.new_absolute,
-            )
-            self._pre_processed_content = content_link_management.update_markdown_link_src(
-                self._pre_processed_content,
-                str(renamed_file.original_relative),
-                renamed_file.new_relative,
-            )
+
+    @property
+    def files_to_convert(self):
+        return self._files_to_convert
+
+    @files_to_convert.setter
+    def files_to_convert(self, value):
+        self._files_to_convert = value
+
+    @property
+    def pandoc_converter(self):
+        return self._pandoc_converter
 
     @property
     def renamed_note_file(self):
@@ -0,0 +1,152 @@
+import logging
+import os
+from pathlib import Path
+import stat
+from typing import Iterable, Optional, Union
+
+import config
+
+
+def what_module_is_this():
+    return __name__
+
+
+_FILE = 'file'
+_DIRECTORY = 'directory'
+_OTHER = 'other'
+
+_run_cache = None
+
+
+class FileStatCache:
+    """
+    Cache of file system lookups for one conversion run.
+
+    The cache can be pre-populated with a single os.scandir walk of a folder, for example the conversion source
+    folder.  File types are read from the directory entries so on most systems the walk does not stat each file.
+    Paths not found by the walk, which includes paths that do not exist, are stat'ed once and the result remembered.
+    A missing path is not assumed from the walk as file names are not case sensitive on every file system.
+
+    Files created or deleted during the run are not seen by the cache, so it must only be used for paths that do not
+    change while it is in use.
+
+    """
+    def __init__(self):
+        self.logger = logging.getLogger(f'{config.yanom_globals.app_name}.'
+                                        f'{what_module_is_this()}.'
+                                        f'{self.__class__.__name__}'
+                                        )
+        self.logger.setLevel(config.yanom_globals.logger_level)
+        self._file_types = {}
+        self.hits = 0
+        self.misses = 0
+
+    def prepopulate(self, root: Union[Path, str], exclude: Iterable[Union[Path, str]] = ()):
+        """
+        Record the type of every file and folder in root and its sub folders.
+
+        Parameters
+        ----------
+        root : Path or str
+            Folder to walk.
+        exclude : Iterable[Path or str]
+            Folders that are not walked, for example an export folder inside root that will be written to during the
+            conversion.  Lookups for paths in these folders use the file system.
+
+        """
+        excluded = {os.path.abspath(folder) for folder in exclude}
+        folders_to_walk = [os.path.abspath(root)]
+        while folders_to_walk:
+            folder = folders_to_walk.pop()
+            try:
+                with os.scandir(folder) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            file_type = _DIRECTORY
+                            if entry.path not in excluded and not entry.is_symlink():
+                                folders_to_walk.append(entry.path)
+                        elif entry.is_file():
+                            file_type = _FILE
+                        elif not entry.is_symlink() or os.path.exists(entry.path):
+                            file_type = _OTHER
+                        else:
+                            continue  # broken symbolic link
+
+                        self._file_types[entry.path] = file_type
+            except OSError as e:
+                self.logger.debug(f'Unable to scan "{folder}" - {e}')
+
+    def _file_type(self, path: Union[Path, str]) -> Optional[str]:
+        key = os.path.abspath(path)
+        if key in self._file_types:
+            self.hits += 1
+            return self._file_types[key]
+
+        self.misses += 1
+        file_type = None
+        try:
+            mode = os.stat(key).st_mode
+            file_type = _DIRECTORY if stat.S_ISDIR(mode) else _FILE if stat.S_ISREG(mode) else _OTHER
+        except (OSError, ValueError):
+            pass
+
+        self._file_types[key] = file_type
+        return file_type
+
+    def exists(self, path: Union[Path, str]) -> bool:
+        return self._file_type(path) is not None
+
+    def is_file(self, path: Union[Path, str]) -> bool:
+        return self._file_type(path) == _FILE
+
+    def is_dir(self, path: Union[Path, str]) -> bool:
+        return self._file_type(path) == _DIRECTORY
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def log_hit_rate(self):
+        self.logger.debug(f'File stat cache {self.hits} hits, {self.misses} misses, '
+                          f'hit rate {self.hit_rate:.1%}, {len(self._file_types)} paths cached')
+
+
+def start_run(root: Optional[Union[Path, str]] = None,
+              exclude: Iterable[Union[Path, str]] = ()) -> FileStatCache:
+    """Start a new file stat cache used by exists, is_file and is_dir, optionally pre-populated from root"""
+    global _run_cache
+    _run_cache = FileStatCache()
+    if root is not None:
+        _run_cache.prepopulate(root, exclude)
+
+    return _run_cache
+
+
+def end_run():
+    """Log the hit rate of the current file stat cache and stop using it"""
+    global _run_cache
+    if _run_cache is not None:
+        _run_cache.log_hit_rate()
+    _run_cache = None
+
+
+def exists(path: Union[Path, str]) -> bool:
+    if _run_cache is None:
+        return Path(path).exists()
+
+    return _run_cache.exists(path)
+
+
+def is_file(path: Union[Path, str]) -> bool:
+    if _run_cache is None:
+        return Path(path).is_file()
+
+    return _run_cache.is_file(path)
+
+
+def is_dir(path: Union[Path, str]) -> bool:
+    if _run_cache is None:
+        return Path(path).is_dir()
+
+    return _run_cache.is_dir(path)
@@ -1,6 +1,7 @@
-from io import BytesIO
+from io import BytesIO, IOBase
 import logging
 from pathlib import Path
+import shutil
 
 import config
 import helper_functions
@@ -8,6 +9,8 @@ import helper_functions
 logger = logging.getLogger(f'{config.yanom_globals.app_name}.{__name__}')
 logger.setLevel(config.yanom_globals.logger_level)
 
+STREAM_CHUNK_SIZE = 1024 * 1024
+
 
 def store_file(absolute_path, content_to_save):
 
@@ -24,6 +27,10 @@ def store_file(absolute_path, content_to_save):
         write_bytes_io(absolute_path, content_to_save)
         return
 
+    if isinstance(content_to_save, IOBase):
+        write_stream(absolute_path, content_to_save)
+        return
+
     logger.warning(f"content type {type(content_to_save)} was not recognised for path {absolute_path}")
 
 
@@ -48,6 +55,15 @@ def write_bytes_io(absolute_path, content_to_save):
         error_handling(e, 'bytes IO buffer')
 
 
+def write_stream(absolute_path, content_to_save):
+    """Copy a readable binary stream to a file in fixed size chunks and close the stream."""
+    try:
+        with content_to_save, open(absolute_path, 'wb') as target_file:
+            shutil.copyfileobj(content_to_save, target_file, STREAM_CHUNK_SIZE)
+    except Exception as e:
+        error_handling(e, 'binary stream')
+
+
 def error_handling(e, write_type):
     if isinstance(e, FileNotFoundError):
         logger.error(f"Attempting to write {write_type} to invalid path - {e}")
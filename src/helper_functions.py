@@ -1,6 +1,8 @@
 from collections import namedtuple
 import ctypes
 import errno
+from functools import lru_cache
+import logging
 import os
 from pathlib import Path, PureWindowsPath, PurePath
 import random
@@ -16,6 +18,10 @@ from urllib.parse import unquote_plus
 from bs4 import BeautifulSoup
 from filetype import filetype
 
+import config
+
+# number of bytes from the start of a file filetype needs to recognise the type of the file
+FILE_TYPE_HEADER_SIZE = 262
 
 FileNameOptions = namedtuple('FileNameOptions',
                              'max_length allow_unicode allow_uppercase allow_non_alphanumeric allow_spaces '
@@ -495,6 +501,7 @@ def file_extension_from_bytes(file_bytes: bytes) -> Optional[str]:
     Parameters
     ==========
     file_bytes : bytes
+        the entire file or the first FILE_TYPE_HEADER_SIZE bytes of the file, only the header bytes are examined.
 
     Returns
     =======
@@ -503,7 +510,7 @@ def file_extension_from_bytes(file_bytes: bytes) -> Optional[str]:
         None - File type was not recognised
 
     """
-    kind_of_file = filetype.guess(file_bytes)
+    kind_of_file = filetype.guess(file_bytes[:FILE_TYPE_HEADER_SIZE])
     if kind_of_file:
         return f".{kind_of_file.extension}"
     # Note file type supports other inputs -
@@ -856,8 +863,68 @@ def list_directory_paths(root_dir: Union[Path, str],
     return list_of_paths
 
 
-def make_soup_from_html(html_content: str):
-    return BeautifulSoup(html_content, 'html.parser')
+@lru_cache(maxsize=None)
+def html_parser_name(html_parser: str = 'auto') -> str:
+    """
+    Return the name of the BeautifulSoup parser to use for a html_parser conversion setting.
+
+    'auto' and 'lxml' use lxml if it is installed, otherwise python's 'html.parser' is used.
+
+    Parameters
+    ----------
+    html_parser : str
+        'auto', 'lxml' or 'html.parser'
+
+    Returns
+    -------
+    str
+        'lxml' or 'html.parser'
+
+    """
+    if html_parser in ('auto', 'lxml'):
+        try:
+            import lxml  # noqa: F401
+            return 'lxml'
+        except ImportError:
+            if html_parser == 'lxml':
+                logging.getLogger(f'{config.yanom_globals.app_name}.{__name__}').warning(
+                    "The lxml html parser is not installed, using html.parser")
+
+    return 'html.parser'
+
+
+def make_soup_from_html(html_content: str, html_parser: Optional[str] = None) -> BeautifulSoup:
+    """
+    Parse html into a BeautifulSoup tree using the html parser chosen in the conversion settings.
+
+    lxml places html fragments inside html and body tags.  When the html provided does not contain these tags they
+    are removed so the tree, and the html generated from it, are the same as when 'html.parser' is used.
+
+    lxml is faster but also rewrites some markup, for example it escapes iframe contents and adds a head for
+    metadata tags.  Callers that write the parsed tree back into note content pass html_parser='html.parser' so
+    the converted notes do not depend on the installed parser.
+
+    Parameters
+    ----------
+    html_content : str
+        html document or fragment to be parsed
+    html_parser : str
+        Optional 'auto', 'lxml' or 'html.parser', defaults to the parser set in config.yanom_globals
+
+    Returns
+    -------
+    BeautifulSoup
+
+    """
+    parser = html_parser_name(html_parser or config.yanom_globals.html_parser)
+    soup = BeautifulSoup(html_content, parser)
+    if parser == 'lxml':
+        for document_tag in ('html', 'body'):
+            tag = soup.find(document_tag)
+            if tag is not None and not re.search(rf'<{document_tag}[\s>]', html_content, re.IGNORECASE):
+                tag.unwrap()
+
+    return soup
 
 
 def is_valid_email(email_text: str) -> bool:
@@ -898,7 +965,8 @@ def correct_file_extension(file_bytes: bytes, target_path):
     Parameters
     ----------
     file_bytes : bytes
-        bytes read form the source file, this can be the entire file or a minimum of the first 261 bytes.
+        bytes read form the source file, this can be the entire file or the first FILE_TYPE_HEADER_SIZE bytes,
+        only the header bytes are examined.
     target_path : Path
         Path object to the audio file that need to have the correct extension applied
 
@@ -909,7 +977,7 @@ def correct_file_extension(file_bytes: bytes, target_path):
         identified and corrected.
 
     """
-    kind_of_file = filetype.guess(file_bytes)
+    kind_of_file = filetype.guess(file_bytes[:FILE_TYPE_HEADER_SIZE])
     if kind_of_file:
         correct_extension = f".{kind_of_file.extension}"
         target_path = target_path.with_suffix(correct_extension)
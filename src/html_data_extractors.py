@@ -3,8 +3,6 @@ from html.parser import HTMLParser
 from pathlib import Path
 from typing import Callable, Dict, List, Optional, Union
 
-from bs4 import BeautifulSoup
-
 import config
 import helper_functions
 import markdown_format_styling
@@ -406,7 +404,8 @@ class HTMLListParser(HTMLParser):
         if tag == 'li':
             li_contents = ''.join(self.li_contents)
             li_tag_html = f'<li>{li_contents}</li>'
-            soup = BeautifulSoup(li_tag_html, 'html.parser')
+            # the list items are written into the converted note so are parsed the same whichever parsers are installed
+            soup = helper_functions.make_soup_from_html(li_tag_html, html_parser='html.parser')
             tag = soup.find()
             contents = extract_from_tag(tag, self.processing_options, self.note_specific_tag_cleaning)
             if contents:
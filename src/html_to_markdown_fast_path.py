@@ -0,0 +1,210 @@
+"""
+Convert simple html notes to markdown without pandoc.
+
+Most notes are a few paragraphs of plain text with some bold or emphasised words and links.  For these notes the
+result pandoc would produce is known, so they are converted with the same note content data model used for nimbus
+notes rather than starting a pandoc conversion.  is_simple_html() decides if a note only contains html the fast path
+converts exactly as pandoc does, every other note is converted by pandoc.
+
+The fast path produces the output of pandoc 2.11.2 or later converting html to gfm with the standalone, no wrap and
+atx heading options used by PandocConverter.
+"""
+import logging
+import re
+from typing import Optional
+
+from bs4 import BeautifulSoup, Comment, Doctype
+
+import config
+import helper_functions
+from html_data_extractors import extract_from_tag, is_a_tag
+from note_content_data import Break, HeadingItem, TextItem
+from processing_options import ProcessingOptions
+
+
+logger = logging.getLogger(f'{config.yanom_globals.app_name}.{__name__}')
+logger.setLevel(config.yanom_globals.logger_level)
+
+BLOCK_TAGS = {'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+FORMAT_TAGS = {'b', 'strong', 'em'}
+IGNORED_WHITESPACE = ' \n\t\r'
+
+# characters pandoc does not escape, or only escapes at the start of a line which is checked separately
+SAFE_TEXT = re.compile(r"(?:[^\W_]|[ \xa0.,;:?!'\"()/%@+=-])*")
+SAFE_HREF = re.compile(r'[A-Za-z0-9/.~%?#=&+:@-]+')
+SAFE_TITLE = re.compile(r"[^\W\d_][^\W_]*(?: ?(?:[^\W_]|[.,()'-]))*")
+# pandoc reads a run of white space in text, including new lines, as a single space
+COLLAPSED_WHITESPACE = re.compile(r'[ \t\n\r]+')
+LINE_ENDINGS_AND_TABS = re.compile(r'[\t\n\r]')
+# a line starting with these would be a markdown list, heading or block quote so pandoc escapes them
+LINE_START_NEEDING_ESCAPE = re.compile(r'^(?:[-+=(]|\d+[.)]|[A-Za-z][.)]|[ivxlcdmIVXLCDM]+[.)])')
+YAML_WORDS = {'true', 'false', 'yes', 'no', 'on', 'off', 'null', 'y', 'n'}
+
+
+def is_simple_html(soup: BeautifulSoup) -> bool:
+    """
+    Return True if the fast path converts the parsed html exactly as pandoc does.
+
+    Simple html is an optional head with a title, and paragraphs or headings of text, bold or emphasised text,
+    links and line breaks.  Anything else, for example lists, tables, images, divs, styled or nested formatting, and
+    text pandoc would escape, is left for pandoc.
+    """
+    for child in soup.children:
+        if isinstance(child, Doctype):
+            continue
+
+        if not _is_simple_document_part(child):
+            return False
+
+    return True
+
+
+def _is_simple_document_part(node) -> bool:
+    if not is_a_tag(node):
+        return _is_ignored_whitespace(node)
+
+    if node.name in ('html', 'body'):
+        return all(_is_simple_document_part(child) for child in node.children)
+
+    if node.name == 'head':
+        return all(_is_simple_head_item(child) for child in node.children)
+
+    if node.name in BLOCK_TAGS:
+        return _is_simple_block(node)
+
+    return False
+
+
+def _is_ignored_whitespace(node) -> bool:
+    return not isinstance(node, Comment) and not str(node).strip(IGNORED_WHITESPACE)
+
+
+def _is_simple_head_item(node) -> bool:
+    if not is_a_tag(node):
+        return _is_ignored_whitespace(node)
+
+    if node.name == 'title':
+        title = node.get_text()
+        return all(not is_a_tag(child) for child in node.children) \
+            and SAFE_TITLE.fullmatch(title) is not None and title.lower() not in YAML_WORDS
+
+    # pandoc adds named meta tags to the metadata it writes, other meta tags are ignored
+    return node.name == 'meta' and 'name' not in node.attrs
+
+
+def _is_simple_block(block) -> bool:
+    if block.name != 'p' and block.attrs:
+        return False
+
+    if block.name != 'p' and (block.find('br') or not block.get_text().strip(IGNORED_WHITESPACE)):
+        return False
+
+    if not all(_is_simple_inline(child) for child in block.children):
+        return False
+
+    # pandoc joins formatting that follows the same formatting, so its output would differ from the tags
+    children = list(block.children)
+    if any(is_a_tag(child) and is_a_tag(next_child) and child.name in FORMAT_TAGS and next_child.name in FORMAT_TAGS
+           for child, next_child in zip(children, children[1:])):
+        return False
+
+    return all(LINE_START_NEEDING_ESCAPE.match(line.lstrip(' ')) is None
+               for line in _inline_markdown(block).split('\n'))
+
+
+def _is_simple_inline(node) -> bool:
+    if not is_a_tag(node):
+        return not isinstance(node, Comment) and SAFE_TEXT.fullmatch(_collapse_whitespace(node)) is not None
+
+    if node.name == 'br':
+        return True
+
+    # text inside formatting and links is written as it is, so new lines in it are left for pandoc
+    text = node.get_text()
+    if not text or text != text.strip() or LINE_ENDINGS_AND_TABS.search(text) or len(node.contents) != 1 \
+            or not _is_simple_inline(node.contents[0]) or is_a_tag(node.contents[0]):
+        return False
+
+    if node.name in FORMAT_TAGS:
+        return not node.attrs
+
+    if node.name == 'a':
+        href = node.attrs.get('href', '')
+        # pandoc writes a link with the same text as its target as an automatic link
+        return list(node.attrs) == ['href'] and SAFE_HREF.fullmatch(href) is not None \
+            and text not in (href, href.replace('mailto:', '', 1))
+
+    return False
+
+
+def _inline_markdown(block, processing_options: Optional[ProcessingOptions] = None) -> str:
+    """Return the markdown of the text, formatted text, links and line breaks in a block, as pandoc writes them"""
+    line_break = '\0'
+    markdown_text = ''
+    for item in _inline_items(block, processing_options):
+        markdown_text += line_break if isinstance(item, Break) else item.markdown()
+
+    # pandoc collapses spaces, drops spaces at the start and end of a block and around line breaks, and writes a
+    # line break as two spaces and a new line
+    markdown_text = re.sub(' *\0 *', line_break, re.sub(' {2,}', ' ', markdown_text)).strip(' ')
+    markdown_text = markdown_text.replace(line_break, '  \n')
+    if markdown_text.endswith('\n'):
+        markdown_text = markdown_text[:-1]  # the block ends after a line break at its end
+
+    return markdown_text
+
+
+def _collapse_whitespace(text) -> str:
+    return COLLAPSED_WHITESPACE.sub(' ', str(text))
+
+
+def _inline_items(block, processing_options: Optional[ProcessingOptions]) -> list:
+    """
+    Return the note data of the children of a block.
+
+    process_child_items() drops new lines at the ends of text, where pandoc reads them as spaces between words, so
+    the white space in text is collapsed to a space before the text is added.
+    """
+    items = []
+    for child in block.children:
+        if not is_a_tag(child):
+            items.append(TextItem(processing_options, _collapse_whitespace(child)))
+            continue
+
+        items = helper_functions.merge_iterable_or_item_to_list(items, extract_from_tag(child, processing_options))
+
+    return items
+
+
+def convert(soup: BeautifulSoup, processing_options: ProcessingOptions) -> str:
+    """Return the markdown pandoc would produce for html is_simple_html() has accepted"""
+    title = soup.find('title')
+    title = title.get_text() if title else ''
+
+    blocks = []
+    for block in soup.find_all(BLOCK_TAGS):
+        markdown_text = _inline_markdown(block, processing_options)
+        if not markdown_text:
+            continue  # pandoc drops empty paragraphs
+
+        if block.name != 'p':
+            heading_text = [TextItem(processing_options, markdown_text)]
+            markdown_text = HeadingItem(processing_options, heading_text, int(block.name[1]), '').markdown()
+
+        blocks.append(markdown_text.rstrip('\n'))
+
+    title_block = f'---\ntitle: {title}\n---\n\n' if title else ''
+    if not blocks:
+        return title_block
+
+    return title_block + '\n\n'.join(blocks) + '\n'
+
+
+def convert_if_simple(html: str, processing_options: ProcessingOptions) -> Optional[str]:
+    """Return the markdown for simple html, or None if the html should be converted by pandoc"""
+    # the fast path emulates pandoc's reading of the html, which matches the tree html.parser builds and not lxml's
+    soup = helper_functions.make_soup_from_html(html, html_parser='html.parser')
+    if not is_simple_html(soup):
+        return None
+
+    return convert(soup, processing_options)
@@ -5,10 +5,11 @@ This module allows iframes to be retained when converting HTML-Markdown, the pre
 would be called before and after pandoc conversion
 
 """
-from bs4 import BeautifulSoup
 import re
 from typing import Tuple
 
+import helper_functions
+
 
 def pre_process_iframes_from_html(raw_content: str) -> Tuple[str, dict]:
     """Locate, and replace iframes with placeholder ID
@@ -26,7 +27,7 @@ def pre_process_iframes_from_html(raw_content: str) -> Tuple[str, dict]:
         Dictionary where the key is the unique placeholder string, the value is the iframe beautiful soup tag object
 
     """
-    soup = BeautifulSoup(raw_content, 'html.parser')
+    soup = helper_functions.make_soup_from_html(raw_content, html_parser='html.parser')
 
     iframes = soup.select('iframe')
     iframes_dict = {}
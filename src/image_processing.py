@@ -2,8 +2,6 @@ import logging
 import re
 from typing import Optional
 
-from bs4 import BeautifulSoup
-
 import helper_functions
 import config
 
@@ -187,7 +185,7 @@ def replace_markdown_html_img_tag_with_obsidian_image_links(content: str) -> str
         Updated content with replaced image links
 
     """
-    soup = BeautifulSoup(content, 'html.parser')
+    soup = helper_functions.make_soup_from_html(content, html_parser='html.parser')
     tags = soup.findAll('img')
     replacements = {}
     for i in range(len(tags)):
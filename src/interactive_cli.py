@@ -6,7 +6,6 @@ import logging
 from pathlib import Path
 
 from conversion_settings import ConversionSettings
-from pyfiglet import Figlet
 from PyInquirer.prompt import prompt
 import PyInquirer
 from prompt_toolkit.styles import Style
@@ -20,6 +19,7 @@ def what_module_is_this():
 
 
 def show_app_title():
+    from pyfiglet import Figlet  # slow to import and only needed for the title
     print(Figlet().renderText(config.yanom_globals.app_name))
     f = Figlet(font='slant')
     print(f.renderText(config.yanom_globals.app_sub_name))
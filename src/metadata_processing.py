@@ -1,10 +1,10 @@
 import logging
 import time
 
-from bs4 import BeautifulSoup
 import frontmatter
 
 import config
+import helper_functions
 
 
 def what_module_is_this():
@@ -29,7 +29,7 @@ class MetaDataProcessor:
 
     def parse_html_metadata(self, html_metadata_source):
         self.logger.debug(f"Parsing HTML meta-data")
-        soup = BeautifulSoup(html_metadata_source, 'html.parser')
+        soup = helper_functions.make_soup_from_html(html_metadata_source, html_parser='html.parser')
 
         head = soup.find('head')
         if head is None:
@@ -217,7 +217,7 @@ class MetaDataProcessor:
             return content
 
         title_text = ''
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = helper_functions.make_soup_from_html(content, html_parser='html.parser')
 
         head = soup.find('head')
         if head is None:
@@ -2,7 +2,6 @@ from copy import copy
 from pathlib import Path
 from typing import Set
 
-from bs4 import BeautifulSoup
 from conversion_settings import ConversionSettings
 
 import file_writer
@@ -27,8 +26,12 @@ def get_file_suffix_for(export_format: str) -> str:
     return '.md'
 
 
-def read_link_source_file(path_to_zip, path_in_zip_file):
-    return zip_file_reader.read_binary_file(path_to_zip, Path(path_in_zip_file), message=str(path_to_zip))
+def open_link_source_file(path_to_zip, path_in_zip_file):
+    return zip_file_reader.open_binary_file(path_to_zip, Path(path_in_zip_file), message=str(path_to_zip))
+
+
+def read_link_source_file_header(path_to_zip, path_in_zip_file):
+    return zip_file_reader.read_file_header(path_to_zip, Path(path_in_zip_file), message=str(path_to_zip))
 
 
 def write_asset_to_target(asset_content, asset_link, path_to_note_folder):
@@ -39,7 +42,7 @@ def write_asset_to_target(asset_content, asset_link, path_to_note_folder):
     if new_target_path != full_path:
         asset_link.update_target(Path(asset_link.target_path.parent, new_target_path.name))
 
-    file_writer.write_bytes(new_target_path, asset_content)
+    file_writer.store_file(new_target_path, asset_content)
 
 
 def match_nimbus_mentions_to_files_or_folders(a_document, nimbus_ids, dict_of_notes):
@@ -52,16 +55,19 @@ def process_note_assets(a_note, attachment_folder_name, processing_options):
     asset_links = a_note.find_items(class_=(FileAttachment, ImageAttachment))
     zip_file_path = Path(a_note.note_paths.path_to_note_source, a_note.note_paths.note_source_file_name)
 
-    # process the known about linked files
-    filenames_processed = extract_and_write_assets(a_note, asset_links, attachment_folder_name, zip_file_path)
+    try:
+        # process the known about linked files
+        filenames_processed = extract_and_write_assets(a_note, asset_links, attachment_folder_name, zip_file_path)
 
-    # now locate orphan files
-    orphans = find_orphan_filenames_in_zipfile(filenames_processed, str(zip_file_path))
-    if not orphans:
-        return
+        # now locate orphan files
+        orphans = find_orphan_filenames_in_zipfile(filenames_processed, str(zip_file_path))
+        if not orphans:
+            return
 
-    # now process the orphan files and add links for these files to to body content
-    process_orphan_files(a_note, attachment_folder_name, orphans, processing_options, zip_file_path)
+        # now process the orphan files and add links for these files to to body content
+        process_orphan_files(a_note, attachment_folder_name, orphans, processing_options, zip_file_path)
+    finally:
+        zip_file_reader.close_zip_file(zip_file_path)
 
 
 def process_orphan_files(a_note, attachment_folder_name, orphans, processing_options, zip_file_path):
@@ -112,13 +118,14 @@ def extract_and_write_assets(a_note, asset_links, attachment_folder_name, zip_fi
     for link in asset_links:
         link.set_target_path(attachment_folder_name)
 
-        asset = read_link_source_file(zip_file_path, str(link.source_path))
-
         # in nimbus all audio files are exported as .mpga irrespective of what the file actually is
         # so use header bytes form the asset to identify the correct extension
         if link.source_path.suffix == '.mpga':
-            link.target_path = helper_functions.correct_file_extension(asset[:261], link.target_path)
+            header = read_link_source_file_header(zip_file_path, str(link.source_path))
+            if header:
+                link.target_path = helper_functions.correct_file_extension(header, link.target_path)
 
+        asset = open_link_source_file(zip_file_path, str(link.source_path))
         write_asset_to_target(asset, link, a_note.note_paths.path_to_note_target)
 
         filenames_processed.add(str(link.source_path.name))
@@ -183,7 +190,11 @@ def initialise_new_note(zip_file, conversion_settings, processing_options: Nimbu
 
 def extract_note_data_from_zip_file(zip_file, processing_options: ProcessingOptions):
     html_content = zip_file_reader.read_text(zip_file, Path('note.html'), '')
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # assets are read later once all notes have been parsed so do not keep every zip file open until then
+    zip_file_reader.close_zip_file(zip_file)
+    # nimbus notes are rebuilt from the parsed tree, lxml repairs invalid markup differently to html.parser so it is
+    # not used here to keep the converted notes the same whichever parsers are installed
+    soup = helper_functions.make_soup_from_html(html_content, html_parser='html.parser')
     zip_file_data = process_child_items(soup.find("html"),
                                         processing_options,
                                         note_specific_tag_cleaning=extract_from_nimbus_tag,
@@ -0,0 +1,74 @@
+from collections.abc import Set
+from functools import lru_cache
+import os.path
+from pathlib import Path
+from typing import Iterable
+
+
+@lru_cache(maxsize=65536)
+def _absolute_link_path(directory: str, link: str) -> Path:
+    return Path(os.path.abspath(os.path.join(directory, link)))
+
+
+class NotePathIndex(Set):
+    """
+    Immutable set of the paths to the note files in a conversion.
+
+    The index is built once for a conversion and shared by every note, and the worker processes, to tell links between
+    note pages apart from links to attachments.  Relative links are resolved to absolute paths using memoised
+    os.path.abspath results, as the same links appear in many notes in the same folder.
+
+    Parameters
+    ==========
+    note_paths : Iterable[Path]
+        Absolute paths to each of the note files being converted.
+
+    """
+    __slots__ = ('_note_paths',)
+
+    def __init__(self, note_paths: Iterable[Path] = ()):
+        self._note_paths = frozenset(note_paths)
+
+    @classmethod
+    def from_paths(cls, note_paths: Iterable[Path]) -> 'NotePathIndex':
+        """Return note_paths if it is already an index, otherwise build an index from the provided paths"""
+        if isinstance(note_paths, cls):
+            return note_paths
+
+        return cls(note_paths)
+
+    @classmethod
+    def _from_iterable(cls, iterable):
+        # results of set operations, for example orphan files, are ordinary mutable sets
+        return set(iterable)
+
+    def __contains__(self, path) -> bool:
+        return path in self._note_paths
+
+    def __iter__(self):
+        return iter(self._note_paths)
+
+    def __len__(self) -> int:
+        return len(self._note_paths)
+
+    def __hash__(self) -> int:
+        return self._hash()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({len(self._note_paths)} note paths)'
+
+    @staticmethod
+    def absolute_link_path(content_file_path: Path, link: str) -> Path:
+        """Return the absolute path for a link found in the content of the file at content_file_path"""
+        if Path(link).is_absolute():
+            return Path(link)
+
+        if not content_file_path.is_absolute():
+            # the result depends on the current working directory so is not memoised
+            return Path(os.path.abspath(Path(content_file_path.parent, link)))
+
+        return _absolute_link_path(str(content_file_path.parent), link)
+
+    def is_note_link(self, content_file_path: Path, link: str) -> bool:
+        """Return True if the link, found in the content of the file at content_file_path, is to a note file"""
+        return self.absolute_link_path(content_file_path, link) in self._note_paths
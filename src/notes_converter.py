@@ -1,18 +1,23 @@
+from concurrent.futures import ProcessPoolExecutor
 import logging
+import multiprocessing.util
 from pathlib import Path
 import shutil
 import sys
 
-import file_mover
+import file_stat_cache
 import nimbus_converter
 from alive_progress import alive_bar
 
+from attachment_copier import AttachmentCopier
 import config
+import conversion_manifest
+from conversion_manifest import ConversionManifest
 from content_link_management import find_local_file_links_in_content, get_set_of_all_files, process_attachments
 from file_converter_HTML_to_MD import HTMLToMDConverter
 from file_converter_MD_to_HTML import MDToHTMLConverter
 from file_converter_MD_to_MD import MDToMDConverter
-import interactive_cli
+from note_path_index import NotePathIndex
 from nsx_file_converter import NSXFile
 from pandoc_converter import PandocConverter
 import report
@@ -23,6 +28,59 @@ def what_module_is_this():
     return __name__
 
 
+_worker_file_converter = None
+
+
+def _initialise_conversion_worker(file_converter_class, conversion_settings, files_to_convert, logger_level,
+                                  is_silent):
+    """Create the file converter used for every note converted by a worker process."""
+    global _worker_file_converter
+    config.yanom_globals.logger_level = logger_level
+    config.yanom_globals.is_silent = is_silent
+    config.yanom_globals.html_parser = conversion_settings.html_parser
+    _worker_file_converter = file_converter_class(conversion_settings, files_to_convert)
+    # atexit handlers do not run in pool worker processes so register a finaliser to stop any pandoc servers
+    multiprocessing.util.Finalize(_worker_file_converter, _worker_file_converter.pandoc_converter.close,
+                                  exitpriority=10)
+
+
+def _convert_note_in_worker(file):
+    return convert_and_write_note(_worker_file_converter, file)
+
+
+def convert_and_write_note(file_converter, file):
+    """
+    Convert and write a single note and return the details needed by the orphan file and report phases.
+
+    The returned dictionary only contains picklable values so that it can be returned from a worker process.
+    """
+    cache_hits = file_converter.pandoc_converter.cache_hits
+    cache_misses = file_converter.pandoc_converter.cache_misses
+
+    file_converter.convert_note(file)
+    exported_file_path = file_converter.write_post_processed_content()
+    attachment_links = file_converter.current_note_attachment_links
+
+    return {
+        'file': file,
+        'exported_file': exported_file_path,
+        'renamed_note_file': file_converter.renamed_note_file,
+        'attachment_details': {
+            'all': attachment_links.all,
+            'valid': attachment_links.valid,
+            'invalid': attachment_links.invalid,
+            'existing': attachment_links.existing,
+            'non_existing': attachment_links.non_existing,
+            'copyable': attachment_links.copyable,
+            'non_copyable_relative': attachment_links.non_copyable_relative,
+            'non_copyable_absolute': attachment_links.non_copyable_absolute,
+            'copyable_absolute': attachment_links.copyable_absolute,
+        },
+        'pandoc_cache_hits': file_converter.pandoc_converter.cache_hits - cache_hits,
+        'pandoc_cache_misses': file_converter.pandoc_converter.cache_misses - cache_misses,
+    }
+
+
 class NotesConvertor:
     """
     A class to direct the conversion of note files into alternative output formats.
@@ -42,6 +100,7 @@ class NotesConvertor:
         self.logger.setLevel(config.yanom_globals.logger_level)
         self.logger.info(f'Conversion startup')
         self.command_line_args = args
+        self._workers = 0
         self.conversion_settings = None
         self._note_page_count = 0
         self._note_book_count = 0
@@ -61,11 +120,21 @@ class NotesConvertor:
         self._nsx_null_attachments = {}
         self._encrypted_notes = []
         self._exported_files = set()
+        self._attachment_copier = None
+        self._manifest = None
+        self._full_conversion = False
+        self._resume = False
+        self._nsx_outputs = {}
         self._report = ''
+        self._pandoc_cache_hits = 0
+        self._pandoc_cache_misses = 0
+        self._chart_renders_avoided = 0
 
     def convert_notes(self):
         self.evaluate_command_line_arguments()
+        config.yanom_globals.html_parser = self.conversion_settings.html_parser
         self.create_export_folder_if_required()
+        self._manifest = self.create_conversion_manifest()
 
         note_formats = {
             'html': self.convert_html,
@@ -77,12 +146,34 @@ class NotesConvertor:
         conversion_to_run = note_formats.get(self.conversion_settings.conversion_input, None)
         conversion_to_run()
 
+        if self._manifest:
+            self._manifest.save()
+
         self.generate_results_report()
         self.logger.info("Processing Completed")
 
     def create_export_folder_if_required(self):
         self.conversion_settings.export_folder_absolute.mkdir(parents=True, exist_ok=True)
 
+    def create_conversion_manifest(self):
+        if self.conversion_settings.source_absolute_root == self.conversion_settings.export_folder_absolute:
+            # converted files are written next to their sources so previous outputs can not be safely removed
+            self.logger.info('Source and export folders are the same, all notes will be converted')
+            return None
+
+        if self.conversion_settings.source_absolute_root.is_file():
+            # a single file conversion does not know about the other sources an earlier conversion recorded
+            return None
+
+        return ConversionManifest(self.conversion_settings.export_folder_absolute,
+                                  conversion_manifest.settings_fingerprint(self.conversion_settings),
+                                  full=self._full_conversion,
+                                  source_absolute_root=self.conversion_settings.source_absolute_root,
+                                  conversion_input=self.conversion_settings.conversion_input)
+
+    def _manifest_key(self, source):
+        return Path(source).relative_to(self.conversion_settings.source_absolute_root).as_posix()
+
     def convert_markdown(self):
         with Timer(name="md_conversion", logger=self.logger.info, silent=bool(config.yanom_globals.is_silent)):
             file_extension = 'md'
@@ -95,6 +186,7 @@ class NotesConvertor:
                 md_file_converter = MDToMDConverter(self.conversion_settings, md_files_to_convert)
 
             self.process_files(md_files_to_convert, md_file_converter)
+            self.finish_with_pandoc_converter(md_file_converter.pandoc_converter)
 
             self.handle_orphan_files_as_required()
 
@@ -135,75 +227,137 @@ class NotesConvertor:
             sys.exit(0)
 
     def process_files(self, files_to_convert, file_converter):
-        self._set_files_to_convert = set(files_to_convert)
-        file_count = 0
+        # one immutable index of the note paths is shared by every note, and worker, to identify links between notes
+        note_path_index = NotePathIndex(files_to_convert)
+        self._set_files_to_convert = note_path_index
+        file_converter.files_to_convert = note_path_index
         self._attachment_count = 0
+        # attachments in the source folder do not change during a conversion so a single scan of the source folder
+        # answers the existence checks for every note.  The export folder is excluded as it is written to.
+        file_stat_cache.start_run(self.conversion_settings.source_absolute_root,
+                                  exclude=[self.conversion_settings.export_folder_absolute])
+        self._attachment_copier = AttachmentCopier(self.conversion_settings.source_absolute_root,
+                                                   self.conversion_settings.export_folder_absolute,
+                                                   self.conversion_settings.copy_mode)
+        try:
+            files_to_process = self.files_needing_conversion(files_to_convert)
+            self._process_files(files_to_process, file_converter)
+        finally:
+            self._attachment_copier.wait()
+            file_stat_cache.end_run()
+
+    def files_needing_conversion(self, files_to_convert):
+        """Return the notes that have changed since the last conversion and keep the outputs of the other notes"""
+        if not self._manifest:
+            return files_to_convert
+
+        files_to_process = []
+        for file in sorted(files_to_convert):
+            key = self._manifest_key(file)
+            if not self._manifest.is_unchanged(key, file):
+                self._manifest.remove_previous_outputs(key)
+                files_to_process.append(file)
+                continue
+
+            self._manifest.keep(key, file)
+            self._exported_files.update(Path(self.conversion_settings.export_folder_absolute, output)
+                                        for output in self._manifest.outputs(key))
+            for note, attachment_details in self._manifest.attachment_details(key).items():
+                self._attachment_details[note] = attachment_details
+                for attachment in attachment_details['copyable_absolute']:
+                    self._copy_attachment_if_changed(attachment)
+
+        self._manifest.remove_deleted_sources(self._manifest_key(file) for file in files_to_convert)
+        if len(files_to_process) < len(files_to_convert):
+            self.logger.info(f'{len(files_to_convert) - len(files_to_process)} unchanged notes will not be converted')
+
+        return files_to_process
+
+    def _copy_attachment_if_changed(self, attachment):
+        target = Path(self.conversion_settings.export_folder_absolute,
+                      attachment.relative_to(self.conversion_settings.source_absolute_root))
+        try:
+            source_stat = attachment.stat()
+            target_stat = target.stat()
+            if source_stat.st_size == target_stat.st_size and source_stat.st_mtime_ns <= target_stat.st_mtime_ns:
+                return
+        except OSError:
+            pass
+
+        self._copy_attachment(attachment)
+
+    def _process_files(self, files_to_convert, file_converter):
+        if self._workers > 1 and len(files_to_convert) > 1:
+            converted_notes = self._convert_notes_in_worker_processes(files_to_convert, file_converter)
+        else:
+            converted_notes = (convert_and_write_note(file_converter, file) for file in files_to_convert)
 
         if not config.yanom_globals.is_silent:
             print(f"Processing note pages")
             with alive_bar(len(files_to_convert), bar='blocks') as file_bar:
-                for file in files_to_convert:
-                    file_count = self._convert_note(file_converter, file, file_count, file_bar)
-
-            self._note_page_count = file_count
+                self._note_page_count = self._record_converted_notes(converted_notes, file_bar)
             return
 
-        for file in files_to_convert:
-            file_count = self._convert_note(file_converter, file, file_count)
-        self._note_page_count = file_count
+        self._note_page_count = self._record_converted_notes(converted_notes)
 
-    def _convert_note(self, file_converter, file, file_count, file_bar=None):
-        file_converter.convert_note(file)
-        if file_converter.renamed_note_file:
-            self._set_of_renamed_note_files.add(file_converter.renamed_note_file)
-        exported_file_path = file_converter.write_post_processed_content()
-        self._exported_files.add(exported_file_path)
-        file_count += 1
+    def _convert_notes_in_worker_processes(self, files_to_convert, file_converter):
+        self.logger.info(f"Converting notes using {self._workers} worker processes")
+        initialise_arguments = (file_converter.__class__, self.conversion_settings, file_converter.files_to_convert,
+                                config.yanom_globals.logger_level, config.yanom_globals.is_silent)
+        chunk_size = max(1, len(files_to_convert) // (self._workers * 4))
+        with ProcessPoolExecutor(max_workers=self._workers, initializer=_initialise_conversion_worker,
+                                 initargs=initialise_arguments) as executor:
+            # map returns results in the order of files_to_convert so the merged results are deterministic
+            yield from executor.map(_convert_note_in_worker, files_to_convert, chunksize=chunk_size)
+
+    def _record_converted_notes(self, converted_notes, file_bar=None):
+        file_count = 0
+        for converted_note in converted_notes:
+            self._record_converted_note(converted_note)
+            file_count += 1
+            if file_bar:
+                file_bar()
+
+        return file_count
+
+    def _record_converted_note(self, converted_note):
+        if converted_note['renamed_note_file']:
+            self._set_of_renamed_note_files.add(converted_note['renamed_note_file'])
+        self._exported_files.add(converted_note['exported_file'])
+        self._pandoc_cache_hits += converted_note['pandoc_cache_hits']
+        self._pandoc_cache_misses += converted_note['pandoc_cache_misses']
 
         if not self.conversion_settings.source_absolute_root == self.conversion_settings.export_folder_absolute:
-            for attachment in file_converter.current_note_attachment_links.copyable_absolute:
+            for attachment in converted_note['attachment_details']['copyable_absolute']:
                 self._copy_attachment(attachment)
 
-        self._attachment_details[file] = {
-            'all': file_converter.current_note_attachment_links.all,
-            'valid': file_converter.current_note_attachment_links.valid,
-            'invalid': file_converter.current_note_attachment_links.invalid,
-            'existing': file_converter.current_note_attachment_links.existing,
-            'non_existing': file_converter.current_note_attachment_links.non_existing,
-            'copyable': file_converter.current_note_attachment_links.copyable,
-            'non_copyable_relative': file_converter.current_note_attachment_links.non_copyable_relative,
-            'non_copyable_absolute': file_converter.current_note_attachment_links.non_copyable_absolute,
-            'copyable_absolute': file_converter.current_note_attachment_links.copyable_absolute,
-        }
-        if file_bar:
-            file_bar()
+        self._attachment_details[converted_note['file']] = converted_note['attachment_details']
 
-        return file_count
+        if self._manifest:
+            copied_attachments = (Path(self.conversion_settings.export_folder_absolute,
+                                       attachment.relative_to(self.conversion_settings.source_absolute_root))
+                                  for attachment in converted_note['attachment_details']['copyable_absolute'])
+            self._manifest.record(self._manifest_key(converted_note['file']), converted_note['file'],
+                                  [converted_note['exported_file']], copied_attachments,
+                                  {converted_note['file']: converted_note['attachment_details']})
 
     def _copy_attachment(self, attachment):
-        if attachment.exists() and attachment.is_file():
-            attachment_path_relative_to_source = attachment.relative_to(
-                self.conversion_settings.source_absolute_root)
-            target_attachment_absolute_path = Path(self.conversion_settings.export_folder_absolute,
-                                                   attachment_path_relative_to_source)
-
-            target_attachment_absolute_path.parent.mkdir(parents=True, exist_ok=True)
-
-            shutil.copy(attachment, target_attachment_absolute_path)
-        else:
-            self.logger.warning(f'Unable to copy attachment "{attachment}" - It does not exist or is a directory.')
+        # attachments linked from many notes are only copied once, copies are made on the copier's threads
+        self._attachment_copier.schedule(attachment)
 
     def get_list_of_orphan_files(self, set_of_all_files):
-        orphans = set_of_all_files
-        for file, attachments in self._attachment_details.items():
-            orphans = orphans \
-                      - self._set_files_to_convert \
-                      - set(self._exported_files) \
-                      - attachments['copyable_absolute'] \
-                      - attachments['non_copyable_absolute'] \
-                      - self._set_of_renamed_note_files
+        return set(set_of_all_files) - self.get_set_of_referenced_files()
 
-        return orphans
+    def get_set_of_referenced_files(self):
+        """Return the union of the note files, exported and renamed files and the attachments linked to by notes"""
+        referenced_files = set(self._set_files_to_convert)
+        referenced_files.update(self._exported_files)
+        referenced_files.update(self._set_of_renamed_note_files)
+        for attachments in self._attachment_details.values():
+            referenced_files.update(attachments['copyable_absolute'])
+            referenced_files.update(attachments['non_copyable_absolute'])
+
+        return referenced_files
 
     def convert_html(self):
         with Timer(name="html_conversion", logger=self.logger.info, silent=bool(config.yanom_globals.is_silent)):
@@ -213,6 +367,7 @@ class NotesConvertor:
             self.exit_if_no_files_found(html_files_to_convert, file_extension)
             html_file_converter = HTMLToMDConverter(self.conversion_settings, html_files_to_convert)
             self.process_files(html_files_to_convert, html_file_converter)
+            self.finish_with_pandoc_converter(html_file_converter.pandoc_converter)
             self.handle_orphan_files_as_required()
 
     def convert_nsx(self):
@@ -220,9 +375,11 @@ class NotesConvertor:
         nsx_files_to_convert = self.generate_file_list(file_extension, self.conversion_settings.source_absolute_root)
         self.exit_if_no_files_found(nsx_files_to_convert, file_extension)
         self.pandoc_converter = PandocConverter(self.conversion_settings)
-        self._nsx_backups = [NSXFile(file, self.conversion_settings, self.pandoc_converter)
+        self._nsx_backups = [NSXFile(file, self.conversion_settings, self.pandoc_converter, self._workers,
+                                     resume=self._resume)
                              for file in nsx_files_to_convert]
         self.process_nsx_files()
+        self.finish_with_pandoc_converter(self.pandoc_converter)
         self.check_nsx_attachment_links()
 
     def convert_nimbus(self):
@@ -233,45 +390,159 @@ class NotesConvertor:
 
             self.exit_if_no_files_found(nimbus_files_to_convert, file_extension)
 
+            if self.nimbus_notes_are_unchanged(nimbus_files_to_convert):
+                self.logger.info('Nimbus notes are unchanged since the last conversion')
+                return
+
+            outputs_before = self._list_export_folder_files()
             num_images, num_attachments = nimbus_converter.convert_nimbus_notes(self.conversion_settings,
                                                                                 nimbus_files_to_convert)
+            self._record_nimbus_outputs(nimbus_files_to_convert, outputs_before)
 
             self._note_page_count = len(nimbus_files_to_convert)
             self._image_count = num_images
             self._attachment_count = num_attachments
 
+    def nimbus_notes_are_unchanged(self, nimbus_files_to_convert):
+        """
+        Return True if none of the nimbus zip files have changed, otherwise remove the previously converted notes.
+
+        Nimbus notes link to each other by title so the zip files are converted together, if any have changed,
+        been added or deleted they are all reconverted.
+        """
+        if not self._manifest:
+            return False
+
+        keys = {self._manifest_key(zip_file): zip_file for zip_file in nimbus_files_to_convert}
+        if self._manifest.previous_keys() == set(keys) \
+                and all(self._manifest.is_unchanged(key, zip_file) for key, zip_file in keys.items()):
+            for key, zip_file in keys.items():
+                self._manifest.keep(key, zip_file)
+            return True
+
+        for key in self._manifest.previous_keys():
+            self._manifest.remove_previous_outputs(key)
+        self._manifest.remove_deleted_sources(keys)
+        return False
+
+    def _record_nimbus_outputs(self, nimbus_files_to_convert, outputs_before):
+        if not self._manifest:
+            return
+
+        outputs = self._list_export_folder_files() - outputs_before
+        # the outputs of all the zip files are recorded against the first, as they are always reconverted together
+        for zip_file in sorted(nimbus_files_to_convert):
+            self._manifest.record(self._manifest_key(zip_file), zip_file, outputs)
+            outputs = ()
+
+    def _list_export_folder_files(self):
+        if not self._manifest:
+            return set()
+
+        return conversion_manifest.list_files(self.conversion_settings.export_folder_absolute, include_folders=True)
+
     def process_nsx_files(self):
         with Timer(name="nsx_conversion", logger=self.logger.info, silent=bool(config.yanom_globals.is_silent)):
+            if self._manifest:
+                self._manifest.remove_deleted_sources(self._manifest_key(nsx_file.nsx_file_name)
+                                                      for nsx_file in self._nsx_backups)
+
             for nsx_file in self._nsx_backups:
+                if self.nsx_file_is_unchanged(nsx_file):
+                    continue
+
                 nsx_file.process_nsx_file()
+                if self._manifest:
+                    self._nsx_outputs[nsx_file.nsx_file_name] = self._nsx_file_outputs(nsx_file)
                 self.update_processing_stats(nsx_file)
                 self._nsx_null_attachments.update(nsx_file.null_attachments)
                 self._encrypted_notes += nsx_file.encrypted_notes
                 self._exported_files.update(nsx_file.exported_notes)
 
+    def nsx_file_is_unchanged(self, nsx_file):
+        """
+        Return True if the nsx file has not changed since the last conversion, otherwise remove its converted notes.
+
+        Note book folder, note and attachment file names are made unique using the files already in the export
+        folder, so a changed nsx file has its previously converted files removed and all of its notes reconverted.
+        """
+        if not self._manifest:
+            return False
+
+        key = self._manifest_key(nsx_file.nsx_file_name)
+        if not self._manifest.is_unchanged(key, nsx_file.nsx_file_name):
+            self._manifest.remove_previous_outputs(key)
+            return False
+
+        self.logger.info(f'{nsx_file.nsx_file_name} is unchanged since the last conversion')
+        self._manifest.keep(key, nsx_file.nsx_file_name)
+        self._attachment_details.update(self._manifest.attachment_details(key))
+        return True
+
+    def _nsx_file_outputs(self, nsx_file):
+        """Return the notebook folders created for an nsx file, and the files in them, relative to the export folder"""
+        outputs = set()
+        for notebook in nsx_file.notebooks.values():
+            if not notebook.full_path_to_notebook:
+                continue
+
+            notebook_folder = self._manifest_relative_output(notebook.full_path_to_notebook)
+            outputs.add(f'{notebook_folder}/')
+            outputs.update(f'{notebook_folder}/{output}'
+                           for output in conversion_manifest.list_files(notebook.full_path_to_notebook,
+                                                                        include_folders=True))
+
+        return outputs
+
+    def _manifest_relative_output(self, path):
+        return Path(path).relative_to(self.conversion_settings.export_folder_absolute).as_posix()
+
+    def _record_nsx_outputs(self):
+        for nsx_file in self._nsx_backups:
+            if nsx_file.nsx_file_name not in self._nsx_outputs:
+                continue
+
+            attachment_details = {Path(note_page.full_path): self._attachment_details[Path(note_page.full_path)]
+                                  for note_page in nsx_file.note_pages.values()
+                                  if Path(note_page.full_path) in self._attachment_details}
+            self._manifest.record(self._manifest_key(nsx_file.nsx_file_name), nsx_file.nsx_file_name,
+                                  self._nsx_outputs[nsx_file.nsx_file_name], attachment_details=attachment_details)
+
     def check_nsx_attachment_links(self):
         if not config.yanom_globals.is_silent:
             print(f"Analysing note page links")
-        notes_to_check = self.generate_file_list(file_mover.get_file_suffix_for(self.conversion_settings.export_format),
-                                                 self.conversion_settings.export_folder_absolute
-                                                 )
-        if not config.yanom_globals.is_silent:
-            with alive_bar(len(notes_to_check), bar='blocks') as bar:
-                for note in notes_to_check:
-                    self._nsx_attachment_checks(note, notes_to_check, bar)
-            return
-
-        for note in notes_to_check:
-            self._nsx_attachment_checks(note, notes_to_check)
+        # the converted content of each note page is still in memory so the export folder is not read back
+        notes_to_check = {Path(note_page.full_path): note_page.converted_content
+                          for nsx_file in self._nsx_backups
+                          for note_page in nsx_file.note_pages.values()
+                          }
+        note_path_index = NotePathIndex(notes_to_check)
+        # all the nsx notes and attachments have been written so the export folder no longer changes
+        file_stat_cache.start_run(self.conversion_settings.export_folder_absolute)
+        try:
+            if not config.yanom_globals.is_silent:
+                with alive_bar(len(notes_to_check), bar='blocks') as bar:
+                    for note, content in notes_to_check.items():
+                        self._nsx_attachment_checks(note, content, note_path_index, bar)
+                return
+
+            for note, content in notes_to_check.items():
+                self._nsx_attachment_checks(note, content, note_path_index)
+        finally:
+            file_stat_cache.end_run()
+            if self._manifest:
+                self._record_nsx_outputs()
+
+    def _nsx_attachment_checks(self, note, content, note_path_index, bar=None):
+        if content is None:  # streamed note pages release their content once written
+            content = note.read_text(encoding='utf-8')
 
-    def _nsx_attachment_checks(self, note, notes_to_check, bar=None):
-        content = note.read_text(encoding='utf-8')
         all_attachments_paths = find_local_file_links_in_content(self.conversion_settings.export_format,
                                                                  content)
 
         attachment_links = process_attachments(note,
                                                all_attachments_paths,
-                                               notes_to_check,
+                                               note_path_index,
                                                self.conversion_settings.export_folder_absolute
                                                )
 
@@ -290,15 +561,25 @@ class NotesConvertor:
         if bar:
             bar()
 
+    def finish_with_pandoc_converter(self, pandoc_converter):
+        pandoc_converter.close()
+        self._pandoc_cache_hits += pandoc_converter.cache_hits
+        self._pandoc_cache_misses += pandoc_converter.cache_misses
+
     def update_processing_stats(self, nsx_file):
         self._note_page_count += nsx_file.note_page_count
         self._note_book_count += nsx_file.note_book_count
         self._image_count += nsx_file.image_count
         self._attachment_count += nsx_file.attachment_count
+        self._chart_renders_avoided += nsx_file.chart_renders_avoided
 
     def evaluate_command_line_arguments(self):
         self.configure_for_ini_settings()
 
+        self._workers = max(self.command_line_args.get('workers', 0) or 0, 0)
+        self._full_conversion = bool(self.command_line_args.get('full', False))
+        self._resume = bool(self.command_line_args.get('resume', False))
+
         if self.command_line_args['source']:
             self.conversion_settings.source = self.command_line_args['source']
 
@@ -312,6 +593,7 @@ class NotesConvertor:
         self.run_interactive_command_line_interface()
 
     def run_interactive_command_line_interface(self):
+        import interactive_cli  # imported here so silent conversions do not load the interactive libraries
         command_line_interface = interactive_cli.StartUpCommandLineInterface(self.conversion_settings)
         self.conversion_settings = command_line_interface.run_cli()
         self.config_data.conversion_settings = self.conversion_settings  # this will save the setting in the ini file
@@ -372,3 +654,22 @@ class NotesConvertor:
     @property
     def encrypted_notes(self):
         return self._encrypted_notes
+
+    @property
+    def unchanged_source_count(self):
+        if not self._manifest:
+            return 0
+
+        return self._manifest.skipped_count
+
+    @property
+    def pandoc_cache_hits(self):
+        return self._pandoc_cache_hits
+
+    @property
+    def pandoc_cache_misses(self):
+        return self._pandoc_cache_misses
+
+    @property
+    def chart_renders_avoided(self):
+        return self._chart_renders_avoided
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+import threading
+from typing import Optional, Union
+
+import config
+
+
+def what_module_is_this():
+    return __name__
+
+
+CHECKPOINT_FILE_PREFIX = '.yanom_checkpoint-'
+
+# note pages can be completed from the threads that store chart images, a module lock as checkpoints are pickled
+_journal_lock = threading.Lock()
+
+
+def checkpoint_exists(export_folder_absolute: Union[Path, str]) -> bool:
+    return any(Path(export_folder_absolute).glob(f'{CHECKPOINT_FILE_PREFIX}*'))
+
+
+def checkpoint_path(export_folder_absolute: Path, nsx_file_name: Path) -> Path:
+    path_hash = hashlib.md5(str(Path(nsx_file_name).absolute()).encode('utf-8')).hexdigest()[:8]
+    return Path(export_folder_absolute, f'{CHECKPOINT_FILE_PREFIX}{Path(nsx_file_name).stem}-{path_hash}.jsonl')
+
+
+class NSXCheckpoint:
+    """
+    Journal of the completed phases and note pages of an nsx file conversion, used to resume an interrupted conversion.
+
+    The journal is a file of json lines in the export folder.  The first line identifies the nsx file and conversion
+    settings, each later line records a completed phase or note page along with the data needed to restore it, so a
+    line is appended as each step completes rather than rewriting the whole journal.  A line that was only partly
+    written when a conversion was interrupted is ignored.  The journal is removed once the nsx file is converted.
+
+    Parameters
+    ----------
+    export_folder_absolute : Path
+        Folder the nsx file is converted into and the journal is kept in.
+    nsx_file_name : Path
+        The nsx file being converted.
+    settings_fingerprint : str
+        Hash of the conversion settings, a journal written with other settings is not resumed.
+    resume : bool
+        If True continue from an existing journal, otherwise any existing journal is discarded.
+
+    """
+    def __init__(self, export_folder_absolute: Path, nsx_file_name: Path, settings_fingerprint: str,
+                 resume: bool = False):
+        self.logger = logging.getLogger(f'{config.yanom_globals.app_name}.'
+                                        f'{what_module_is_this()}.'
+                                        f'{self.__class__.__name__}'
+                                        )
+        self.logger.setLevel(config.yanom_globals.logger_level)
+        self._path = checkpoint_path(export_folder_absolute, nsx_file_name)
+        self._phases = {}
+        self._completed_note_pages = {}
+        nsx_stat = Path(nsx_file_name).stat()
+        self._header = {
+            'nsx_file': str(nsx_file_name),
+            'size': nsx_stat.st_size,
+            'mtime_ns': nsx_stat.st_mtime_ns,
+            'settings': settings_fingerprint,
+        }
+
+        if resume and self._load():
+            self.logger.info(f'Resuming conversion of {nsx_file_name}, {len(self._phases)} phases and '
+                             f'{len(self._completed_note_pages)} note pages already completed')
+            return
+
+        self._write([self._header], mode='w')
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def is_resumed(self) -> bool:
+        return bool(self._phases)
+
+    def _load(self) -> bool:
+        try:
+            lines = self._path.read_text(encoding='utf-8').splitlines()
+        except FileNotFoundError:
+            self.logger.info(f'No checkpoint found at "{self._path}", starting a new conversion')
+            return False
+        except OSError as e:
+            self.logger.warning(f'Unable to read checkpoint "{self._path}", starting a new conversion - {e}')
+            return False
+
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break  # the conversion was interrupted while this line was written
+
+        if not records or records[0] != self._header:
+            self.logger.warning(f'Checkpoint "{self._path}" is for a different nsx file or conversion settings, '
+                                f'starting a new conversion')
+            return False
+
+        for record in records[1:]:
+            if 'phase' in record:
+                self._phases[record['phase']] = record.get('data')
+            elif 'note_page' in record:
+                self._completed_note_pages[record['note_page']] = record.get('data')
+
+        return True
+
+    def _write(self, records, mode='a'):
+        # opened for each write so the checkpoint can be passed to worker processes
+        with _journal_lock, open(self._path, mode, encoding='utf-8') as journal:
+            for record in records:
+                journal.write(f'{json.dumps(record)}\n')
+
+    def is_phase_completed(self, phase: str) -> bool:
+        return phase in self._phases
+
+    def phase_data(self, phase: str) -> Optional[dict]:
+        return self._phases.get(phase)
+
+    def complete_phase(self, phase: str, data: Optional[dict] = None):
+        self._phases[phase] = data
+        self._write([{'phase': phase, 'data': data}])
+
+    def completed_note_page(self, note_id: str) -> Optional[dict]:
+        """Return the data recorded for a completed note page, or None if the note page has not been completed"""
+        return self._completed_note_pages.get(note_id)
+
+    @property
+    def completed_note_pages(self) -> dict:
+        return self._completed_note_pages
+
+    def complete_note_page(self, note_id: str, data: dict):
+        self._completed_note_pages[note_id] = data
+        self._write([{'note_page': note_id, 'data': data}])
+
+    def finish(self):
+        """Remove the journal once the nsx file has been converted"""
+        try:
+            self._path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f'Unable to remove checkpoint "{self._path}" - {e}')
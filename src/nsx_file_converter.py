@@ -1,14 +1,21 @@
 from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 import logging
+import multiprocessing.util
 from pathlib import Path
 import sys
 
 from alive_progress import alive_bar
 
+import chart_cache
+import chart_renderer
 import config
+import conversion_manifest
 import file_writer
 import helper_functions
+from nsx_checkpoint import NSXCheckpoint
 from nsx_inter_note_link_processor import NSXInterNoteLinkProcessor
+from sn_attachment import ChartImageNSAttachment
 from sn_notebook import Notebook
 from sn_note_page import NotePage
 import zip_file_reader
@@ -21,10 +28,42 @@ def what_module_is_this():
 Note = namedtuple("Note", "title, note")
 Attachment = namedtuple('Attachment', 'attachment, note_title')
 
+_worker_nsx_file = None
+
+
+def _initialise_note_page_worker(nsx_file, logger_level, is_silent):
+    global _worker_nsx_file
+    config.yanom_globals.logger_level = logger_level
+    config.yanom_globals.is_silent = is_silent
+    config.yanom_globals.html_parser = nsx_file.conversion_settings.html_parser
+    _worker_nsx_file = nsx_file
+    _worker_nsx_file.pandoc_converter.detach_from_parent_process()
+    chart_renderer.start()  # charts are rendered in the worker process, not on the pool of the parent process
+    nsx_file.start_chart_cache()
+    # atexit handlers do not run in pool worker processes so register a finaliser to stop any pandoc servers
+    multiprocessing.util.Finalize(_worker_nsx_file, _worker_nsx_file.pandoc_converter.close, exitpriority=10)
+
+
+def _convert_note_page_in_worker(note_id):
+    pandoc_converter = _worker_nsx_file.pandoc_converter
+    cache_hits, cache_misses = pandoc_converter.cache_hits, pandoc_converter.cache_misses
+    chart_renders_avoided = chart_cache.current().renders_avoided
+
+    note_page = _worker_nsx_file.note_pages[note_id]
+    note_page.convert_note_content()
+
+    conversion_result = note_page.conversion_result()
+    if _worker_nsx_file.conversion_settings.stream_nsx_notes:
+        note_page.release_converted_content()
+    conversion_result['pandoc_cache_hits'] = pandoc_converter.cache_hits - cache_hits
+    conversion_result['pandoc_cache_misses'] = pandoc_converter.cache_misses - cache_misses
+    conversion_result['chart_renders_avoided'] = chart_cache.current().renders_avoided - chart_renders_avoided
+    return conversion_result
+
 
 class NSXFile:
 
-    def __init__(self, file, conversion_settings, pandoc_converter):
+    def __init__(self, file, conversion_settings, pandoc_converter, workers=0, resume=False):
         self.logger = logging.getLogger(f'{config.yanom_globals.app_name}.'
                                         f'{what_module_is_this()}.'
                                         f'{self.__class__.__name__}'
@@ -47,8 +86,31 @@ class NSXFile:
         self._null_attachments = {}
         self._encrypted_notes = []
         self._exported_notes = []
+        self._workers = workers
+        self._resume = resume
+        self._checkpoint = None
+        self._saved_note_page_ids = set()
+        self._chart_renders_avoided = 0
 
     def process_nsx_file(self):
+        chart_renderer.start(self._conversion_settings.chart_workers)
+        self.start_chart_cache()
+        try:
+            self._process_nsx_file()
+        finally:
+            chart_renderer.stop()
+            self._chart_renders_avoided += chart_cache.current().renders_avoided
+            chart_cache.end()
+            zip_file_reader.close_zip_file(self._nsx_file_name)
+
+    def start_chart_cache(self):
+        cache_directory = None
+        if self._conversion_settings.chart_cache_size_mb > 0:
+            cache_directory = Path(self._conversion_settings.working_directory, config.yanom_globals.data_dir,
+                                   'chart_cache')
+        chart_cache.start(cache_directory, self._conversion_settings.chart_cache_size_mb * 1024 * 1024)
+
+    def _process_nsx_file(self):
         self.logger.info(f"Processing {self._nsx_file_name}")
         self._nsx_json_data = self.fetch_json_data('config.json')
         if not self._nsx_json_data:
@@ -68,14 +130,32 @@ class NSXFile:
         self.add_notebooks()
         self.add_recycle_bin_notebook()
         self.create_export_folder_if_not_exist()
-        notebooks_to_skip = self.create_notebook_and_attachment_folders()
-        self.remove_notebooks_to_be_skipped(notebooks_to_skip)
+        self._checkpoint = NSXCheckpoint(self._conversion_settings.export_folder_absolute, self._nsx_file_name,
+                                         conversion_manifest.settings_fingerprint(self._conversion_settings),
+                                         resume=self._resume)
+        if self._checkpoint.is_phase_completed('notebook_folders'):
+            self.restore_notebook_folders(self._checkpoint.phase_data('notebook_folders'))
+        else:
+            notebooks_to_skip = self.create_notebook_and_attachment_folders()
+            self.remove_notebooks_to_be_skipped(notebooks_to_skip)
+            self._checkpoint.complete_phase('notebook_folders',
+                                            {notebook_id: str(notebook.full_path_to_notebook)
+                                             for notebook_id, notebook in self._notebooks.items()})
         self.add_note_pages()
         self.add_note_pages_to_notebooks()
-        self.generate_note_page_filename_and_path()
+        if self._checkpoint.is_phase_completed('note_page_names'):
+            self.restore_note_page_filename_and_path(self._checkpoint.phase_data('note_page_names'))
+            self.remove_files_of_unfinished_note_pages()
+        else:
+            self.generate_note_page_filename_and_path()
+            self._checkpoint.complete_phase('note_page_names',
+                                            {note_id: note_page.names()
+                                             for note_id, note_page in self._note_pages.items()})
         self.build_dictionary_of_inter_note_links()
         self.process_notebooks()
         self.save_note_pages()
+        chart_renderer.wait()
+        self._checkpoint.finish()
         self.logger.info(f"Processing of {self._nsx_file_name} complete.")
 
     def get_notebook_ids(self):
@@ -95,9 +175,104 @@ class NSXFile:
         if not config.yanom_globals.is_silent:
             print(msg)
 
+    def restore_notebook_folders(self, notebook_folders):
+        """Use the notebook folders created before the conversion was interrupted"""
+        for notebook_id in list(self._notebooks):
+            if notebook_folders.get(notebook_id) is None:
+                del self._notebooks[notebook_id]
+                continue
+
+            self._notebooks[notebook_id].restore_notebook_folder(Path(notebook_folders[notebook_id]))
+
+    def restore_note_page_filename_and_path(self, note_page_names):
+        """
+        Use the note titles, file names and paths generated before the conversion was interrupted.
+
+        The names are not generated again as the files already written would change the names chosen.
+        """
+        for note_id, note_page in self._note_pages.items():
+            if note_id in note_page_names:
+                note_page.restore_names(note_page_names[note_id])
+
+    def remove_files_of_unfinished_note_pages(self):
+        """
+        Remove attachments written for note pages that were not completed before the conversion was interrupted.
+
+        The note pages are processed again and attachments are renamed if a file of the same name exists, so
+        leaving these files would change the attachment names used.
+        """
+        completed_files = set()
+        # chart files made by worker processes are not known to the note page so are matched by name
+        completed_chart_prefixes = []
+        for note_id, note_page_data in self._checkpoint.completed_note_pages.items():
+            completed_files.update(Path(file) for file in note_page_data['files'])
+            completed_chart_prefixes.append(f'{note_id}-chart-')
+        completed_chart_prefixes = tuple(completed_chart_prefixes)
+
+        for notebook in self._notebooks.values():
+            attachment_folder = Path(notebook.full_path_to_notebook, self._conversion_settings.attachment_folder_name)
+            for file in attachment_folder.glob('*'):
+                if file in completed_files or file.name.startswith(completed_chart_prefixes) or not file.is_file():
+                    continue
+
+                self.logger.debug(f'Removing attachment "{file}" of an unfinished note page')
+                file.unlink()
+
+    def restore_completed_note_page(self, note_page) -> bool:
+        """Restore a note page completed before the conversion was interrupted, returning False if it was not"""
+        if not self._checkpoint:
+            return False
+
+        note_page_data = self._checkpoint.completed_note_page(note_page.note_id)
+        if note_page_data is None:
+            return False
+
+        for md5, name in note_page_data['attachment_md5_names']:
+            note_page.parent_notebook.add_attachment_md5_file_name_dict(md5, name)
+
+        converted_content = None
+        if not self._conversion_settings.stream_nsx_notes:
+            converted_content = Path(note_page.full_path).read_text(encoding='utf-8')
+
+        note_page.apply_conversion_result({
+            'converted_content': converted_content,
+            'image_count': note_page_data['image_count'],
+            'attachment_count': note_page_data['attachment_count'],
+        })
+        self._saved_note_page_ids.add(note_page.note_id)
+        return True
+
+    def checkpoint_note_page(self, note_page):
+        """Save a processed note page and record it as completed so a resumed conversion does not repeat it"""
+        if not self._checkpoint:
+            return
+
+        self._store_file(note_page)
+        self._saved_note_page_ids.add(note_page.note_id)
+        attachments = note_page.attachments.values()
+        note_page_data = {
+            'image_count': note_page.image_count,
+            'attachment_count': note_page.attachment_count,
+            'files': [str(note_page.full_path)] + [str(attachment.full_path) for attachment in attachments],
+            'attachment_md5_names': [(note_page.attachments_json[attachment_id]['md5'],
+                                      note_page.attachments_json[attachment_id]['name'])
+                                     for attachment_id in note_page.attachments
+                                     if attachment_id in (note_page.attachments_json or {})],
+        }
+        # the note page is recorded as completed once its chart images have been written, the next note page is
+        # converted while they are rendered
+        chart_renderer.when_all_done([attachment.stored for attachment in attachments
+                                      if isinstance(attachment, ChartImageNSAttachment)],
+                                     lambda: self._checkpoint.complete_note_page(note_page.note_id, note_page_data))
+
+        if self._conversion_settings.stream_nsx_notes:
+            # the note page has been written so its content is released to keep memory use bounded
+            note_page.release_converted_content()
+
     def build_dictionary_of_inter_note_links(self):
         all_note_pages = list(self._note_pages.values())
-        self.inter_note_link_processor.make_list_of_links(all_note_pages)
+        if not self._conversion_settings.stream_nsx_notes:  # streamed note links are found as notes are added
+            self.inter_note_link_processor.make_list_of_links(all_note_pages)
         self.inter_note_link_processor.match_link_title_to_notes(all_note_pages)
         self.inter_note_link_processor.match_renamed_links_using_link_ref_id()
 
@@ -115,8 +290,9 @@ class NSXFile:
         return zip_file_reader.read_json_data(self._nsx_file_name, Path(data_id))
 
     def fetch_attachment_file(self, file_name, note_title):
+        """Return a readable binary stream of an attachment, file_writer.store_file() closes it once written."""
         self.logger.info(f"Fetching binary attachment data from {self._nsx_file_name}")
-        return zip_file_reader.read_binary_file(self._nsx_file_name, Path(file_name), note_title)
+        return zip_file_reader.open_binary_file(self._nsx_file_name, Path(file_name), note_title)
 
     def add_notebooks(self):
         self.logger.info(f"Creating Notebooks")
@@ -215,6 +391,12 @@ class NSXFile:
 
         note_page = NotePage(self, note_id, note_data)
         self._note_pages[note_id] = note_page
+        if self._conversion_settings.stream_nsx_notes:
+            # links between notes are found now so that only the titles and ids of notes are kept until each note
+            # is converted, the note content is read again when the note is converted
+            self._inter_note_link_processor.add_links_from_note(note_page)
+            note_page.release_content()
+
         if bar:
             bar()
 
@@ -251,8 +433,13 @@ class NSXFile:
     def process_notebooks(self):
         self._note_book_count += len(self._notebooks)
 
+        if self._workers > 1 and len(self._note_pages) > 1:
+            self._process_note_pages_in_worker_processes()
+        else:
+            for notebook in self._notebooks.values():
+                notebook.process_notebook_pages()
+
         for notebooks_id in self._notebooks:
-            self._notebooks[notebooks_id].process_notebook_pages()
             self._image_count += self._notebooks[notebooks_id].num_image_attachments
             self._attachment_count += self._notebooks[notebooks_id].num_file_attachments
 
@@ -261,15 +448,64 @@ class NSXFile:
                     = self._null_attachments.get(self._notebooks[notebooks_id].title, []) \
                       + self._notebooks[notebooks_id].null_attachment_list
 
+    def _process_note_pages_in_worker_processes(self):
+        """
+        Process note pages using worker processes.
+
+        Attachments are extracted first, in note order, so duplicate detection and renaming of attachments are the
+        same as when processing one note at a time.  The pre-processing, pandoc conversion and post-processing of
+        each note page is then done by the workers and the results are applied to the note pages in note order.
+        """
+        note_pages = [note_page for notebook in self._notebooks.values() for note_page in notebook.note_pages]
+        note_pages_to_convert = [note_page for note_page in note_pages
+                                 if not self.restore_completed_note_page(note_page)]
+        self.logger.info(f"Processing {len(note_pages_to_convert)} note pages using {self._workers} worker processes")
+
+        for note_page in note_pages_to_convert:
+            note_page.create_attachments()
+            note_page.process_attachments()
+
+        if not config.yanom_globals.is_silent:
+            print(f"Processing note pages in {self._nsx_file_name.name}")
+            with alive_bar(len(note_pages_to_convert), bar='blocks') as bar:
+                self._convert_note_pages_in_worker_processes(note_pages_to_convert, bar)
+        else:
+            self._convert_note_pages_in_worker_processes(note_pages_to_convert)
+
+        for notebook in self._notebooks.values():
+            for note_page in notebook.note_pages:
+                notebook.record_processed_page(note_page)
+
+    def _convert_note_pages_in_worker_processes(self, note_pages, bar=None):
+        initialise_arguments = (self, config.yanom_globals.logger_level, config.yanom_globals.is_silent)
+        chunk_size = max(1, len(note_pages) // (self._workers * 4))
+        with ProcessPoolExecutor(max_workers=self._workers, initializer=_initialise_note_page_worker,
+                                 initargs=initialise_arguments) as executor:
+            # map returns results in note order so results are applied in the same order on every run
+            conversion_results = executor.map(_convert_note_page_in_worker,
+                                              [note_page.note_id for note_page in note_pages],
+                                              chunksize=chunk_size)
+            for note_page, conversion_result in zip(note_pages, conversion_results):
+                note_page.apply_conversion_result(conversion_result)
+                self.checkpoint_note_page(note_page)
+                self._pandoc_converter.add_worker_cache_statistics(conversion_result['pandoc_cache_hits'],
+                                                                   conversion_result['pandoc_cache_misses'])
+                self._chart_renders_avoided += conversion_result['chart_renders_avoided']
+                if bar:
+                    bar()
+
     def save_note_pages(self):
+        # note pages saved as they were completed, so a conversion can be resumed, are not saved again
+        note_page_ids = [note_page_id for note_page_id in self._note_pages
+                         if note_page_id not in self._saved_note_page_ids]
         if not config.yanom_globals.is_silent:
             print("Saving note pages")
-            with alive_bar(len(self._note_pages), bar='blocks') as bar:
-                for note_page_id in self._note_pages:
+            with alive_bar(len(note_page_ids), bar='blocks') as bar:
+                for note_page_id in note_page_ids:
                     self._store_file(self._note_pages[note_page_id], bar)
             return
 
-        for note_page_id in self._note_pages:
+        for note_page_id in note_page_ids:
             self._store_file(self._note_pages[note_page_id])
 
     @staticmethod
@@ -308,6 +544,10 @@ class NSXFile:
     def attachment_count(self):
         return self._attachment_count
 
+    @property
+    def chart_renders_avoided(self):
+        return self._chart_renders_avoided
+
     @property
     def note_pages(self):
         return self._note_pages
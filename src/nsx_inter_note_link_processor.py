@@ -4,6 +4,9 @@ import re
 import config
 
 
+NOTESTATION_LINK_PATTERN = re.compile(r'<a href="notestation://[^>]*>[^>]*>')
+
+
 def what_module_is_this():
     return __name__
 
@@ -31,6 +34,7 @@ class NSXInterNoteLinkProcessor:
         self._replacement_links = []
         self._renamed_links_not_corrected = {}
         self._unmatched_links_msg = ''
+        self._replacement_html_by_raw_link = {}
 
     class IntraPageLink:
         """
@@ -51,7 +55,7 @@ class NSXInterNoteLinkProcessor:
             self._target_notes = []
 
         def generate_new_links(self):
-            self.logger.debug("Creating inter note links")
+            self._replacement_text = []
             for target_note in self._target_notes:
                 if self._source_note_page.parent_notebook_id == target_note.parent_notebook_id:
                     replacement_text = f'<a href="{target_note.file_name}">{self._text}</a>'
@@ -75,7 +79,7 @@ class NSXInterNoteLinkProcessor:
             return self._replacement_text
 
         def append_to_target_notes(self, target_notes: list):
-            self._target_notes = self._target_notes + target_notes
+            self._target_notes.extend(target_notes)
 
         @property
         def link_id(self):
@@ -90,48 +94,57 @@ class NSXInterNoteLinkProcessor:
             return self._source_note_page
 
     def make_list_of_links(self, all_note_pages):
-        new_replacement_links = []
         for note in all_note_pages:
-            new_raw_note_links = re.findall(r'<a href="notestation://[^>]*>[^>]*>', note.raw_content)
-            self._raw_note_links = self._raw_note_links + new_raw_note_links
+            self.add_links_from_note(note)
 
-            new_replacement_links = new_replacement_links + [self.IntraPageLink(raw_link, note)
-                                                             for raw_link in new_raw_note_links]
+    def add_links_from_note(self, note):
+        new_raw_note_links = NOTESTATION_LINK_PATTERN.findall(note.raw_content)
+        self._raw_note_links.extend(new_raw_note_links)
 
-        self._replacement_links = self._replacement_links + new_replacement_links
+        self._replacement_links.extend(self.IntraPageLink(raw_link, note) for raw_link in new_raw_note_links)
 
     def match_link_title_to_notes(self, all_note_pages):
+        notes_by_title = {}
+        for note in all_note_pages:
+            notes_by_title.setdefault(note.original_title, []).append(note)
+
         for intra_page_link_obj in self._replacement_links:
-            for note in all_note_pages:
-                if intra_page_link_obj.text == note.original_title:
-                    intra_page_link_obj.append_to_target_notes([note])
+            if intra_page_link_obj.text in notes_by_title:
+                intra_page_link_obj.append_to_target_notes(notes_by_title[intra_page_link_obj.text])
 
     def match_renamed_links_using_link_ref_id(self):
-        links_not_yet_matched = [inter_note_link
-                                 for inter_note_link in self._replacement_links
-                                 if not inter_note_link.target_notes
-                                 ]
-
-        matched_links = [inter_note_link
-                         for inter_note_link in self._replacement_links
-                         if inter_note_link.target_notes
-                         ]
+        target_notes_by_link_id = {}
+        for matched_link in self._replacement_links:
+            if matched_link.target_notes:
+                target_notes_by_link_id.setdefault(matched_link.link_id, []).extend(matched_link.target_notes)
 
-        for unmatched_link in links_not_yet_matched:
-            for matched_link in matched_links:
-                if unmatched_link.link_id == matched_link.link_id and unmatched_link is not matched_link:
-                    unmatched_link.append_to_target_notes(matched_link.target_notes)
+        for unmatched_link in self._replacement_links:
+            if not unmatched_link.target_notes and unmatched_link.link_id in target_notes_by_link_id:
+                unmatched_link.append_to_target_notes(target_notes_by_link_id[unmatched_link.link_id])
 
         self._renamed_links_not_corrected = [inter_note_link
                                              for inter_note_link in self._replacement_links
                                              if not inter_note_link.target_notes
                                              ]
 
-        self._replacement_links = list(set(self._replacement_links) - set(self._renamed_links_not_corrected))
+        self._replacement_links = [inter_note_link
+                                   for inter_note_link in self._replacement_links
+                                   if inter_note_link.target_notes
+                                   ]
+
+        self._generate_replacement_html()
 
         if self._renamed_links_not_corrected:
             self._log_link_unmatched_links()
 
+    def _generate_replacement_html(self):
+        """Generate the replacement html for each matched link once, keyed by the raw link it replaces."""
+        self._replacement_html_by_raw_link = {}
+        for replacement_link in self._replacement_links:
+            replacement_link.generate_new_links()
+            self._replacement_html_by_raw_link[replacement_link.raw_link] = \
+                self.generate_html_code_for_new_links(replacement_link.replacement_text)
+
     def _log_link_unmatched_links(self):
         self._generate_unmatched_links_message()
         unmatched_links_msg = 'The following links could not be corrected.\n'
@@ -149,23 +162,13 @@ class NSXInterNoteLinkProcessor:
 
     def update_content(self, content):
         self.logger.debug("Adding inter note links to page")
-        raw_note_links = re.findall(r'<a href="notestation://[^>]*>[^>]*>', content)
-
-        if not raw_note_links:
+        if not self._replacement_html_by_raw_link:
             return content
 
-        replacement_links = {replacement_link.raw_link: replacement_link for replacement_link in
-                             self._replacement_links}
-
-        for raw_link in raw_note_links:
-            if raw_link in replacement_links:
-                replacement_links[raw_link].generate_new_links()
-                content = content.replace(
-                    raw_link,
-                    self.generate_html_code_for_new_links(replacement_links[raw_link].replacement_text)
-                )
+        return NOTESTATION_LINK_PATTERN.sub(self._replace_link, content)
 
-        return content
+    def _replace_link(self, match):
+        return self._replacement_html_by_raw_link.get(match.group(0), match.group(0))
 
     @staticmethod
     def generate_html_code_for_new_links(replacement_links):
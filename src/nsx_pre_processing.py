@@ -1,12 +1,10 @@
 import logging
 import re
 
-from bs4 import BeautifulSoup
-
 from chart_processing import NSXChartProcessor
 from checklist_processing import NSXInputMDOutputChecklistProcessor, NSXInputHTMLOutputChecklistProcessor
 import config
-from helper_functions import add_strong_between_tags, change_html_tags
+from helper_functions import add_strong_between_tags, change_html_tags, make_soup_from_html
 from iframe_processing import pre_process_iframes_from_html
 import image_processing
 from metadata_processing import MetaDataProcessor
@@ -85,7 +83,7 @@ class NoteStationPreProcessing:
 
     def process_image_tags(self):
         self.logger.debug(f"Cleaning image tags")
-        self.soup = BeautifulSoup(self.pre_processed_content, 'html.parser')
+        self.soup = make_soup_from_html(self.pre_processed_content, html_parser='html.parser')
 
         image_tags = self.soup.findAll('img')
 
@@ -1,11 +1,22 @@
+import atexit
+import hashlib
+import json
 import logging
 from pathlib import Path
 from packaging import version
+import shutil
+import socket
 import subprocess
 import sys
+import time
+import urllib.error
+import urllib.request
 
 import config
+import disk_cache
 import helper_functions
+import html_to_markdown_fast_path
+from processing_options import ProcessingOptions
 
 
 def what_module_is_this():
@@ -31,6 +42,14 @@ class PandocConverter:
                                           'multimarkdown': 'markdown_mmd',
                                           'html': 'html'}
         self.pandoc_options = None
+        self._pandoc_server_options = None
+        self._server = None
+        self._server_started = False
+        self._result_cache = None
+        self._result_cache_started = False
+        self._worker_cache_hits = 0
+        self._worker_cache_misses = 0
+        self._fast_path_processing_options = None
         self._pandoc_path = None
         self.set_pandoc_path()
         self.check_and_set_pandoc_options_if_required()
@@ -98,6 +117,19 @@ class PandocConverter:
             return
 
         self.pandoc_options = self.pandoc_options + ['--wrap=none', '--markdown-headings=atx']
+        self._generate_pandoc_server_options(input_format)
+
+    def _generate_pandoc_server_options(self, input_format):
+        self._pandoc_server_options = {'from': input_format,
+                                       'to': self.pandoc_conversion_options[self.output_file_format],
+                                       'standalone': True,
+                                       'wrap': 'none',
+                                       }
+        if self._pandoc_older_than_v_3():
+            self._pandoc_server_options['setext-headers'] = False
+            return
+
+        self._pandoc_server_options['markdown-headings'] = 'atx'
 
     def _calculate_input_format(self):
         if self.conversion_settings.conversion_input == 'nsx' or self.conversion_settings.conversion_input == 'html':
@@ -106,6 +138,53 @@ class PandocConverter:
         return self.pandoc_conversion_options[self.conversion_settings.markdown_conversion_input]
 
     def convert_using_strings(self, input_data, note_title):
+        if self._can_use_html_fast_path():
+            result = html_to_markdown_fast_path.convert_if_simple(input_data, self._get_fast_path_processing_options())
+            if result is not None:
+                self.logger.debug(f'Note "{note_title}" converted without pandoc')
+                return result
+
+        result_cache = self._get_result_cache()
+        if not result_cache:
+            return self._convert(input_data, note_title)
+
+        key = result_cache.make_key(input_data, self.pandoc_options, self._pandoc_version)
+        result = result_cache.get(key)
+        if result is not None:
+            return result
+
+        result = self._convert(input_data, note_title)
+        if result and result != 'Error converting data':
+            result_cache.put(key, result)
+
+        return result
+
+    def _can_use_html_fast_path(self):
+        return self.conversion_settings.html_fast_path \
+            and self.pandoc_options is not None \
+            and self._calculate_input_format() == 'html' \
+            and self.pandoc_conversion_options[self.output_file_format] == 'gfm' \
+            and not self._pandoc_older_than_v_2_11_2()
+
+    def _get_fast_path_processing_options(self):
+        if self._fast_path_processing_options is None:
+            # the fast path writes the gfm pandoc produces, obsidian notes are also converted to gfm by pandoc
+            self._fast_path_processing_options = ProcessingOptions(self.conversion_settings.embed_files, 'gfm',
+                                                                   self.conversion_settings.unrecognised_tag_format,
+                                                                   self.conversion_settings.filename_options)
+        return self._fast_path_processing_options
+
+    def _convert(self, input_data, note_title):
+        server = self._get_server()
+        if server:
+            result = server.convert(self._pandoc_server_options, input_data)
+            if result is not None:
+                return result
+            self.logger.warning(f'Pandoc server unable to convert note "{note_title}", using pandoc subprocess')
+
+        return self._convert_using_subprocess(input_data, note_title)
+
+    def _convert_using_subprocess(self, input_data, note_title):
         try:
             out = subprocess.run(self.pandoc_options, input=input_data, capture_output=True,
                                  encoding='utf-8', text=True, timeout=20)
@@ -122,6 +201,104 @@ class PandocConverter:
 
         return 'Error converting data'
 
+    def _get_server(self):
+        if self._server_started:
+            return self._server
+
+        self._server_started = True
+        if self.conversion_settings.pandoc_workers < 1 or not self._pandoc_server_options:
+            return None
+
+        server_command = self._find_pandoc_server_command()
+        if not server_command:
+            self.logger.warning(f"Pandoc server is not available for pandoc {self._pandoc_version}, "
+                                f"using a pandoc subprocess for each note")
+            return None
+
+        server = PandocServer(server_command)
+        if not server.start():
+            return None
+
+        self._server = server
+        atexit.register(self.close)
+        return self._server
+
+    def _get_result_cache(self):
+        if self._result_cache_started:
+            return self._result_cache
+
+        self._result_cache_started = True
+        if self.conversion_settings.pandoc_cache_size_mb < 1:
+            return None
+
+        cache_directory = Path(self.conversion_settings.working_directory, config.yanom_globals.data_dir,
+                               'pandoc_cache')
+        try:
+            self._result_cache = PandocResultCache(cache_directory,
+                                                   self.conversion_settings.pandoc_cache_size_mb * 1024 * 1024)
+        except OSError as e:
+            self.logger.warning(f"Unable to use pandoc cache directory {cache_directory} - {e}")
+
+        return self._result_cache
+
+    @property
+    def cache_hits(self):
+        if self._result_cache:
+            return self._result_cache.hits + self._worker_cache_hits
+        return self._worker_cache_hits
+
+    @property
+    def cache_misses(self):
+        if self._result_cache:
+            return self._result_cache.misses + self._worker_cache_misses
+        return self._worker_cache_misses
+
+    def add_worker_cache_statistics(self, hits, misses):
+        """Include the cache hits and misses of conversions done by a copy of this converter in a worker process"""
+        self._worker_cache_hits += hits
+        self._worker_cache_misses += misses
+
+    def detach_from_parent_process(self):
+        """
+        Forget the pandoc server and result cache of the process this converter was copied from.
+
+        Used in worker processes so each worker starts its own pandoc servers and cache counters.
+        """
+        self._server = None
+        self._server_started = False
+        self._result_cache = None
+        self._result_cache_started = False
+        self._worker_cache_hits = 0
+        self._worker_cache_misses = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.update(_server=None, _server_started=False, _result_cache=None, _result_cache_started=False)
+        return state
+
+    def _find_pandoc_server_command(self):
+        if version.parse(self._pandoc_version) < version.parse('2.18'):
+            return None
+
+        if not self._pandoc_older_than_v_3():
+            return [self._pandoc_path, 'server']
+
+        # pandoc 2.18 and 2.19 only run as a server when invoked as 'pandoc-server'
+        server_path = shutil.which('pandoc-server')
+        if server_path:
+            return [server_path]
+
+        pandoc_path = shutil.which(self._pandoc_path)
+        if pandoc_path and Path(pandoc_path).with_name('pandoc-server').exists():
+            return [str(Path(pandoc_path).with_name('pandoc-server'))]
+
+        return None
+
+    def close(self):
+        if self._server:
+            self._server.stop()
+            self._server = None
+
     def _pandoc_older_than_v_1_16(self):
         return version.parse(self._pandoc_version) < version.parse('1.16')
 
@@ -130,3 +307,111 @@ class PandocConverter:
 
     def _pandoc_older_than_v_2_11_2(self):
         return version.parse(self._pandoc_version) < version.parse('2.11.2')
+
+    def _pandoc_older_than_v_3(self):
+        return version.parse(self._pandoc_version) < version.parse('3.0')
+
+
+class PandocServer:
+    """
+    A persistent pandoc server process listening on a free local port.
+
+    Starting a pandoc process per note dominates conversion time for large exports, the server is started once and
+    each conversion is sent to it.  Notes are converted one at a time in each process so one server is used per
+    process, with --workers each worker process starts its own server.  A server that crashes or times out is
+    restarted.  ``convert`` returns None when the server was unable to do the conversion so the caller can fall back
+    to running pandoc as a subprocess.
+    """
+    def __init__(self, server_command, timeout=20):
+        self.logger = logging.getLogger(f'{config.yanom_globals.app_name}.'
+                                        f'{what_module_is_this()}.'
+                                        f'{self.__class__.__name__}'
+                                        )
+        self.logger.setLevel(config.yanom_globals.logger_level)
+        self._server_command = server_command
+        self._timeout = timeout
+        self._process = None
+        self._port = None
+
+    def start(self, start_up_timeout=5):
+        self._port = self._find_free_port()
+        self._process = subprocess.Popen(self._server_command + ['--port', str(self._port),
+                                                                 '--timeout', str(self._timeout)],
+                                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        give_up_at = time.monotonic() + start_up_timeout
+        while time.monotonic() < give_up_at:
+            if not self.is_alive():
+                break
+            try:
+                with socket.create_connection(('127.0.0.1', self._port), timeout=0.5):
+                    self.logger.debug(f"Pandoc server started on port {self._port}")
+                    return True
+            except OSError:
+                time.sleep(0.05)
+
+        self.logger.warning(f"Unable to start pandoc server using '{' '.join(self._server_command)}'")
+        self.stop()
+        return False
+
+    @staticmethod
+    def _find_free_port():
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    def is_alive(self):
+        return self._process is not None and self._process.poll() is None
+
+    def convert(self, request_options, input_data):
+        if self._process is None:
+            return None
+
+        try:
+            return self._request(request_options, input_data)
+        except urllib.error.HTTPError as e:
+            # pandoc itself rejected the input, the server is still healthy
+            self.logger.warning(f"Pandoc server returned error {e.code} - {e.read().decode('utf-8', 'replace')}")
+        except (urllib.error.URLError, OSError) as e:
+            self.logger.warning(f"Pandoc server failed, restarting server - {e}")
+            self.stop()
+            self.start()
+
+        return None
+
+    def _request(self, request_options, input_data):
+        payload = dict(request_options, text=input_data)
+        request = urllib.request.Request(f'http://127.0.0.1:{self._port}/',
+                                         data=json.dumps(payload).encode('utf-8'),
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self._timeout) as response:
+            return response.read().decode('utf-8')
+
+    def stop(self):
+        if self._process is None:
+            return
+        if self.is_alive():
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=3)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+                self._process.wait()
+        self._process = None
+
+
+class PandocResultCache(disk_cache.DiskCache):
+    """
+    Size bounded on disk cache of pandoc conversion results.
+
+    Each result is keyed by a hash of the pre-processed input, the pandoc options and the pandoc version, so a note
+    that has not changed since the last run does not need to be converted again.
+    """
+
+    @staticmethod
+    def make_key(input_data, pandoc_options, pandoc_version):
+        digest = hashlib.sha256()
+        for part in (str(pandoc_version), json.dumps(pandoc_options), input_data):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
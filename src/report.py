@@ -62,6 +62,19 @@ class Report:
         if result:
             conversion_results = f"{conversion_results}\n{result}"
 
+        result = get_result_as_string(self._source.unchanged_source_count, 'Unchanged source')
+        if result:
+            conversion_results = f"{conversion_results}\n{result} not converted again"
+
+        pandoc_cache_lookups = self._source.pandoc_cache_hits + self._source.pandoc_cache_misses
+        if pandoc_cache_lookups:
+            conversion_results = f"{conversion_results}\nPandoc cache - {self._source.pandoc_cache_hits} hits " \
+                                 f"and {self._source.pandoc_cache_misses} misses"
+
+        if self._source.chart_renders_avoided:
+            conversion_results = f"{conversion_results}\nChart cache - {self._source.chart_renders_avoided} " \
+                                 f"chart renders avoided"
+
         num_links_corrected = 0
         num_links_not_corrected = 0
         for nsx_file in self._source.nsx_backups:
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 import logging
 from pathlib import Path
 
+import chart_renderer
 import config
 import helper_functions
 import file_writer
@@ -126,7 +127,7 @@ class FileNSAttachment(NSAttachment):
 
     def add_suffix_if_possible(self):
         suffix = helper_functions.file_extension_from_bytes(
-            zip_file_reader.read_binary_file(self._nsx_file.nsx_file_name, Path(self.filename_inside_nsx), self._note_title))
+            zip_file_reader.read_file_header(self._nsx_file.nsx_file_name, Path(self.filename_inside_nsx), self._note_title))
         if suffix:
             self._file_name = self._file_name.with_suffix(suffix)
 
@@ -215,6 +216,25 @@ class ChartNSAttachment(NSAttachment):
 
 
 class ChartImageNSAttachment(ChartNSAttachment):
+    """Chart image attachment, chart_file_like_object is a Future of the png data from chart_renderer."""
+    def __init__(self, note, attachment_id, chart_file_like_object):
+        super().__init__(note, attachment_id, chart_file_like_object)
+        self._stored = None
+
+    def get_content_to_save(self):
+        return self.chart_file_like_object.result()
+
+    def store_file(self):
+        # the image is written once it is rendered so processing of the note can continue while it is rendered
+        full_path = self._full_path
+        self._stored = chart_renderer.when_rendered(self.chart_file_like_object,
+                                                    lambda png: file_writer.store_file(full_path, png))
+
+    @property
+    def stored(self):
+        """Future that is done once the chart image has been written"""
+        return self._stored
+
     def create_html_link(self):
         self.html_link = f'<img src="{helper_functions.path_to_uri(self.path_relative_to_notebook)}">'
 
@@ -93,11 +93,31 @@ class NotePage:
         self.logger.info(f"Processing note page '{self._title}' - {self._note_id}")
         self.create_attachments()
         self.process_attachments()
+        self.convert_note_content()
+        self.logger.debug(f"Processing of note page '{self._title}' - {self._note_id}  completed.")
+
+    def convert_note_content(self):
+        if self._raw_content is None:
+            self.load_content()
         self.pre_process_content()
         self.convert_data()
         if not self.conversion_settings.export_format == 'html':
             self.post_process_content()
-        self.logger.debug(f"Processing of note page '{self._title}' - {self._note_id}  completed.")
+
+    def conversion_result(self):
+        """Return the values produced by convert_note_content() that are needed after note pages are processed."""
+        return {
+            'note_id': self._note_id,
+            'converted_content': self._converted_content,
+            'image_count': self._image_count,
+            'attachment_count': self._attachment_count,
+        }
+
+    def apply_conversion_result(self, conversion_result):
+        """Apply the values returned by conversion_result() for this note page from a worker process."""
+        self._converted_content = conversion_result['converted_content']
+        self._image_count = conversion_result['image_count']
+        self._attachment_count = conversion_result['attachment_count']
 
     def _create_file_name(self, used_filenames):
         dirty_filename = self._title
@@ -182,6 +202,40 @@ class NotePage:
         self._post_processor = NoteStationPostProcessing(self)
         self._converted_content = self._post_processor.post_processed_content
 
+    def release_content(self):
+        """Release the note content, keeping the title, ids and attachment details needed for names and links"""
+        self._raw_content = None
+        self._note_json = {key: value for key, value in self._note_json.items() if key != 'content'}
+
+    def load_content(self):
+        """Read the note content from the nsx file again after it was released"""
+        self._note_json = self._nsx_file.fetch_json_data(self._note_id)
+        self.get_json_note_content()
+
+    def release_converted_content(self):
+        """Release the content and attachments of a note page that has been written to the export folder"""
+        self.release_content()
+        self._pre_processed_content = ''
+        self._converted_content = None
+        self._pre_processor = None
+        self._post_processor = None
+        self._attachments = {}
+
+    def names(self):
+        """Return the title, file name and path of the note page so they can be restored by restore_names()"""
+        return {
+            'title': self._title,
+            'original_title': self._original_title,
+            'file_name': str(self._file_name),
+            'full_path': str(self._full_path),
+        }
+
+    def restore_names(self, names):
+        self._title = names['title']
+        self._original_title = names['original_title']
+        self._file_name = Path(names['file_name'])
+        self._full_path = Path(names['full_path'])
+
     def increment_duplicated_title(self, list_of_existing_titles):
         """
         Add incrementing number to title for duplicates notes in a notebook.
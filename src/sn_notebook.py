@@ -51,13 +51,18 @@ class Notebook:
             self._process_page(note_page)
 
     def _process_page(self, note_page, bar=None):
-        note_page.process_note()
+        if not self.nsx_file.restore_completed_note_page(note_page):
+            note_page.process_note()
+            self.nsx_file.checkpoint_note_page(note_page)
+        self.record_processed_page(note_page)
+        if bar:
+            bar()
+
+    def record_processed_page(self, note_page):
         self._num_image_attachments += note_page.image_count
         self._num_file_attachments += note_page.attachment_count
         if note_page.attachments_json is None:
             self._null_attachment_list.append(note_page.title)
-        if bar:
-            bar()
 
     def fetch_notebook_json(self, notebook_id):
         if notebook_id == 'recycle-bin':
@@ -136,6 +141,12 @@ class Notebook:
             if not config.yanom_globals.is_silent:
                 print(f'{msg}')
 
+    def restore_notebook_folder(self, full_path_to_notebook: Path):
+        """Use a notebook folder created by an earlier, interrupted, conversion"""
+        self.folder_name = Path(full_path_to_notebook.name)
+        self._full_path_to_notebook = full_path_to_notebook
+        Path(full_path_to_notebook, self.conversion_settings.attachment_folder_name).mkdir(parents=True, exist_ok=True)
+
     def create_attachment_folder(self):
         if self.full_path_to_notebook:   # if full path is still None then the folder was not created and we can skip
             self.logger.debug(f"Creating attachment folder")
@@ -10,7 +10,6 @@ import sys
 import config
 from config_data import ConfigData
 from helper_functions import find_working_directory
-import interactive_cli
 from notes_converter import NotesConvertor
 
 
@@ -42,6 +41,17 @@ def command_line_parser(args, logger):
                              'If not provided a folder "data" will be used in the working directory.'
                              'When --export is provided it WILL override config.ini setting when '
                              'used with the -i option')
+    parser.add_argument("-w", "--workers", type=int, default=0,
+                        help="Number of worker processes used to convert html and markdown files in parallel. "
+                             "Default = 0, convert files one at a time. "
+                             "Example --workers 8")
+    parser.add_argument("--full", action="store_true",
+                        help="Convert every note even if it is unchanged since the last conversion to the "
+                             "export folder.  By default only new and changed notes are converted and the "
+                             "converted files of deleted notes are removed.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an nsx conversion that was interrupted, using the checkpoint it saved in the "
+                             "export folder.  Notes that were already converted are not converted again.")
     parser.add_argument("-l", "--log", default='INFO',
                         help="Set the level of program logging. Default = INFO. "
                              "Choices are INFO, DEBUG, WARNING, ERROR, CRITICAL"
@@ -142,6 +152,7 @@ def main(command_line_sys_argv=sys.argv):
 
 def run_yanom(command_line_args):
     if not command_line_args['silent']:
+        import interactive_cli  # imported here so silent conversions do not load the interactive libraries
         interactive_cli.show_app_title()
 
     config_data = ConfigData(f"config.ini", 'gfm', allow_no_value=True)
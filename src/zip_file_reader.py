@@ -1,6 +1,8 @@
 import json
 import logging
+import os
 import sys
+import threading
 import zipfile
 from pathlib import Path
 from typing import List, Optional, Set
@@ -11,6 +13,105 @@ import helper_functions
 logger = logging.getLogger(f'{config.yanom_globals.app_name}.{__name__}')
 logger.setLevel(config.yanom_globals.logger_level)
 
+_zip_file_readers = {}
+_zip_file_readers_lock = threading.Lock()
+
+
+class ZipFileReader:
+    """
+    Read files from a zip archive using a single open ZipFile.
+
+    Opening a ZipFile parses the central directory of the archive, for a large nsx file doing that for every note,
+    notebook and attachment is slow.  The ZipFile is opened on first use and kept open until close() is called.
+    Reads are serialised with a lock so a reader can be shared between threads.  The archive is re-opened if it
+    has changed on disk or if the reader is used in a different process to the one that opened it, as a forked
+    process must not share the file position of its parent.
+
+    Parameters
+    ----------
+    zip_filename : Path
+        Path object to the zipfile
+
+    """
+    def __init__(self, zip_filename):
+        self._zip_filename = zip_filename
+        self._zip_file = None
+        self._opened_by_pid = None
+        self._file_signature = None
+        self._lock = threading.Lock()
+
+    def _get_zip_file(self):
+        stat = os.stat(str(self._zip_filename))
+        file_signature = (stat.st_mtime_ns, stat.st_size)
+
+        if self._zip_file is not None and self._opened_by_pid == os.getpid():
+            if self._file_signature == file_signature:
+                return self._zip_file
+            self._zip_file.close()
+
+        self._zip_file = zipfile.ZipFile(str(self._zip_filename), 'r')
+        self._opened_by_pid = os.getpid()
+        self._file_signature = file_signature
+        return self._zip_file
+
+    def read(self, target_filename):
+        """Return the bytes of a file in the zip archive.  Errors are raised to the caller."""
+        with self._lock:
+            # str(WindowsPath) gives a folder\\filename but zip files must have a posix formatted string
+            # do use Path.as_posix to get correct format for accessing zip file
+            return self._get_zip_file().read(target_filename.as_posix())
+
+    def read_header(self, target_filename, size):
+        """
+        Return up to the first size bytes of a file in the zip archive.  Errors are raised to the caller.
+
+        Only the start of the file is decompressed, the remainder of the file is not read.
+        """
+        with self._lock:
+            with self._get_zip_file().open(target_filename.as_posix()) as zip_ext_file:
+                return zip_ext_file.read(size)
+
+    def open(self, target_filename):
+        """
+        Return a readable binary stream for a file in the zip archive.  Errors are raised to the caller.
+
+        The stream reads the archive in chunks as it is read, so large files do not have to be held in memory.  The
+        caller is responsible for closing the stream.
+        """
+        with self._lock:
+            return self._get_zip_file().open(target_filename.as_posix())
+
+    def close(self):
+        with self._lock:
+            if self._zip_file is not None and self._opened_by_pid == os.getpid():
+                self._zip_file.close()
+            self._zip_file = None
+
+
+def get_zip_file_reader(zip_filename) -> ZipFileReader:
+    """Return the shared ZipFileReader for a zip file, creating it if required."""
+    key = os.path.abspath(str(zip_filename))
+    with _zip_file_readers_lock:
+        if key not in _zip_file_readers:
+            _zip_file_readers[key] = ZipFileReader(zip_filename)
+        return _zip_file_readers[key]
+
+
+def close_zip_file(zip_filename):
+    """Close the shared ZipFileReader for a zip file if one is open."""
+    with _zip_file_readers_lock:
+        reader = _zip_file_readers.pop(os.path.abspath(str(zip_filename)), None)
+    if reader:
+        reader.close()
+
+
+def close_all_zip_files():
+    with _zip_file_readers_lock:
+        readers = list(_zip_file_readers.values())
+        _zip_file_readers.clear()
+    for reader in readers:
+        reader.close()
+
 
 def list_files_in_zip_file_from_a_directory(zip_file_path: str,
                                             path_inside_of_zipfile: str = '',
@@ -74,6 +175,9 @@ def read_text(zip_filename, target_filename, message=''):
     """
     Read a text file from a zip archive and return string of that content
 
+    The zip archive is read using the shared ZipFileReader for the archive, call close_zip_file() when all files
+    required have been read.
+
     Parameters
     ----------
     zip_filename : Path
@@ -90,10 +194,7 @@ def read_text(zip_filename, target_filename, message=''):
 
     """
     try:
-        with zipfile.ZipFile(str(zip_filename), 'r') as zip_file:
-            # str(WindowsPath) gives a folder\\filename but zip files must have a posix formatted string
-            # do use Path.as_posix to get correct format for accessing zip file
-            return zip_file.read(target_filename.as_posix()).decode('utf-8')
+        return get_zip_file_reader(zip_filename).read(target_filename).decode('utf-8')
     except Exception as e:
         _error_handling(e, target_filename, zip_filename, message)
 
@@ -129,6 +230,9 @@ def read_binary_file(zip_filename, target_filename, message=''):
     """
     Read and return binary content from a file stored in a zip archive.
 
+    The zip archive is read using the shared ZipFileReader for the archive, call close_zip_file() when all files
+    required have been read.
+
     Parameters
     ----------
     zip_filename : Path
@@ -144,10 +248,65 @@ def read_binary_file(zip_filename, target_filename, message=''):
 
     """
     try:
-        with zipfile.ZipFile(str(zip_filename), 'r') as zip_file:
-            # str(WindowsPath) gives a folder\\filename but zip files must have a posix formatted string
-            # do use Path.as_posix to get correct format for accessing zip file
-            return zip_file.read(target_filename.as_posix())
+        return get_zip_file_reader(zip_filename).read(target_filename)
+
+    except Exception as e:
+        _error_handling(e, target_filename, zip_filename, message)
+
+
+def read_file_header(zip_filename, target_filename, message='', size=helper_functions.FILE_TYPE_HEADER_SIZE):
+    """
+    Read and return the first bytes of a file stored in a zip archive.
+
+    Used to identify the type of a file from its header without reading the whole file.
+
+    Parameters
+    ----------
+    zip_filename : Path
+        Path object to the zipfile
+    target_filename : Path
+        name of the file in the zip archive to be read from
+    message : str
+        Optional string to include in error messages, default is empty string
+    size : int
+        maximum number of bytes to read, defaults to the number of bytes needed to identify a file type
+
+    Returns
+    -------
+    bytes
+
+    """
+    try:
+        return get_zip_file_reader(zip_filename).read_header(target_filename, size)
+
+    except Exception as e:
+        _error_handling(e, target_filename, zip_filename, message)
+
+
+def open_binary_file(zip_filename, target_filename, message=''):
+    """
+    Open a file stored in a zip archive and return a readable binary stream of its content.
+
+    The content is decompressed as the stream is read so large files can be copied without being loaded into
+    memory.  The caller is responsible for closing the stream.
+
+    Parameters
+    ----------
+    zip_filename : Path
+        Path object to the zipfile
+    target_filename : Path
+        name of the file in the zip archive to be read from
+    message : str
+        Optional string to include in error messages, default is empty string
+
+    Returns
+    -------
+    zipfile.ZipExtFile
+        readable binary stream OR None if an error is encountered
+
+    """
+    try:
+        return get_zip_file_reader(zip_filename).open(target_filename)
 
     except Exception as e:
         _error_handling(e, target_filename, zip_filename, message)
@@ -0,0 +1,105 @@
+import logging
+import os
+from pathlib import Path
+
+import pytest
+
+import attachment_copier
+from attachment_copier import AttachmentCopier
+
+
+@pytest.fixture
+def source_folder(tmp_path):
+    Path(tmp_path, 'source', 'notebook', 'attachments').mkdir(parents=True)
+    Path(tmp_path, 'source', 'notebook', 'attachments', 'one.png').write_bytes(b'one')
+    Path(tmp_path, 'source', 'notebook', 'two.pdf').write_bytes(b'two')
+    return Path(tmp_path, 'source')
+
+
+@pytest.mark.parametrize(
+    'copy_mode', ['copy', 'hardlink', 'reflink']
+)
+def test_attachments_placed_in_export_folder(source_folder, tmp_path, copy_mode):
+    export_folder = Path(tmp_path, 'export')
+
+    with AttachmentCopier(source_folder, export_folder, copy_mode) as copier:
+        copier.schedule(Path(source_folder, 'notebook', 'attachments', 'one.png'))
+        copier.schedule(Path(source_folder, 'notebook', 'two.pdf'))
+
+    assert Path(export_folder, 'notebook', 'attachments', 'one.png').read_bytes() == b'one'
+    assert Path(export_folder, 'notebook', 'two.pdf').read_bytes() == b'two'
+
+
+def test_attachment_linked_from_many_notes_copied_once(source_folder, tmp_path, mocker):
+    copy_file = mocker.patch.dict(attachment_copier.COPY_FUNCTIONS, {'copy': mocker.MagicMock()})['copy']
+    attachment = Path(source_folder, 'notebook', 'attachments', 'one.png')
+
+    with AttachmentCopier(source_folder, Path(tmp_path, 'export'), 'copy') as copier:
+        for _ in range(500):
+            copier.schedule(attachment)
+
+    assert copier.copy_count == 1
+    copy_file.assert_called_once_with(attachment, Path(tmp_path, 'export', 'notebook', 'attachments', 'one.png'))
+
+
+def test_hardlink_shares_the_source_file(source_folder, tmp_path):
+    attachment = Path(source_folder, 'notebook', 'two.pdf')
+    target = Path(tmp_path, 'two.pdf')
+    target.write_bytes(b'an older export')
+
+    attachment_copier.hardlink_file(attachment, target)
+
+    assert os.path.samefile(attachment, target)
+
+
+def test_hardlink_falls_back_to_copy(source_folder, tmp_path, mocker):
+    mocker.patch('attachment_copier.os.link', side_effect=OSError('Invalid cross-device link'))
+    attachment = Path(source_folder, 'notebook', 'two.pdf')
+    target = Path(tmp_path, 'two.pdf')
+
+    attachment_copier.hardlink_file(attachment, target)
+
+    assert target.read_bytes() == b'two'
+    assert not os.path.samefile(attachment, target)
+
+
+def test_reflink_falls_back_to_copy(source_folder, tmp_path, mocker):
+    pytest.importorskip('fcntl')
+    mocker.patch('attachment_copier.sys.platform', 'linux')
+    mocker.patch('fcntl.ioctl', side_effect=OSError('Operation not supported'))
+    attachment = Path(source_folder, 'notebook', 'two.pdf')
+    target = Path(tmp_path, 'two.pdf')
+
+    attachment_copier.reflink_file(attachment, target)
+
+    assert target.read_bytes() == b'two'
+
+
+@pytest.mark.parametrize(
+    'clone_supported', [True, False]
+)
+def test_reflink_after_hardlink_keeps_source(source_folder, tmp_path, mocker, clone_supported):
+    if not clone_supported:
+        mocker.patch('attachment_copier._clone_file', return_value=False)
+    attachment = Path(source_folder, 'notebook', 'two.pdf')
+    target = Path(tmp_path, 'two.pdf')
+    attachment_copier.hardlink_file(attachment, target)
+
+    attachment_copier.reflink_file(attachment, target)
+
+    assert attachment.read_bytes() == b'two'
+    assert target.read_bytes() == b'two'
+    assert not os.path.samefile(attachment, target)
+    assert list(tmp_path.glob('*.tmp')) == []
+
+
+def test_missing_attachment_logs_warning(source_folder, tmp_path, caplog):
+    attachment = Path(source_folder, 'notebook', 'missing.png')
+
+    with caplog.at_level(logging.WARNING):
+        with AttachmentCopier(source_folder, Path(tmp_path, 'export')) as copier:
+            copier.schedule(attachment)
+
+    assert copier.copy_count == 0
+    assert f'Unable to copy attachment "{attachment}" - It does not exist or is a directory.' in caplog.messages
+    assert not Path(tmp_path, 'export').exists()
@@ -0,0 +1,54 @@
+from importlib import metadata
+from pathlib import Path
+
+import pandas
+
+import chart_cache
+from chart_cache import ChartCache
+
+
+def test_parts_of_chart_returned_from_memory():
+    cache = ChartCache()
+    key = ChartCache.make_key({'chartType': 'pie'}, '[["", "a"], ["b", 1]]', True, True, True)
+
+    cache.update(key, csv='a,b')
+    cache.update(key, png=b'png data')
+
+    assert cache.get(key) == {'csv': 'a,b', 'png': b'png data'}
+    assert cache.get(ChartCache.make_key({'chartType': 'bar'}, '[["", "a"], ["b", 1]]', True, True, True)) == {}
+
+
+def test_parts_of_chart_returned_from_disk_by_later_cache(tmp_path):
+    key = ChartCache.make_key({'chartType': 'pie'}, '[["", "a"], ["b", 1]]', True, True, True)
+    ChartCache(Path(tmp_path, 'chart_cache'), 1024 * 1024).update(key, png=b'png data', table='<table></table>')
+
+    cache = ChartCache(Path(tmp_path, 'chart_cache'), 1024 * 1024)
+
+    assert cache.get(key) == {'png': b'png data', 'table': '<table></table>'}
+
+
+def test_unreadable_disk_entry_is_ignored(tmp_path, caplog):
+    cache = ChartCache(Path(tmp_path, 'chart_cache'), 1024 * 1024)
+    key = ChartCache.make_key('chart')
+    cache._disk_cache.put(key, 'not json')
+
+    assert cache.get(key) == {}
+    assert 'Ignoring unreadable chart cache entry' in caplog.records[-1].message
+
+
+def test_current_starts_in_memory_cache_when_none_started():
+    chart_cache.end()
+
+    cache = chart_cache.current()
+
+    assert cache is chart_cache.current()
+    assert cache.renders_avoided == 0
+
+
+def test_library_version_read_from_module_when_package_metadata_missing(monkeypatch):
+    def missing_metadata(library_name):
+        raise metadata.PackageNotFoundError(library_name)
+
+    monkeypatch.setattr(metadata, 'version', missing_metadata)
+
+    assert chart_cache._library_version('pandas') == pandas.__version__
@@ -1,9 +1,11 @@
-import os
-import re
+
+from unittest.mock import patch
 
 import pytest
 
+import chart_cache
 import chart_processing
+import chart_renderer
 import conversion_settings
 
 
@@ -19,18 +21,19 @@ class Note:
         self.image_count = 0
         self.title = 'title'
         self.parent_notebook = 'parent'
+        self.note_id = 'note_id'
 
 
 @pytest.mark.parametrize(
     'input_html, expected', [
         ("""<div chart-config='{"range":"A1:E4","direction":"row","rowHeaderExisted":true,"columnHeaderExisted":true,"title":"bar chart title","chartType":"bar","xAxisTitle":"x-axis title","yAxisTitle":"y-axis title"}' chart-data='[["","Number 1","Number 2","Number 3","Number 4"],["Category A",500,520,540,520],["Category B",520,540,560,540],["Category C",540,560,580,560]]' class="syno-ns-chart-object" style="width: 520px; height: 350px;"></div>""",
-         """<p><img src="attachments/replaced_id_number.png"></p><p><a href="attachments/replaced_id_number.csv">Chart data file</a></p><p><table border="1" class="dataframe"><thead><tr style="text-align: right;"><th><strong></strong></th><th><strong>Number 1</strong></th><th><strong>Number 2</strong></th><th><strong>Number 3</strong></th><th><strong>Number 4</strong></th></tr></thead><tbody><tr><th><strong>Category A</strong></th><td>500</td><td>520</td><td>540</td><td>520</td></tr><tr><th><strong>Category B</strong></th><td>520</td><td>540</td><td>560</td><td>540</td></tr><tr><th><strong>Category C</strong></th><td>540</td><td>560</td><td>580</td><td>560</td></tr></tbody></table></p>""",
+         """<p><img src="attachments/note_id-chart-1.png"></p><p><a href="attachments/note_id-chart-1.csv">Chart data file</a></p><p><table border="1" class="dataframe"><thead><tr style="text-align: right;"><th><strong></strong></th><th><strong>Number 1</strong></th><th><strong>Number 2</strong></th><th><strong>Number 3</strong></th><th><strong>Number 4</strong></th></tr></thead><tbody><tr><th><strong>Category A</strong></th><td>500</td><td>520</td><td>540</td><td>520</td></tr><tr><th><strong>Category B</strong></th><td>520</td><td>540</td><td>560</td><td>540</td></tr><tr><th><strong>Category C</strong></th><td>540</td><td>560</td><td>580</td><td>560</td></tr></tbody></table></p>""",
          ),
         ("""<div chart-config='{"range":"A1:E4","direction":"row","rowHeaderExisted":true,"columnHeaderExisted":true,"title":"Line Chart Title","chartType":"line","xAxisTitle":"x-axis title","yAxisTitle":"y-axis title"}' chart-data='[["","Number 1","Number 2","Number 3","Number 4"],["Category A",500,520,540,520],["Category B",520,540,560,540],["Category C",540,560,580,560]]' class="syno-ns-chart-object" style="width: 520px; height: 350px;"></div>""",
-         """<p><img src="attachments/replaced_id_number.png"></p><p><a href="attachments/replaced_id_number.csv">Chart data file</a></p><p><table border="1" class="dataframe"><thead><tr style="text-align: right;"><th><strong></strong></th><th><strong>Number 1</strong></th><th><strong>Number 2</strong></th><th><strong>Number 3</strong></th><th><strong>Number 4</strong></th></tr></thead><tbody><tr><th><strong>Category A</strong></th><td>500</td><td>520</td><td>540</td><td>520</td></tr><tr><th><strong>Category B</strong></th><td>520</td><td>540</td><td>560</td><td>540</td></tr><tr><th><strong>Category C</strong></th><td>540</td><td>560</td><td>580</td><td>560</td></tr></tbody></table></p>""",
+         """<p><img src="attachments/note_id-chart-1.png"></p><p><a href="attachments/note_id-chart-1.csv">Chart data file</a></p><p><table border="1" class="dataframe"><thead><tr style="text-align: right;"><th><strong></strong></th><th><strong>Number 1</strong></th><th><strong>Number 2</strong></th><th><strong>Number 3</strong></th><th><strong>Number 4</strong></th></tr></thead><tbody><tr><th><strong>Category A</strong></th><td>500</td><td>520</td><td>540</td><td>520</td></tr><tr><th><strong>Category B</strong></th><td>520</td><td>540</td><td>560</td><td>540</td></tr><tr><th><strong>Category C</strong></th><td>540</td><td>560</td><td>580</td><td>560</td></tr></tbody></table></p>""",
          ),
         ("""<div chart-config='{"range":"A1:E4","direction":"row","rowHeaderExisted":true,"columnHeaderExisted":true,"title":"Pie chart title","chartType":"pie","xAxisTitle":"x-axis title","yAxisTitle":"y axis ttile"}' chart-data='[["","cost","price","value","total value"],["something",500,520,540,520],["something else",520,540,560,540],["another thing",540,560,580,560]]' class="syno-ns-chart-object" style="width: 520px; height: 350px;"></div>""",
-         """<p><img src="attachments/replaced_id_number.png"></p><p><a href="attachments/replaced_id_number.csv">Chart data file</a></p><p><table border="1" class="dataframe"><thead><tr style="text-align: right;"><th><strong></strong></th><th><strong>cost</strong></th><th><strong>price</strong></th><th><strong>value</strong></th><th><strong>total value</strong></th><th><strong>sum</strong></th><th><strong>percent</strong></th></tr></thead><tbody><tr><th><strong>something</strong></th><td>500</td><td>520</td><td>540</td><td>520</td><td>2080</td><td>32.10</td></tr><tr><th><strong>something else</strong></th><td>520</td><td>540</td><td>560</td><td>540</td><td>2160</td><td>33.33</td></tr><tr><th><strong>another thing</strong></th><td>540</td><td>560</td><td>580</td><td>560</td><td>2240</td><td>34.57</td></tr></tbody></table></p>""",
+         """<p><img src="attachments/note_id-chart-1.png"></p><p><a href="attachments/note_id-chart-1.csv">Chart data file</a></p><p><table border="1" class="dataframe"><thead><tr style="text-align: right;"><th><strong></strong></th><th><strong>cost</strong></th><th><strong>price</strong></th><th><strong>value</strong></th><th><strong>total value</strong></th><th><strong>sum</strong></th><th><strong>percent</strong></th></tr></thead><tbody><tr><th><strong>something</strong></th><td>500</td><td>520</td><td>540</td><td>520</td><td>2080</td><td>32.10</td></tr><tr><th><strong>something else</strong></th><td>520</td><td>540</td><td>560</td><td>540</td><td>2160</td><td>33.33</td></tr><tr><th><strong>another thing</strong></th><td>540</td><td>560</td><td>580</td><td>560</td><td>2240</td><td>34.57</td></tr></tbody></table></p>""",
          ),
     ], ids=['bar-chart', 'line-chart', 'pie-chart']
 )
@@ -38,13 +41,7 @@ def test_nsx_chart_processor_check_produced_html(input_html, expected):
     note = Note()
     chart_processor = chart_processing.NSXChartProcessor(note, input_html)
 
-    if os.name == 'nt':
-        regex = r"\d{13}"
-    else:
-        regex = r"\d{15}"
-    test_string = chart_processor.processed_html
-    substitute_text = 'replaced_id_number'
-    result = re.sub(regex, substitute_text, test_string, 0, re.MULTILINE)
+    result = chart_processor.processed_html
 
     assert result == expected
 
@@ -71,7 +68,7 @@ def test_plot_chart_image_regression_test(input_html, image_regression):
     chart_processor = chart_processing.NSXChartProcessor(note, input_html)
 
     for chart in chart_processor.charts:
-        image_regression.check(chart._png_img_buffer.getvalue())
+        image_regression.check(chart.png_img_buffer.getvalue())
 
 
 @pytest.mark.parametrize(
@@ -94,3 +91,35 @@ def test_plot_chart_check_csv_content(input_html, csv):
     for chart in chart_processor.charts:
         # Note - replace \r is for use in windows
         assert chart.csv_chart_data_string.replace('\r', '') == csv
+
+
+def test_identical_charts_rendered_once_and_reuse_generated_parts():
+    cache = chart_cache.start()
+    chart_html = """<div chart-config='{"range":"A1:E4","direction":"row","rowHeaderExisted":true,"columnHeaderExisted":true,"title":"Pie chart title","chartType":"pie","xAxisTitle":"x-axis title","yAxisTitle":"y axis ttile"}' chart-data='[["","cost","price","value","total value"],["something",500,520,540,520],["something else",520,540,560,540],["another thing",540,560,580,560]]' class="syno-ns-chart-object" style="width: 520px; height: 350px;"></div>"""
+    note = Note()
+
+    with patch('chart_renderer.render_png', side_effect=chart_renderer.render_png) as render_png:
+        chart_processor = chart_processing.NSXChartProcessor(note, chart_html + chart_html)
+    chart_cache.end()
+
+    first_chart, second_chart = chart_processor.charts
+    assert render_png.call_count == 1
+    assert cache.renders_avoided == 1
+    assert first_chart.png_img_buffer.getvalue() == second_chart.png_img_buffer.getvalue()
+    assert first_chart.csv_chart_data_string == second_chart.csv_chart_data_string
+    assert first_chart.html_chart_data_table == second_chart.html_chart_data_table
+    assert 'percent' in second_chart.csv_chart_data_string
+
+
+def test_generated_parts_of_chart_written_to_disk_cache_once(tmp_path):
+    cache = chart_cache.start(tmp_path, 1024 * 1024)
+    chart_html = """<div chart-config='{"range":"A1:E4","direction":"row","rowHeaderExisted":true,"columnHeaderExisted":true,"title":"Pie chart title","chartType":"pie","xAxisTitle":"x-axis title","yAxisTitle":"y axis ttile"}' chart-data='[["","cost","price","value","total value"],["something",500,520,540,520],["something else",520,540,560,540],["another thing",540,560,580,560]]' class="syno-ns-chart-object" style="width: 520px; height: 350px;"></div>"""
+    note = Note()
+
+    with patch.object(cache._disk_cache, 'put', side_effect=cache._disk_cache.put) as put:
+        chart_processing.NSXChartProcessor(note, chart_html)
+        chart_renderer.wait()
+    chart_cache.end()
+
+    put.assert_called_once()
+    assert set(chart_cache.ChartCache(tmp_path, 1024 * 1024).get(put.call_args.args[0])) == {'png', 'csv', 'table'}
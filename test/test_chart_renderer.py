@@ -0,0 +1,78 @@
+import matplotlib
+from matplotlib import pyplot
+import pytest
+
+import chart_renderer
+
+
+def draw_line(fig, ax, title):
+    ax.plot([1, 2, 3], [3, 1, 2])
+    ax.set_title(title)
+
+
+@pytest.fixture
+def renderer():
+    yield chart_renderer.start()
+    chart_renderer.stop()
+
+
+def test_agg_backend_is_used():
+    chart_renderer.render_png(draw_line, 'a title')
+
+    assert matplotlib.get_backend().lower() == 'agg'
+
+
+def test_render_returns_png_and_closes_figure(renderer):
+    rendered = chart_renderer.render(draw_line, 'a title')
+
+    assert rendered.done()
+    assert rendered.result().startswith(b'\x89PNG')
+    assert not pyplot.get_fignums()
+
+
+def test_render_on_worker_processes_matches_render_in_process():
+    chart_renderer.start()
+    in_process = chart_renderer.render(draw_line, 'a title').result()
+    chart_renderer.start(2)
+    stored = []
+
+    rendered = chart_renderer.render(draw_line, 'a title')
+    chart_renderer.when_rendered(rendered, stored.append)
+    chart_renderer.stop()
+
+    assert stored == [in_process]
+
+
+def test_when_rendered_raises_store_error_on_wait(renderer):
+    def store(png):
+        raise ValueError('unable to store')
+
+    stored = chart_renderer.when_rendered(chart_renderer.render(draw_line, 'a title'), store)
+
+    with pytest.raises(ValueError):
+        chart_renderer.wait([stored])
+
+
+def test_when_all_done_calls_action_once_renders_are_stored():
+    chart_renderer.start(2)
+    stored = []
+    renders = [chart_renderer.when_rendered(chart_renderer.render(draw_line, title), stored.append)
+               for title in ('one', 'two')]
+
+    finished = chart_renderer.when_all_done(renders, lambda: len(stored))
+    chart_renderer.stop()
+
+    assert finished.result() == 2
+
+
+def test_when_all_done_does_not_call_action_when_store_fails(renderer):
+    def store(png):
+        raise ValueError('unable to store')
+
+    actions = []
+    stored = chart_renderer.when_rendered(chart_renderer.render(draw_line, 'a title'), store)
+    finished = chart_renderer.when_all_done([stored], lambda: actions.append('called'))
+
+    with pytest.raises(ValueError):
+        chart_renderer.wait([finished])
+    assert actions == []
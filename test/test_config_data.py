@@ -117,6 +117,36 @@ keep_nimbus_row_and_column_headers = False
     # html = inline html in markdown and html in html files
     # text = extract any text and display as plain text in markdown and html
 unrecognised_tag_format = html
+
+[performance_options]
+    # pandoc_workers 1 or more converts notes using a long running pandoc server, one server is started by
+    # each conversion process, use --workers to convert notes in parallel.  0 will start a new pandoc process
+    # for every note.  requires pandoc 2.18 or later, for pandoc 2.18 and 2.19 a copy or link of pandoc named
+    # pandoc-server is also required.
+pandoc_workers = 0
+    # pandoc_cache_size_mb is the maximum size in MB of the cache of pandoc conversion results
+    # unchanged notes are not re-converted by pandoc on later runs.  0 disables the cache.
+pandoc_cache_size_mb = 0
+    # html_parser is the parser used to read html, valid entries are auto, lxml or html.parser
+    # auto uses the faster lxml parser if it is installed, else the python html.parser is used
+html_parser = auto
+    # copy_mode is how attachments are placed in the export folder, valid entries are copy, hardlink or reflink
+    # hardlink and reflink avoid duplicating attachments when the export folder is on the same file system
+    # as the source.  a hardlinked attachment is the same file as the source, changes to one change both.
+    # if a link can not be made the attachment is copied
+copy_mode = copy
+    # stream_nsx_notes True converts nsx notes one at a time keeping memory use low for large nsx files
+    # False keeps the content of every note in memory until all the notes in a nsx file are converted
+stream_nsx_notes = False
+    # chart_workers is the number of processes used to render nsx chart images alongside note conversion
+    # 0 renders each chart image when it is found in a note.
+chart_workers = 0
+    # chart_cache_size_mb is the maximum size in MB of the on disk cache of rendered nsx charts, charts
+    # are always cached during a conversion.  0 disables the on disk cache used by later runs.
+chart_cache_size_mb = 0
+    # html_fast_path True converts simple html and nsx notes to gfm or obsidian markdown without pandoc
+    # False converts every note with pandoc, the fast path is experimental
+html_fast_path = False
 """
 
 
@@ -228,6 +258,36 @@ keep_nimbus_row_and_column_headers = False
     # html = inline html in markdown and html in html files
     # text = extract any text and display as plain text in markdown and html
 unrecognised_tag_format = html
+
+[performance_options]
+    # pandoc_workers 1 or more converts notes using a long running pandoc server, one server is started by
+    # each conversion process, use --workers to convert notes in parallel.  0 will start a new pandoc process
+    # for every note.  requires pandoc 2.18 or later, for pandoc 2.18 and 2.19 a copy or link of pandoc named
+    # pandoc-server is also required.
+pandoc_workers = 0
+    # pandoc_cache_size_mb is the maximum size in MB of the cache of pandoc conversion results
+    # unchanged notes are not re-converted by pandoc on later runs.  0 disables the cache.
+pandoc_cache_size_mb = 0
+    # html_parser is the parser used to read html, valid entries are auto, lxml or html.parser
+    # auto uses the faster lxml parser if it is installed, else the python html.parser is used
+html_parser = auto
+    # copy_mode is how attachments are placed in the export folder, valid entries are copy, hardlink or reflink
+    # hardlink and reflink avoid duplicating attachments when the export folder is on the same file system
+    # as the source.  a hardlinked attachment is the same file as the source, changes to one change both.
+    # if a link can not be made the attachment is copied
+copy_mode = copy
+    # stream_nsx_notes True converts nsx notes one at a time keeping memory use low for large nsx files
+    # False keeps the content of every note in memory until all the notes in a nsx file are converted
+stream_nsx_notes = False
+    # chart_workers is the number of processes used to render nsx chart images alongside note conversion
+    # 0 renders each chart image when it is found in a note.
+chart_workers = 0
+    # chart_cache_size_mb is the maximum size in MB of the on disk cache of rendered nsx charts, charts
+    # are always cached during a conversion.  0 disables the on disk cache used by later runs.
+chart_cache_size_mb = 0
+    # html_fast_path True converts simple html and nsx notes to gfm or obsidian markdown without pandoc
+    # False converts every note with pandoc, the fast path is experimental
+html_fast_path = False
 """
 
 
@@ -379,6 +439,14 @@ def test_validate_config_file_missing_keys_and_sections(tmp_path, good_config_in
         ('nimbus_options', 'embed_these_video_types', 'pdf,docx', 'something_different',
          ['something_different']),
         ('nimbus_options', 'unrecognised_tag_format', 'html', 'text', 'text'),
+        ('performance_options', 'pandoc_workers', 0, '4', 4),
+        ('performance_options', 'html_fast_path', False, 'True', True),
+        ('performance_options', 'chart_cache_size_mb', 0, '16', 16),
+        ('performance_options', 'chart_workers', 0, '2', 2),
+        ('performance_options', 'stream_nsx_notes', False, 'True', True),
+        ('performance_options', 'copy_mode', 'copy', 'hardlink', 'hardlink'),
+        ('performance_options', 'html_parser', 'auto', 'html.parser', 'html.parser'),
+        ('performance_options', 'pandoc_cache_size_mb', 0, '64', 64),
     ]
 )
 def test_generate_conversion_settings_from_parsed_config_file_data(good_config_ini, tmp_path, key1, key2, start_value,
@@ -572,7 +640,7 @@ def test_str(good_config_ini, tmp_path):
     cd.parse_config_file()
 
     result = str(cd)
-    assert result == "ConfigData{'conversion_inputs': {'conversion_input': 'nsx'}, 'markdown_conversion_inputs': {'markdown_conversion_input': 'gfm'}, 'quick_settings': {'quick_setting': 'obsidian'}, 'export_formats': {'export_format': 'obsidian'}, 'meta_data_options': {'front_matter_format': 'yaml', 'metadata_schema': 'title,ctime,mtime,tag', 'tag_prefix': '#', 'spaces_in_tags': 'False', 'split_tags': 'False', 'metadata_time_format': '%Y-%m-%d %H:%M:%S%Z', 'file_created_text': 'created', 'file_modified_text': 'updated'}, 'table_options': {'first_row_as_header': 'True', 'first_column_as_header': 'True'}, 'chart_options': {'chart_image': 'True', 'chart_csv': 'True', 'chart_data_table': 'True'}, 'file_options': {'source': '', 'export_folder': 'notes-15', 'attachment_folder_name': 'attachments', 'allow_spaces_in_filenames': 'True', 'filename_spaces_replaced_by': '-', 'allow_unicode_in_filenames': 'True', 'allow_uppercase_in_filenames': 'True', 'allow_non_alphanumeric_in_filenames': 'True', 'creation_time_in_exported_file_name': 'True', 'max_file_or_directory_name_length': '255', 'orphans': 'copy', 'make_absolute': 'False'}, 'nimbus_options': {'embed_these_document_types': 'md,pdf', 'embed_these_image_types': 'png,jpg,jpeg,gif,bmp,svg', 'embed_these_audio_types': 'mp3,webm,wav,m4a,ogg,3gp,flac', 'embed_these_video_types': 'mp4,webm,ogv', 'keep_nimbus_row_and_column_headers': 'False', 'unrecognised_tag_format': 'html'}}"
+    assert result == "ConfigData{'conversion_inputs': {'conversion_input': 'nsx'}, 'markdown_conversion_inputs': {'markdown_conversion_input': 'gfm'}, 'quick_settings': {'quick_setting': 'obsidian'}, 'export_formats': {'export_format': 'obsidian'}, 'meta_data_options': {'front_matter_format': 'yaml', 'metadata_schema': 'title,ctime,mtime,tag', 'tag_prefix': '#', 'spaces_in_tags': 'False', 'split_tags': 'False', 'metadata_time_format': '%Y-%m-%d %H:%M:%S%Z', 'file_created_text': 'created', 'file_modified_text': 'updated'}, 'table_options': {'first_row_as_header': 'True', 'first_column_as_header': 'True'}, 'chart_options': {'chart_image': 'True', 'chart_csv': 'True', 'chart_data_table': 'True'}, 'file_options': {'source': '', 'export_folder': 'notes-15', 'attachment_folder_name': 'attachments', 'allow_spaces_in_filenames': 'True', 'filename_spaces_replaced_by': '-', 'allow_unicode_in_filenames': 'True', 'allow_uppercase_in_filenames': 'True', 'allow_non_alphanumeric_in_filenames': 'True', 'creation_time_in_exported_file_name': 'True', 'max_file_or_directory_name_length': '255', 'orphans': 'copy', 'make_absolute': 'False'}, 'nimbus_options': {'embed_these_document_types': 'md,pdf', 'embed_these_image_types': 'png,jpg,jpeg,gif,bmp,svg', 'embed_these_audio_types': 'mp3,webm,wav,m4a,ogg,3gp,flac', 'embed_these_video_types': 'mp4,webm,ogv', 'keep_nimbus_row_and_column_headers': 'False', 'unrecognised_tag_format': 'html'}, 'performance_options': {'pandoc_workers': '0', 'pandoc_cache_size_mb': '0', 'html_parser': 'auto', 'copy_mode': 'copy', 'stream_nsx_notes': 'False', 'chart_workers': '0', 'chart_cache_size_mb': '0', 'html_fast_path': 'False'}}"
 
 
 def test_repr(good_config_ini, tmp_path):
@@ -582,7 +650,7 @@ def test_repr(good_config_ini, tmp_path):
     cd.parse_config_file()
 
     result = repr(cd)
-    assert result == "ConfigData{'conversion_inputs': {'conversion_input': 'nsx'}, 'markdown_conversion_inputs': {'markdown_conversion_input': 'gfm'}, 'quick_settings': {'quick_setting': 'obsidian'}, 'export_formats': {'export_format': 'obsidian'}, 'meta_data_options': {'front_matter_format': 'yaml', 'metadata_schema': 'title,ctime,mtime,tag', 'tag_prefix': '#', 'spaces_in_tags': 'False', 'split_tags': 'False', 'metadata_time_format': '%Y-%m-%d %H:%M:%S%Z', 'file_created_text': 'created', 'file_modified_text': 'updated'}, 'table_options': {'first_row_as_header': 'True', 'first_column_as_header': 'True'}, 'chart_options': {'chart_image': 'True', 'chart_csv': 'True', 'chart_data_table': 'True'}, 'file_options': {'source': '', 'export_folder': 'notes-15', 'attachment_folder_name': 'attachments', 'allow_spaces_in_filenames': 'True', 'filename_spaces_replaced_by': '-', 'allow_unicode_in_filenames': 'True', 'allow_uppercase_in_filenames': 'True', 'allow_non_alphanumeric_in_filenames': 'True', 'creation_time_in_exported_file_name': 'True', 'max_file_or_directory_name_length': '255', 'orphans': 'copy', 'make_absolute': 'False'}, 'nimbus_options': {'embed_these_document_types': 'md,pdf', 'embed_these_image_types': 'png,jpg,jpeg,gif,bmp,svg', 'embed_these_audio_types': 'mp3,webm,wav,m4a,ogg,3gp,flac', 'embed_these_video_types': 'mp4,webm,ogv', 'keep_nimbus_row_and_column_headers': 'False', 'unrecognised_tag_format': 'html'}}"
+    assert result == "ConfigData{'conversion_inputs': {'conversion_input': 'nsx'}, 'markdown_conversion_inputs': {'markdown_conversion_input': 'gfm'}, 'quick_settings': {'quick_setting': 'obsidian'}, 'export_formats': {'export_format': 'obsidian'}, 'meta_data_options': {'front_matter_format': 'yaml', 'metadata_schema': 'title,ctime,mtime,tag', 'tag_prefix': '#', 'spaces_in_tags': 'False', 'split_tags': 'False', 'metadata_time_format': '%Y-%m-%d %H:%M:%S%Z', 'file_created_text': 'created', 'file_modified_text': 'updated'}, 'table_options': {'first_row_as_header': 'True', 'first_column_as_header': 'True'}, 'chart_options': {'chart_image': 'True', 'chart_csv': 'True', 'chart_data_table': 'True'}, 'file_options': {'source': '', 'export_folder': 'notes-15', 'attachment_folder_name': 'attachments', 'allow_spaces_in_filenames': 'True', 'filename_spaces_replaced_by': '-', 'allow_unicode_in_filenames': 'True', 'allow_uppercase_in_filenames': 'True', 'allow_non_alphanumeric_in_filenames': 'True', 'creation_time_in_exported_file_name': 'True', 'max_file_or_directory_name_length': '255', 'orphans': 'copy', 'make_absolute': 'False'}, 'nimbus_options': {'embed_these_document_types': 'md,pdf', 'embed_these_image_types': 'png,jpg,jpeg,gif,bmp,svg', 'embed_these_audio_types': 'mp3,webm,wav,m4a,ogg,3gp,flac', 'embed_these_video_types': 'mp4,webm,ogv', 'keep_nimbus_row_and_column_headers': 'False', 'unrecognised_tag_format': 'html'}, 'performance_options': {'pandoc_workers': '0', 'pandoc_cache_size_mb': '0', 'html_parser': 'auto', 'copy_mode': 'copy', 'stream_nsx_notes': 'False', 'chart_workers': '0', 'chart_cache_size_mb': '0', 'html_fast_path': 'False'}}"
 
 
 def test_generate_conversion_settings_using_quick_settings_string(good_config_ini, tmp_path):
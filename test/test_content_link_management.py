@@ -496,6 +496,33 @@ def test_update_html_link_src():
     assert result == expected
 
 
+def test_update_links_in_content(mocker):
+    content = '<a href="one.pdf">one</a><a href="two.pdf">two</a><a href="https://one.pdf">web</a>' \
+              '<img src="one.pdf"/>\n[one](one.pdf)\n![two](two.pdf)\n[three](three.pdf)'
+    new_paths = {
+        'one.pdf': Path('../attachments/one.pdf'),
+        'two.pdf': Path('/notes/two.pdf'),
+    }
+    expected = '<a href="../attachments/one.pdf">one</a><a href="/notes/two.pdf">two</a>' \
+               '<a href="https://one.pdf">web</a><img src="one.pdf"/>\n' \
+               '[one](../attachments/one.pdf)\n![two](/notes/two.pdf)\n[three](three.pdf)'
+    make_soup = mocker.spy(helper_functions, 'make_soup_from_html')
+
+    result = content_link_management.update_links_in_content(content, new_paths)
+
+    assert result == expected
+    assert make_soup.call_count == 1
+
+
+def test_update_links_in_content_no_new_paths(mocker):
+    make_soup = mocker.spy(helper_functions, 'make_soup_from_html')
+
+    result = content_link_management.update_links_in_content('<p>hello<br></p>', {})
+
+    assert result == '<p>hello<br></p>'
+    make_soup.assert_not_called()
+
+
 def test_split_valid_and_invalid_link_paths_windows():
     if not os.name == 'nt':
         return
@@ -552,3 +579,66 @@ def test_split_valid_and_invalid_link_paths_unix_like():
     assert result.invalid == expected_invalid
 
     assert result.valid == expected_valid
+
+
+def test_scan_content_for_local_links():
+    content = f'![copyable](../my_other_notebook/attachments/five.pdf "test tool tip text")\n' \
+              f'[a web link](https://www.google.com "google")\n' \
+              f'<p><img src="attachments/ten.png" /></p>\n' \
+              f'<a href="attachments/eleven.pdf">example-attachment.pdf</a>\n' \
+              f'<a href="attachments/file%20thirteen.pdf#page=2">example-attachment.pdf</a>\n' \
+              f'<a href="mailto:person@exmaple.com">person@exmaple.com</a>\n' \
+              f'<a href="https://www.google.com">google</a>\n' \
+              f'<iframe src="file:///videos/file%20fourteen.mp4"></iframe>\n' \
+              f'<img src="https://www.dummy.com/image.png" />'
+
+    result = content_link_management.scan_content_for_local_links(content)
+
+    assert result.img == {'attachments/ten.png', '/videos/file fourteen.mp4'}
+    assert result.href == {'attachments/eleven.pdf', 'attachments/file thirteen.pdf#page=2'}
+    assert result.markdown == {'../my_other_notebook/attachments/five.pdf'}
+
+
+def test_scan_content_for_local_links_exclude_markdown_links():
+    content = f'![copyable](attachments/file%20twelve.pdf)\n' \
+              f'<img src="attachments/ten.png" />'
+
+    result = content_link_management.scan_content_for_local_links(content, include_markdown_links=False)
+
+    assert result.img == {'attachments/ten.png'}
+    assert result.href == set()
+    assert result.markdown == set()
+
+
+@pytest.mark.parametrize(
+    'content', [
+        '<div><a href="one%20&amp;%20two.pdf">a</a><IMG SRC="three.png"><a href>empty</a><img src=""></div>',
+        '<a href="four.pdf" href="five.pdf">duplicate attributes</a><img src="six.png" src="seven.png">',
+        '<script>var a = "<img src=\'eight.png\'>";</script><!-- <a href="nine.pdf"> --><a href="ten.pdf">',
+        'no html [link](eleven.pdf) <unclosed <a href="twelve.pdf"',
+    ]
+)
+def test_scan_content_for_local_links_matches_soup_based_functions(content):
+    result = content_link_management.scan_content_for_local_links(content)
+
+    assert result.img == content_link_management.set_of_html_img_file_paths_from(content)
+    assert result.href == content_link_management.set_of_html_href_file_paths_from(content)
+    assert result.markdown == content_link_management.set_of_markdown_file_paths_from(content)
+
+
+def test_get_set_of_all_files(tmp_path):
+    Path(tmp_path, 'notebook', 'attachments').mkdir(parents=True)
+    Path(tmp_path, 'notebook', 'note.md').touch()
+    Path(tmp_path, 'notebook', 'attachments', 'one.png').touch()
+    Path(tmp_path, 'empty_folder').mkdir()
+    Path(tmp_path, '.hidden').touch()
+    expected = {
+        Path(tmp_path, 'notebook', 'note.md'),
+        Path(tmp_path, 'notebook', 'attachments', 'one.png'),
+        Path(tmp_path, '.hidden'),
+    }
+
+    result = content_link_management.get_set_of_all_files(tmp_path)
+
+    assert result == expected
+    assert result == {path for path in tmp_path.rglob('*') if path.is_file()}
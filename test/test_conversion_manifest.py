@@ -0,0 +1,191 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+import conversion_manifest
+import conversion_settings
+from conversion_manifest import ConversionManifest
+
+
+@pytest.fixture
+def source(tmp_path):
+    Path(tmp_path, 'source').mkdir()
+    source = Path(tmp_path, 'source', 'note.md')
+    source.write_text('a note')
+    return source
+
+
+@pytest.fixture
+def export_folder(tmp_path):
+    Path(tmp_path, 'export', 'attachments').mkdir(parents=True)
+    Path(tmp_path, 'export', 'note.html').write_text('converted note')
+    Path(tmp_path, 'export', 'attachments', 'one.png').write_text('one')
+    return Path(tmp_path, 'export')
+
+
+def save_manifest(export_folder, source, settings='settings'):
+    manifest = ConversionManifest(export_folder, settings)
+    manifest.record('note.md', source, [Path(export_folder, 'note.html')],
+                    [Path(export_folder, 'attachments', 'one.png')],
+                    {source: {'copyable_absolute': {Path(source.parent, 'attachments', 'one.png')},
+                              'all': {'attachments/one.png'}}})
+    manifest.save()
+
+
+def test_unchanged_source_is_recognised_on_next_run(export_folder, source):
+    save_manifest(export_folder, source)
+
+    manifest = ConversionManifest(export_folder, 'settings')
+
+    assert conversion_manifest.manifest_exists(export_folder)
+    assert manifest.is_unchanged('note.md', source)
+    assert not manifest.is_unchanged('new_note.md', source)
+
+
+def test_source_with_only_new_modification_time_is_unchanged(export_folder, source):
+    save_manifest(export_folder, source)
+    os.utime(source, ns=(source.stat().st_atime_ns, source.stat().st_mtime_ns + 10 ** 9))
+
+    manifest = ConversionManifest(export_folder, 'settings')
+
+    assert manifest.is_unchanged('note.md', source)
+
+
+@pytest.mark.parametrize(
+    'settings, full, new_content', [
+        ('settings', False, 'an edited note'),
+        ('settings', False, 'a bote'),
+        ('changed settings', False, None),
+        ('settings', True, None),
+    ]
+)
+def test_changed_source_settings_or_full_conversion_is_not_unchanged(export_folder, source, settings, full,
+                                                                     new_content):
+    save_manifest(export_folder, source)
+    if new_content:
+        source.write_text(new_content)
+        os.utime(source, ns=(source.stat().st_atime_ns, source.stat().st_mtime_ns + 10 ** 9))
+
+    manifest = ConversionManifest(export_folder, settings, full=full)
+
+    assert not manifest.is_unchanged('note.md', source)
+
+
+def test_source_with_missing_output_is_not_unchanged(export_folder, source):
+    save_manifest(export_folder, source)
+    Path(export_folder, 'note.html').unlink()
+
+    manifest = ConversionManifest(export_folder, 'settings')
+
+    assert not manifest.is_unchanged('note.md', source)
+
+
+def test_attachment_details_restored_with_original_types(export_folder, source):
+    save_manifest(export_folder, source)
+
+    manifest = ConversionManifest(export_folder, 'settings')
+
+    assert manifest.attachment_details('note.md') == {
+        source: {'copyable_absolute': {Path(source.parent, 'attachments', 'one.png')},
+                 'all': {'attachments/one.png'}}
+    }
+
+
+def test_remove_deleted_sources_keeps_attachments_still_in_use(export_folder, source, tmp_path):
+    save_manifest(export_folder, source)
+    manifest = ConversionManifest(export_folder, 'settings')
+    other_source = Path(tmp_path, 'source', 'other.md')
+    other_source.write_text('another note')
+    Path(export_folder, 'other.html').write_text('converted note')
+    manifest.record('other.md', other_source, ['other.html'], ['attachments/one.png'])
+
+    manifest.remove_deleted_sources(['other.md'])
+
+    assert not Path(export_folder, 'note.html').exists()
+    assert Path(export_folder, 'attachments', 'one.png').exists()
+    assert manifest.removed_count == 1
+
+
+def test_remove_previous_outputs_removes_empty_folders(export_folder, source):
+    save_manifest(export_folder, source)
+    manifest = ConversionManifest(export_folder, 'settings')
+
+    manifest.remove_previous_outputs('note.md')
+
+    assert not Path(export_folder, 'note.html').exists()
+    assert not Path(export_folder, 'attachments').exists()
+    assert export_folder.exists()
+
+
+def test_created_folders_removed_with_outputs(export_folder, source):
+    files_before = conversion_manifest.list_files(export_folder, include_folders=True)
+    Path(export_folder, 'notebook', 'attachments').mkdir(parents=True)
+    Path(export_folder, 'notebook', 'note.md').write_text('converted note')
+    outputs = conversion_manifest.list_files(export_folder, include_folders=True) - files_before
+    manifest = ConversionManifest(export_folder, 'settings')
+    manifest.record('notes.nsx', source, outputs)
+    manifest.save()
+
+    ConversionManifest(export_folder, 'settings').remove_deleted_sources([])
+
+    assert outputs == {'notebook/', 'notebook/attachments/', 'notebook/note.md'}
+    assert not Path(export_folder, 'notebook').exists()
+    assert Path(export_folder, 'note.html').exists()
+
+
+def test_keep_carries_entry_into_saved_manifest(export_folder, source):
+    save_manifest(export_folder, source)
+    manifest = ConversionManifest(export_folder, 'settings')
+    assert manifest.is_unchanged('note.md', source)
+
+    manifest.keep('note.md', source)
+    manifest.save()
+
+    saved = json.loads(Path(export_folder, conversion_manifest.MANIFEST_FILE_NAME).read_text())
+    assert saved['sources']['note.md']['outputs'] == ['note.html']
+    assert manifest.skipped_count == 1
+
+
+def test_unreadable_manifest_is_ignored(export_folder, source, caplog):
+    Path(export_folder, conversion_manifest.MANIFEST_FILE_NAME).write_text('not json')
+
+    manifest = ConversionManifest(export_folder, 'settings')
+
+    assert not manifest.is_unchanged('note.md', source)
+    assert 'Unable to read the conversion manifest' in caplog.records[-1].message
+
+
+def test_manifest_of_another_source_is_ignored_and_its_outputs_kept(export_folder, source, tmp_path):
+    manifest = ConversionManifest(export_folder, 'settings', source_absolute_root=source.parent,
+                                  conversion_input='nsx')
+    manifest.record('note.md', source, [Path(export_folder, 'note.html')])
+    manifest.save()
+
+    assert conversion_manifest.manifest_matches(export_folder, source.parent, 'nsx')
+    assert not conversion_manifest.manifest_matches(export_folder, source.parent, 'html')
+    assert not conversion_manifest.manifest_matches(export_folder, tmp_path, 'nsx')
+
+    manifest = ConversionManifest(export_folder, 'settings', source_absolute_root=tmp_path, conversion_input='nsx')
+    manifest.remove_deleted_sources([])
+
+    assert manifest.previous_keys() == set()
+    assert Path(export_folder, 'note.html').exists()
+
+
+@pytest.mark.parametrize(
+    'setting, value, fingerprint_changes', [
+        ('pandoc_workers', 2, False),
+        ('chart_cache_size_mb', 10, False),
+        ('html_fast_path', True, True),
+        ('export_format', 'html', True),
+    ]
+)
+def test_settings_fingerprint_only_changed_by_settings_affecting_output(setting, value, fingerprint_changes):
+    settings = conversion_settings.ConversionSettings()
+    fingerprint = conversion_manifest.settings_fingerprint(settings)
+
+    setattr(settings, setting, value)
+
+    assert (conversion_manifest.settings_fingerprint(settings) != fingerprint) == fingerprint_changes
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 
 import pytest
@@ -204,6 +205,51 @@ def test_export_folder_setting_absolute_path_not_in_data_dir(tmp_path):
     assert cs.export_folder_absolute == Path(tmp_path.parent, "somewhere_else/my-target")
 
 
+@pytest.mark.parametrize(
+    'file_in_folder, manifest_source, manifest_conversion_input, expected_folder', [
+        ('note.md', None, None, 'my-target-1'),
+        ('.yanom_manifest.json', 'source', 'nsx', 'my-target'),
+        ('.yanom_manifest.json', 'other_source', 'nsx', 'my-target-1'),
+        ('.yanom_manifest.json', 'source', 'html', 'my-target-1'),
+    ]
+)
+def test_export_folder_setting_reuses_folder_with_conversion_manifest_of_same_source(
+        tmp_path, file_in_folder, manifest_source, manifest_conversion_input, expected_folder):
+    cs = conversion_settings.ConversionSettings()
+    cs.working_directory = tmp_path
+    Path(tmp_path, 'source').mkdir()
+    Path(tmp_path, config.yanom_globals.data_dir, "my-target").mkdir(parents=True)
+    Path(tmp_path, config.yanom_globals.data_dir, "my-target", file_in_folder).write_text(json.dumps(
+        {'source': str(Path(tmp_path, manifest_source or '')), 'conversion_input': manifest_conversion_input}))
+    Path(tmp_path, config.yanom_globals.data_dir, "my-target", 'converted.md').touch()
+    cs.conversion_input = 'nsx'
+    cs.source = Path(tmp_path, 'source')
+
+    cs.export_folder = "my-target"
+
+    assert cs.export_folder_absolute == Path(tmp_path, config.yanom_globals.data_dir, expected_folder)
+
+
+def test_export_folder_not_reused_when_source_set_after_export_folder(tmp_path):
+    cs = conversion_settings.ConversionSettings()
+    cs.working_directory = tmp_path
+    Path(tmp_path, 'source').mkdir()
+    Path(tmp_path, 'other_source').mkdir()
+    Path(tmp_path, config.yanom_globals.data_dir, "my-target").mkdir(parents=True)
+    Path(tmp_path, config.yanom_globals.data_dir, "my-target", '.yanom_manifest.json').write_text(json.dumps(
+        {'source': str(Path(tmp_path, 'source')), 'conversion_input': 'nsx'}))
+    Path(tmp_path, config.yanom_globals.data_dir, "my-target", 'converted.md').touch()
+    cs.conversion_input = 'nsx'
+    cs.source = Path(tmp_path, 'source')
+    cs.export_folder = "my-target"
+    assert cs.export_folder_absolute == Path(tmp_path, config.yanom_globals.data_dir, 'my-target')
+
+    cs.source = Path(tmp_path, 'other_source')
+
+    assert cs.export_folder_absolute == Path(tmp_path, config.yanom_globals.data_dir, 'my-target-1')
+    assert cs.export_folder == Path('my-target-1')
+
+
 def test_export_folder_setting_default_data_dir(tmp_path):
     cs = conversion_settings.ConversionSettings()
     cs.working_directory = tmp_path
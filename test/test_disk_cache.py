@@ -0,0 +1,60 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from disk_cache import DiskCache
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(tmp_path, 250)
+    cache.put('aa01', 'a' * 100)
+    cache.put('bb02', 'b' * 100)
+    os.utime(Path(tmp_path, 'aa', 'aa01'), (1, 1))
+    os.utime(Path(tmp_path, 'bb', 'bb02'), (2, 2))
+
+    cache.get('aa01')
+    cache.put('cc03', 'c' * 100)
+
+    assert cache.get('bb02') is None
+    assert cache.get('aa01') == 'a' * 100
+    assert cache.get('cc03') == 'c' * 100
+
+
+def test_disk_cache_overwrite_does_not_count_entry_twice(tmp_path):
+    cache = DiskCache(tmp_path, 250)
+    cache.put('aa01', 'a' * 100)
+    cache.put('aa01', 'a' * 120)
+    cache.put('bb02', 'b' * 100)
+
+    assert cache._current_size == 220
+    assert cache.get('aa01') == 'a' * 120
+    assert cache.get('bb02') == 'b' * 100
+
+
+def test_disk_cache_ignores_files_being_written(tmp_path):
+    Path(tmp_path, 'aa').mkdir()
+    Path(tmp_path, 'aa', 'aa01').write_text('a' * 100)
+    Path(tmp_path, 'aa', 'aa02.1234.1.tmp').write_text('b' * 100)
+
+    cache = DiskCache(tmp_path, 150)
+    cache.put('cc03', 'c' * 40)
+
+    assert cache._current_size == 140
+    assert Path(tmp_path, 'aa', 'aa02.1234.1.tmp').exists()
+
+
+def test_disk_cache_evicts_to_low_water_mark_without_scanning_directory(tmp_path, monkeypatch):
+    cache = DiskCache(tmp_path, 1000)
+    for number in range(10):
+        cache.put(f'aa{number:02}', 'a' * 100)
+    monkeypatch.setattr(DiskCache, '_cache_entries', lambda _self: pytest.fail('cache directory scanned'))
+
+    cache.put('bb01', 'b' * 100)
+    cache.put('bb02', 'b' * 50)
+
+    assert cache._current_size == 950
+    assert len(list(Path(tmp_path).glob('*/*'))) == 10
+    assert cache.get('aa00') is None
+    assert cache.get('aa01') is None
+    assert cache.get('bb02') == 'b' * 50
@@ -5,6 +5,7 @@ from testfixtures import TempDirectory
 
 from content_link_management import get_attachment_paths
 from src.conversion_settings import ConversionSettings
+from src.file_converter_abstract import RenamedFile
 from src.file_converter_MD_to_MD import MDToMDConverter
 import file_mover
 from src.metadata_processing import MetaDataProcessor
@@ -146,6 +147,32 @@ class TestMDToMDConverter(unittest.TestCase):
                              'failed to manage a not existing file name',
                              )
 
+    def test_update_content_for_renamed_file(self):
+        renamed_file = RenamedFile(Path('/source/some_markdown.md'), Path('some_markdown.md'),
+                                   Path('/export/some_markdown-old-1.md'), Path('some_markdown-old-1.md'))
+        content = '<a href="/source/some_markdown.md">absolute</a>\n<a href="some_markdown.md">relative</a>\n' \
+                  '[absolute](/source/some_markdown.md)\n[relative](some_markdown.md)\n[other](other.md)'
+        test_data_sets = [
+            ('markdown',
+             '<a href="/export/some_markdown-old-1.md">absolute</a>\n'
+             '<a href="some_markdown-old-1.md">relative</a>\n'
+             '[absolute](/export/some_markdown-old-1.md)\n[relative](some_markdown-old-1.md)\n[other](other.md)',
+             'html and markdown links not updated for markdown input'
+             ),
+            ('html',
+             '<a href="/export/some_markdown-old-1.md">absolute</a>\n'
+             '<a href="some_markdown-old-1.md">relative</a>\n'
+             '[absolute](/source/some_markdown.md)\n[relative](some_markdown.md)\n[other](other.md)',
+             'markdown links changed for html input'
+             ),
+        ]
+        for test_set in test_data_sets:
+            with self.subTest(msg=f'Testing {test_set[2]}'):
+                self.file_converter._conversion_settings.conversion_input = test_set[0]
+                self.file_converter._pre_processed_content = content
+                self.file_converter.update_content_for_renamed_file(renamed_file)
+                self.assertEqual(test_set[1], self.file_converter._pre_processed_content, test_set[2])
+
     def test_pre_process_obsidian_image_links_if_required(self):
         test_strings = [
             ('obsidian',
@@ -0,0 +1,87 @@
+import logging
+from pathlib import Path
+
+import pytest
+
+import file_stat_cache
+from file_stat_cache import FileStatCache
+
+
+@pytest.fixture
+def source_folder(tmp_path):
+    Path(tmp_path, 'notebook', 'attachments').mkdir(parents=True)
+    Path(tmp_path, 'notebook', 'note.md').write_text('hello')
+    Path(tmp_path, 'notebook', 'attachments', 'image.png').write_bytes(b'png')
+    Path(tmp_path, 'export').mkdir()
+    Path(tmp_path, 'export', 'note.md').write_text('hello')
+    return tmp_path
+
+
+def test_prepopulate_answers_lookups_without_stat(source_folder, mocker):
+    cache = FileStatCache()
+    cache.prepopulate(source_folder)
+    stat = mocker.patch('file_stat_cache.os.stat')
+
+    assert cache.is_file(Path(source_folder, 'notebook', 'attachments', 'image.png'))
+    assert cache.is_dir(Path(source_folder, 'notebook', 'attachments'))
+    assert cache.exists(Path(source_folder, 'notebook', 'note.md'))
+    assert not cache.is_dir(Path(source_folder, 'notebook', 'note.md'))
+    stat.assert_not_called()
+    assert cache.hits == 4
+    assert cache.misses == 0
+
+
+def test_lookup_of_path_not_found_by_walk_is_stat_once(source_folder):
+    cache = FileStatCache()
+    cache.prepopulate(source_folder)
+    missing = Path(source_folder, 'notebook', 'missing.png')
+
+    assert not cache.exists(missing)
+    assert not cache.exists(str(missing))
+    assert cache.misses == 1
+    assert cache.hits == 1
+
+
+def test_prepopulate_does_not_walk_excluded_folders(source_folder):
+    cache = FileStatCache()
+    cache.prepopulate(source_folder, exclude=[Path(source_folder, 'export')])
+    Path(source_folder, 'export', 'new_note.md').write_text('hello')
+
+    assert cache.is_file(Path(source_folder, 'export', 'new_note.md'))
+    assert cache.is_file(Path(source_folder, 'export', 'note.md'))
+    assert cache.misses == 2
+
+
+def test_module_functions_use_file_system_when_no_run_started(source_folder):
+    file_stat_cache.end_run()
+    new_file = Path(source_folder, 'new.png')
+
+    assert not file_stat_cache.exists(new_file)
+    new_file.write_bytes(b'png')
+    assert file_stat_cache.exists(new_file)
+    assert file_stat_cache.is_file(new_file)
+    assert file_stat_cache.is_dir(source_folder)
+
+
+def test_module_functions_use_run_cache(source_folder):
+    cache = file_stat_cache.start_run(source_folder)
+    try:
+        assert file_stat_cache.is_file(Path(source_folder, 'notebook', 'note.md'))
+        assert file_stat_cache.is_dir(Path(source_folder, 'notebook'))
+        assert file_stat_cache.exists(Path(source_folder, 'export', 'note.md'))
+        assert cache.hits == 3
+    finally:
+        file_stat_cache.end_run()
+
+
+def test_end_run_logs_hit_rate(source_folder, caplog):
+    cache = file_stat_cache.start_run(source_folder)
+    cache.logger.setLevel(logging.DEBUG)
+    file_stat_cache.exists(Path(source_folder, 'notebook', 'note.md'))
+    file_stat_cache.exists(Path(source_folder, 'notebook', 'missing.md'))
+
+    with caplog.at_level(logging.DEBUG):
+        file_stat_cache.end_run()
+
+    assert 'File stat cache 1 hits, 1 misses, hit rate 50.0%' in caplog.messages[-1]
+    assert file_stat_cache._run_cache is None
@@ -1,6 +1,6 @@
 from pathlib import Path
 import file_writer
-from io import BytesIO
+from io import BufferedIOBase, BytesIO
 
 
 def test_file_writer_string(tmp_path):
@@ -102,3 +102,39 @@ def test_file_writer_invalid_type_content(tmp_path, caplog):
 
     for record in caplog.records:
         assert record.levelname == "WARNING"
+
+
+def test_file_writer_stream_copied_in_chunks_and_closed(tmp_path):
+    class TrackingStream(BufferedIOBase):
+        def __init__(self, content):
+            self._content = BytesIO(content)
+            self.largest_read = 0
+
+        def readable(self):
+            return True
+
+        def read(self, size=-1):
+            self.largest_read = max(self.largest_read, size)
+            return self._content.read(size)
+
+    content = b'0123456789' * (file_writer.STREAM_CHUNK_SIZE // 4)
+    stream = TrackingStream(content)
+    file_path = Path(tmp_path, "file1.file")
+
+    file_writer.store_file(file_path, stream)
+
+    assert file_path.read_bytes() == content
+    assert 0 < stream.largest_read <= file_writer.STREAM_CHUNK_SIZE
+    assert stream.closed
+
+
+def test_file_writer_stream_invalid_path(tmp_path, caplog):
+    stream = BufferedIOBase()
+    file_path = Path(tmp_path, "ddsf/dsfsdf/dfsd", "file1.file")
+    file_writer.store_file(file_path, stream)
+
+    assert len(caplog.records) > 0
+
+    for record in caplog.records:
+        assert record.levelname == "ERROR"
+        assert 'No such file or directory' in record.message
@@ -394,6 +394,14 @@ def test_file_extension_from_bytes():
         assert result == '.png'
 
 
+def test_file_extension_from_bytes_only_examines_file_header():
+    file_bytes = b'\x89PNG\r\n\x1a\n' + b'0' * (helper_functions.FILE_TYPE_HEADER_SIZE * 10)
+
+    result = helper_functions.file_extension_from_bytes(file_bytes)
+
+    assert result == '.png'
+
+
 def test_file_extension_from_bytes_file_not_recognised():
     result = helper_functions.file_extension_from_bytes(b'1234')
 
@@ -919,3 +927,32 @@ class TestBoundedNumber:
         """Test ValueError raised when min and max values are reversed"""
         with pytest.raises(ValueError):
             _ = helper_functions.bounded_number(number, min_value, max_value)
+
+
+def test_html_parser_name_html_parser():
+    assert helper_functions.html_parser_name('html.parser') == 'html.parser'
+
+
+@pytest.mark.parametrize(
+    'html_parser', ['auto', 'lxml']
+)
+def test_html_parser_name_uses_lxml_when_installed(html_parser):
+    pytest.importorskip('lxml')
+
+    assert helper_functions.html_parser_name(html_parser) == 'lxml'
+
+
+@pytest.mark.parametrize(
+    'html_content', [
+        '<p>hello <a href="a.md">link</a></p><img src="b.png">',
+        '<html><body><p>hello</p></body></html>',
+        '<body><p>hello</p></body>',
+    ]
+)
+def test_make_soup_from_html_lxml_matches_html_parser(html_content):
+    pytest.importorskip('lxml')
+
+    lxml_soup = helper_functions.make_soup_from_html(html_content, html_parser='lxml')
+    html_parser_soup = helper_functions.make_soup_from_html(html_content, html_parser='html.parser')
+
+    assert str(lxml_soup) == str(html_parser_soup)
@@ -3,6 +3,7 @@ from pathlib import Path
 import pytest
 from bs4 import BeautifulSoup
 
+import config
 import helper_functions
 import html_data_extractors
 import markdown_format_styling
@@ -859,4 +860,15 @@ def test_extract_from_figure_caption(processing_options):
     result = html_data_extractors.extract_from_tag(tag, processing_options)
 
     assert isinstance(result, Caption)
-    assert result.html() == 'A caption'
\ No newline at end of file
+    assert result.html() == 'A caption'
+
+def test_list_items_parsed_with_html_parser_whichever_parser_configured(processing_options, mocker):
+    mocker.patch.object(config.yanom_globals, '_html_parser', 'lxml')
+    make_soup = mocker.patch('helper_functions.make_soup_from_html', wraps=helper_functions.make_soup_from_html)
+    soup = BeautifulSoup('<ul><li>bullet <strong>one</strong></li><li>bullet two</li></ul>', 'html.parser')
+
+    result = html_data_extractors.extract_from_tag(soup.find('ul'), processing_options)
+
+    assert isinstance(result, BulletList)
+    assert make_soup.call_count == 2
+    assert all(call.kwargs == {'html_parser': 'html.parser'} for call in make_soup.call_args_list)
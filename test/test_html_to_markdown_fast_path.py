@@ -0,0 +1,97 @@
+import subprocess
+
+from bs4 import BeautifulSoup
+from packaging import version
+import pytest
+
+import html_to_markdown_fast_path
+from processing_options import ProcessingOptions
+
+
+PANDOC_OPTIONS = ['pandoc', '-f', 'html', '-s', '-t', 'gfm', '--wrap=none', '--markdown-headings=atx']
+
+
+@pytest.fixture
+def processing_options():
+    return ProcessingOptions(None, 'gfm', 'html', None)
+
+
+def pandoc_version():
+    try:
+        return version.parse(subprocess.run(['pandoc', '-v'], capture_output=True, text=True,
+                                            timeout=3).stdout.split()[1])
+    except (OSError, IndexError, subprocess.SubprocessError):
+        return None
+
+
+@pytest.mark.parametrize(
+    'html, expected', [
+        ('<p>hello world</p>',
+         'hello world\n'),
+        ('<!DOCTYPE html>\n<html>\n<head><title>My Note</title><meta charset="utf-8"/></head>\n'
+         '<body>\n<p>hello <b>bold</b> and <em>emphasised</em> words</p>\n</body>\n</html>',
+         '---\ntitle: My Note\n---\n\nhello **bold** and *emphasised* words\n'),
+        ('<h1>Heading</h1><p>some   text<br>next line</p><p></p><h3>Sub heading</h3>',
+         '# Heading\n\nsome text  \nnext line\n\n### Sub heading\n'),
+        ('<p>see <a href="https://www.example.com/page">the example</a>.</p>',
+         'see [the example](https://www.example.com/page).\n'),
+        ('<head><title>Empty note</title></head><body><p> </p></body>',
+         '---\ntitle: Empty note\n---\n\n'),
+        ('<p><b>one</b>\n<b>two</b></p>',
+         '**one** **two**\n'),
+        ('<p>word\n<em>two</em></p>',
+         'word *two*\n'),
+        ('<p>\n  first\n  line<br>\n  second\tline\n</p>',
+         'first line  \nsecond line\n'),
+    ]
+)
+def test_convert_if_simple(html, expected, processing_options):
+    assert html_to_markdown_fast_path.convert_if_simple(html, processing_options) == expected
+
+
+@pytest.mark.parametrize(
+    'html', [
+        '<ul><li>a list</li></ul>',
+        '<div>a div</div>',
+        '<p><img src="image.png"></p>',
+        '<p>text with * and _ characters</p>',
+        '<p><b><em>nested</em></b></p>',
+        '<p><b>bold </b>text</p>',
+        '<p><b>bold</b><strong>strong</strong></p>',
+        '<p>1. looks like a list</p>',
+        '<p>(a) looks like a list</p>',
+        '<p><a href="https://www.example.com">https://www.example.com</a></p>',
+        '<head><title>yes</title></head><p>text</p>',
+        '<head><title></title></head><p>text</p>',
+        '<head><meta name="author" content="me"></head><p>text</p>',
+        '<p>a <!-- comment --></p>',
+        '<h2>heading<br>with a break</h2>',
+        '<p><b>bold\ntext</b></p>',
+    ]
+)
+def test_convert_if_simple_leaves_other_html_for_pandoc(html, processing_options):
+    assert html_to_markdown_fast_path.convert_if_simple(html, processing_options) is None
+
+
+@pytest.mark.parametrize(
+    'html', [
+        '<p>hello world</p>',
+        '<!DOCTYPE html>\n<html>\n<head><title>A title (1) - it\'s</title><meta content="x"/></head>\n'
+        '<body>\n<p>ok! -- <b>a@b.com</b> <br> x-y true</p>\n<h2>café +</h2>\n</body>\n</html>',
+        '<p> <strong>Bold</strong> <a href="page.md">a link</a> <br><br> end </p><p>2 3)</p>',
+        '<h1>Heading</h1>\n<h6>Small heading</h6><p>"quoted" = 50% / more</p>',
+        '<p><b>one</b>\n<b>two</b></p>',
+        '<p>word\n<em>two</em>\n</p>\n<p>\n  <strong>Bold</strong>\n  <a href="page.md">a link</a>\n</p>',
+        '<h2>\n  pretty\n  printed\n</h2>\n<p>one\r\ntwo\tthree<br>\nfour</p>',
+    ]
+)
+def test_fast_path_matches_pandoc(html, processing_options):
+    found_version = pandoc_version()
+    if found_version is None or found_version < version.parse('2.11.2'):
+        pytest.skip('pandoc 2.11.2 or later is not available')
+
+    pandoc_result = subprocess.run(PANDOC_OPTIONS, input=html, capture_output=True, encoding='utf-8').stdout
+    soup = BeautifulSoup(html, 'html.parser')
+
+    assert html_to_markdown_fast_path.is_simple_html(soup)
+    assert html_to_markdown_fast_path.convert(soup, processing_options) == pandoc_result
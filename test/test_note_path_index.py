@@ -0,0 +1,63 @@
+from pathlib import Path
+import pickle
+
+import note_path_index
+from note_path_index import NotePathIndex
+
+
+def test_note_path_index_contains_note_paths(tmp_path):
+    note = Path(tmp_path, 'notebook', 'note.md')
+    index = NotePathIndex([note, note])
+
+    assert note in index
+    assert Path(tmp_path, 'other.md') not in index
+    assert len(index) == 1
+    assert set(index) == {note}
+
+
+def test_note_path_index_from_paths_reuses_index(tmp_path):
+    index = NotePathIndex([Path(tmp_path, 'note.md')])
+
+    assert NotePathIndex.from_paths(index) is index
+    assert NotePathIndex.from_paths([Path(tmp_path, 'note.md')]) == index
+
+
+def test_note_path_index_set_operations_return_set(tmp_path):
+    index = NotePathIndex([Path(tmp_path, 'note.md')])
+
+    result = {Path(tmp_path, 'note.md'), Path(tmp_path, 'image.png')} - index
+
+    assert result == {Path(tmp_path, 'image.png')}
+    assert type(result) is set
+
+
+def test_note_path_index_is_note_link(tmp_path):
+    content_file = Path(tmp_path, 'notebook', 'note.md')
+    index = NotePathIndex([Path(tmp_path, 'other_notebook', 'other.md'), Path(tmp_path, 'notebook', 'third.md')])
+
+    assert index.is_note_link(content_file, '../other_notebook/other.md')
+    assert index.is_note_link(content_file, 'third.md')
+    assert index.is_note_link(content_file, str(Path(tmp_path, 'notebook', 'third.md')))
+    assert not index.is_note_link(content_file, 'attachments/image.png')
+
+
+def test_note_path_index_memoises_absolute_link_paths(tmp_path):
+    content_files = [Path(tmp_path, 'notebook', f'note{n}.md') for n in range(3)]
+    index = NotePathIndex([])
+    note_path_index._absolute_link_path.cache_clear()
+
+    for content_file in content_files:
+        index.is_note_link(content_file, 'attachments/image.png')
+
+    cache_info = note_path_index._absolute_link_path.cache_info()
+    assert cache_info.misses == 1
+    assert cache_info.hits == 2
+
+
+def test_note_path_index_can_be_pickled_for_worker_processes(tmp_path):
+    index = NotePathIndex([Path(tmp_path, 'note.md')])
+
+    result = pickle.loads(pickle.dumps(index))
+
+    assert result == index
+    assert Path(tmp_path, 'note.md') in result
@@ -12,8 +12,10 @@ import conversion_settings
 import file_converter_HTML_to_MD
 import file_converter_MD_to_HTML
 import file_converter_MD_to_MD
+from note_path_index import NotePathIndex
 import notes_converter
 import nsx_file_converter
+from pandoc_converter import PandocConverter
 
 
 def touch(path):
@@ -28,6 +30,7 @@ class FakeNSXFile:
         self.note_book_count = 2
         self.image_count = 3
         self.attachment_count = 4
+        self.chart_renders_avoided = 0
         self.null_attachments = []
         self.encrypted_notes = []
         self.exported_notes = []
@@ -295,6 +298,8 @@ def test_process_files(tmp_path):
     cd = config_data.ConfigData(f"{config.yanom_globals.data_dir}/config.ini", 'gfm', allow_no_value=True)
     nc = notes_converter.NotesConvertor(args, cd)
     nc.conversion_settings = conversion_settings.ConversionSettings()
+    nc.conversion_settings.working_directory = tmp_path
+    nc.conversion_settings.export_folder = Path(tmp_path, 'notes')
     nc.conversion_settings._source = Path(tmp_path, 'file1.html')
     nc.conversion_settings._source_absolute_root = Path(tmp_path)
 
@@ -306,6 +311,27 @@ def test_process_files(tmp_path):
     assert nc._note_page_count == 1
 
 
+def test_process_files_shares_note_path_index_with_file_converter(tmp_path):
+    args = {'source': tmp_path}
+    touch(Path(tmp_path, 'file1.html'))
+    cd = config_data.ConfigData(f"{config.yanom_globals.data_dir}/config.ini", 'gfm', allow_no_value=True)
+    nc = notes_converter.NotesConvertor(args, cd)
+    nc.conversion_settings = conversion_settings.ConversionSettings()
+    nc.conversion_settings.working_directory = tmp_path
+    nc.conversion_settings.export_folder = Path(tmp_path, 'notes')
+    nc.conversion_settings._source = Path(tmp_path, 'file1.html')
+    nc.conversion_settings._source_absolute_root = Path(tmp_path)
+
+    files_to_convert = [Path(tmp_path, 'file1.html')]
+    file_converter = file_converter_HTML_to_MD.HTMLToMDConverter(nc.conversion_settings, files_to_convert)
+
+    nc.process_files(files_to_convert, file_converter)
+
+    assert isinstance(file_converter.files_to_convert, NotePathIndex)
+    assert file_converter.files_to_convert is nc._set_files_to_convert
+    assert set(file_converter.files_to_convert) == set(files_to_convert)
+
+
 def test_process_files_copy_attachments(tmp_path):
     args = {'source': tmp_path}
     touch(Path(tmp_path, 'file1.html'))
@@ -362,6 +388,43 @@ def test_process_files_copy_attachments_source_and_export_same_folder(tmp_path,
     assert Path(tmp_path, 'file1.md').exists()
 
 
+@pytest.mark.parametrize(
+    'silent', [True, False]
+)
+def test_process_files_using_worker_processes_matches_sequential_conversion(tmp_path, silent):
+    config.yanom_globals.is_silent = silent
+    Path(tmp_path, 'attachments').mkdir()
+    files_to_convert = []
+    for n in range(4):
+        Path(tmp_path, 'attachments', f'a-file{n}.pdf').touch()
+        Path(tmp_path, f'file{n}.html').write_text(f'<p>note {n}</p><a href="attachments/a-file{n}.pdf">attachment</a>'
+                                                   f'<a href="attachments/missing{n}.pdf">missing</a>')
+        files_to_convert.append(Path(tmp_path, f'file{n}.html'))
+
+    results = []
+    for workers in (0, 2):
+        export_folder = Path(tmp_path, f'notes{workers}')
+        cd = config_data.ConfigData(f"{config.yanom_globals.data_dir}/config.ini", 'gfm', allow_no_value=True)
+        nc = notes_converter.NotesConvertor({'source': tmp_path}, cd)
+        nc.conversion_settings = conversion_settings.ConversionSettings()
+        nc.conversion_settings.export_folder = export_folder
+        nc.conversion_settings._source = Path(tmp_path)
+        nc.conversion_settings._source_absolute_root = Path(tmp_path)
+        nc._workers = workers
+        file_converter = file_converter_HTML_to_MD.HTMLToMDConverter(nc.conversion_settings, files_to_convert)
+
+        nc.process_files(files_to_convert, file_converter)
+
+        assert nc._note_page_count == 4
+        assert {path.relative_to(export_folder) for path in nc._exported_files} == \
+               {Path(f'file{n}.md') for n in range(4)}
+        assert all(Path(export_folder, 'attachments', f'a-file{n}.pdf').exists() for n in range(4))
+        results.append(nc._attachment_details)
+
+    assert list(results[0].keys()) == list(results[1].keys()) == files_to_convert
+    assert results[0] == results[1]
+
+
 @pytest.mark.parametrize(
     'silent_mode, expected_out', [
         (True, ''),
@@ -405,6 +468,8 @@ def test_convert_markdown(tmp_path, input_file, file_converter_type, export_form
     cd = config_data.ConfigData(f"{config.yanom_globals.data_dir}/config.ini", 'gfm', allow_no_value=True)
     nc = notes_converter.NotesConvertor(args, cd)
     nc.conversion_settings = conversion_settings.ConversionSettings()
+    nc.conversion_settings.working_directory = tmp_path
+    nc.conversion_settings.export_folder = Path(tmp_path, 'notes')
     nc.conversion_settings._source = Path(tmp_path)
     nc.conversion_settings._source_absolute_root = Path(tmp_path)
     nc.conversion_settings.export_format = export_format
@@ -432,6 +497,7 @@ def test_convert_notes(tmp_path, input_file, file_converter_type, export_format,
     nc.conversion_settings = conversion_settings.ConversionSettings()
     nc.conversion_settings._source = Path(tmp_path)
     nc.conversion_settings._working_directory = Path(tmp_path)
+    nc.conversion_settings.export_folder = Path(tmp_path, 'notes')
     nc.conversion_settings._source_absolute_root = Path(tmp_path)
     nc.conversion_settings.export_format = export_format
     nc.conversion_settings.conversion_input = conversion_input
@@ -457,6 +523,8 @@ def test_convert_notes_nsx_file_type(tmp_path, capsys, caplog):
     cd = config_data.ConfigData(f"{config.yanom_globals.data_dir}/config.ini", 'gfm', allow_no_value=True)
     nc = notes_converter.NotesConvertor(args, cd)
     nc.conversion_settings = conversion_settings.ConversionSettings()
+    nc.conversion_settings.working_directory = tmp_path
+    nc.conversion_settings.export_folder = Path(tmp_path, 'notes')
     nc.conversion_settings._source = Path(tmp_path)
     nc.conversion_settings._source_absolute_root = Path(tmp_path)
     nc.conversion_settings.conversion_input = 'nsx'
@@ -534,6 +602,32 @@ def test_get_list_of_orphan_files(tmp_path):
         assert file in files
 
 
+def test_get_list_of_orphan_files_attachments_linked_from_several_notes(tmp_path):
+    args = {'silent': True, 'ini': False, 'source': tmp_path}
+    cd = config_data.ConfigData(f"{config.yanom_globals.data_dir}/config.ini", 'gfm', allow_no_value=True)
+    nc = notes_converter.NotesConvertor(args, cd)
+    nc._set_files_to_convert = {Path(tmp_path, 'one.md'), Path(tmp_path, 'two.md')}
+    nc._exported_files = {Path(tmp_path, 'one.html'), Path(tmp_path, 'two.html')}
+    nc._set_of_renamed_note_files = {Path(tmp_path, 'one-old-1.html')}
+    nc._attachment_details = {
+        Path(tmp_path, 'one.md'): {
+            'copyable_absolute': {Path(tmp_path, 'shared.png'), Path(tmp_path, 'one.png')},
+            'non_copyable_absolute': set(),
+        },
+        Path(tmp_path, 'two.md'): {
+            'copyable_absolute': {Path(tmp_path, 'shared.png')},
+            'non_copyable_absolute': {Path(tmp_path, 'outside.pdf')},
+        },
+    }
+    set_of_all_files = {Path(tmp_path, name) for name in ('one.md', 'two.md', 'one.html', 'two.html',
+                                                          'one-old-1.html', 'shared.png', 'one.png',
+                                                          'outside.pdf', 'orphan.png', 'notes.txt')}
+
+    files = nc.get_list_of_orphan_files(set_of_all_files)
+
+    assert files == {Path(tmp_path, 'orphan.png'), Path(tmp_path, 'notes.txt')}
+
+
 def test_handle_orphan_files_as_required_orphans_set_to_orphans_folder(tmp_path):
     Path(tmp_path, 'some_folder/data/my_notebook/attachments').mkdir(parents=True)
     Path(tmp_path, 'some_folder/attachments').mkdir(parents=True)
@@ -753,3 +847,117 @@ def test_print_result_if_any_no_message_expected(capsys, tmp_path):
     nc.print_result_if_any(0, 'message')
     captured = capsys.readouterr()
     assert 'message' not in captured.out
+
+
+def test_check_nsx_attachment_links_uses_converted_note_content(tmp_path, mocker):
+    config.yanom_globals.is_silent = True
+    cd = config_data.ConfigData(f"{config.yanom_globals.data_dir}/config.ini", 'gfm', allow_no_value=True)
+    nc = notes_converter.NotesConvertor({'source': tmp_path}, cd)
+    nc.conversion_settings = conversion_settings.ConversionSettings()
+    nc.conversion_settings.working_directory = tmp_path
+    nc.conversion_settings.conversion_input = 'nsx'
+    nc.conversion_settings.export_format = 'gfm'
+    nc.conversion_settings.export_folder = Path('notes')
+    nsx_file = nsx_file_converter.NSXFile(Path(Path(__file__).parent, 'fixtures', 'test.nsx'),
+                                          nc.conversion_settings,
+                                          PandocConverter(nc.conversion_settings))
+    nsx_file.process_nsx_file()
+    nc._nsx_backups = [nsx_file]
+    unrelated_file = Path(nc.conversion_settings.export_folder_absolute, 'unrelated.md')
+    unrelated_file.write_text('![not a converted note](missing.png)')
+    read_text = mocker.spy(Path, 'read_text')
+
+    nc.check_nsx_attachment_links()
+
+    read_text.assert_not_called()
+    exported_notes = {Path(note_page.full_path) for note_page in nsx_file.note_pages.values()}
+    assert exported_notes
+    assert set(nc._attachment_details) == exported_notes
+    for note in exported_notes:
+        links = content_link_management.find_local_file_links_in_content('gfm', note.read_text(encoding='utf-8'))
+        attachment_links = content_link_management.process_attachments(
+            note, links, exported_notes, nc.conversion_settings.export_folder_absolute)
+        assert nc._attachment_details[note]['all'] == attachment_links.all
+        assert nc._attachment_details[note]['existing'] == attachment_links.existing
+        assert nc._attachment_details[note]['non_existing'] == attachment_links.non_existing
+
+
+def test_converting_one_file_keeps_earlier_conversion_of_its_folder(tmp_path):
+    config.yanom_globals.is_silent = True
+    Path(tmp_path, 'a.html').write_text('<p>note a</p>')
+    Path(tmp_path, 'b.html').write_text('<p>note b</p>')
+    export_folder = Path(tmp_path, 'notes')
+
+    def run_conversion(source, files_to_convert):
+        cd = config_data.ConfigData(f"{config.yanom_globals.data_dir}/config.ini", 'gfm', allow_no_value=True)
+        nc = notes_converter.NotesConvertor({'source': source}, cd)
+        nc.conversion_settings = conversion_settings.ConversionSettings()
+        nc.conversion_settings.conversion_input = 'html'
+        nc.conversion_settings.source = source
+        nc.conversion_settings.export_folder = export_folder
+        nc.create_export_folder_if_required()
+        nc._manifest = nc.create_conversion_manifest()
+        file_converter = file_converter_HTML_to_MD.HTMLToMDConverter(nc.conversion_settings, files_to_convert)
+        nc.process_files(files_to_convert, file_converter)
+        if nc._manifest:
+            nc._manifest.save()
+        return nc
+
+    run_conversion(tmp_path, {Path(tmp_path, 'a.html'), Path(tmp_path, 'b.html')})
+    nc = run_conversion(Path(tmp_path, 'a.html'), {Path(tmp_path, 'a.html')})
+
+    assert nc._manifest is None
+    assert nc.conversion_settings.export_folder_absolute == Path(tmp_path, 'notes-1')
+    assert Path(export_folder, 'a.md').exists()
+    assert Path(export_folder, 'b.md').exists()
+
+
+def test_process_files_only_converts_changed_notes_on_later_runs(tmp_path):
+    config.yanom_globals.is_silent = True
+    Path(tmp_path, 'attachments').mkdir()
+    Path(tmp_path, 'attachments', 'one.pdf').write_text('one')
+    Path(tmp_path, 'attachments', 'two.pdf').write_text('two')
+    Path(tmp_path, 'file1.html').write_text('<p>note 1</p><a href="attachments/one.pdf">attachment</a>')
+    Path(tmp_path, 'file2.html').write_text('<p>note 2</p><a href="attachments/two.pdf">attachment</a>')
+    export_folder = Path(tmp_path, 'notes')
+
+    def run_conversion(full=False):
+        files_to_convert = set(tmp_path.glob('*.html'))
+        cd = config_data.ConfigData(f"{config.yanom_globals.data_dir}/config.ini", 'gfm', allow_no_value=True)
+        nc = notes_converter.NotesConvertor({'source': tmp_path}, cd)
+        nc.conversion_settings = conversion_settings.ConversionSettings()
+        nc.conversion_settings.conversion_input = 'html'
+        nc.conversion_settings.source = tmp_path
+        nc.conversion_settings.export_folder = export_folder
+        nc._full_conversion = full
+        nc._manifest = nc.create_conversion_manifest()
+        file_converter = file_converter_HTML_to_MD.HTMLToMDConverter(nc.conversion_settings, files_to_convert)
+        nc.process_files(files_to_convert, file_converter)
+        nc._manifest.save()
+        nc.get_list_of_orphan_files(content_link_management.get_set_of_all_files(tmp_path))
+        return nc
+
+    nc = run_conversion()
+    assert nc.note_page_count == 2
+    assert nc.conversion_settings.export_folder_absolute == export_folder
+
+    Path(tmp_path, 'file1.html').write_text('<p>note 1 changed</p><a href="attachments/one.pdf">attachment</a>')
+    nc = run_conversion()
+    assert nc.note_page_count == 1
+    assert nc.unchanged_source_count == 1
+    assert 'note 1 changed' in Path(export_folder, 'file1.md').read_text()
+    assert set(nc.attachment_details) == {Path(tmp_path, 'file1.html'), Path(tmp_path, 'file2.html')}
+    assert nc.attachment_details[Path(tmp_path, 'file2.html')]['copyable_absolute'] == \
+           {Path(tmp_path, 'attachments', 'two.pdf')}
+    assert not Path(export_folder, 'file1-old-1.md').exists()
+
+    Path(tmp_path, 'file2.html').unlink()
+    nc = run_conversion()
+    assert nc.note_page_count == 0
+    assert not Path(export_folder, 'file2.md').exists()
+    assert not Path(export_folder, 'attachments', 'two.pdf').exists()
+    assert Path(export_folder, 'attachments', 'one.pdf').exists()
+
+    nc = run_conversion(full=True)
+    assert nc.note_page_count == 1
+    assert nc.unchanged_source_count == 0
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import pytest
+
+import nsx_checkpoint
+from nsx_checkpoint import NSXCheckpoint
+
+
+@pytest.fixture
+def nsx_file(tmp_path):
+    nsx_file = Path(tmp_path, 'notes.nsx')
+    nsx_file.write_bytes(b'nsx content')
+    return nsx_file
+
+
+def test_completed_phases_and_note_pages_restored_on_resume(tmp_path, nsx_file):
+    checkpoint = NSXCheckpoint(tmp_path, nsx_file, 'settings')
+    checkpoint.complete_phase('notebook_folders', {'notebook_id': str(Path(tmp_path, 'notebook'))})
+    checkpoint.complete_note_page('note_id', {'image_count': 1})
+
+    resumed = NSXCheckpoint(tmp_path, nsx_file, 'settings', resume=True)
+
+    assert nsx_checkpoint.checkpoint_exists(tmp_path)
+    assert resumed.is_resumed
+    assert resumed.is_phase_completed('notebook_folders')
+    assert resumed.phase_data('notebook_folders') == {'notebook_id': str(Path(tmp_path, 'notebook'))}
+    assert not resumed.is_phase_completed('note_page_names')
+    assert resumed.completed_note_page('note_id') == {'image_count': 1}
+    assert resumed.completed_note_page('another_note_id') is None
+
+
+def test_partly_written_line_ignored(tmp_path, nsx_file):
+    checkpoint = NSXCheckpoint(tmp_path, nsx_file, 'settings')
+    checkpoint.complete_note_page('note_id', {'image_count': 1})
+    with open(checkpoint.path, 'a', encoding='utf-8') as journal:
+        journal.write('{"note_page": "another_no')
+
+    resumed = NSXCheckpoint(tmp_path, nsx_file, 'settings', resume=True)
+
+    assert list(resumed.completed_note_pages) == ['note_id']
+
+
+@pytest.mark.parametrize(
+    'settings, resume', [
+        ('changed settings', True),
+        ('settings', False),
+    ]
+)
+def test_checkpoint_not_resumed_for_changed_settings_or_new_conversion(tmp_path, nsx_file, settings, resume):
+    checkpoint = NSXCheckpoint(tmp_path, nsx_file, 'settings')
+    checkpoint.complete_phase('notebook_folders', {})
+
+    new_checkpoint = NSXCheckpoint(tmp_path, nsx_file, settings, resume=resume)
+
+    assert not new_checkpoint.is_phase_completed('notebook_folders')
+    assert not NSXCheckpoint(tmp_path, nsx_file, settings, resume=True).is_phase_completed('notebook_folders')
+
+
+def test_finish_removes_checkpoint(tmp_path, nsx_file):
+    checkpoint = NSXCheckpoint(tmp_path, nsx_file, 'settings')
+
+    checkpoint.finish()
+
+    assert not checkpoint.path.exists()
+    assert not nsx_checkpoint.checkpoint_exists(tmp_path)
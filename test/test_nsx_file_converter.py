@@ -79,7 +79,7 @@ def test_fetch_json_data(conv_setting):
 def test_fetch_attachment_file(conv_setting):
     nsx_fc = nsx_file_converter.NSXFile('fake_file', conv_setting, 'fake_pandoc_converter')
 
-    with patch('zip_file_reader.read_binary_file', spec=True, return_value='fake_binary'):
+    with patch('zip_file_reader.open_binary_file', spec=True, return_value='fake_binary'):
         result = nsx_fc.fetch_attachment_file('data_id', 'note title')
 
         assert result == 'fake_binary'
@@ -516,3 +516,184 @@ def test_process_nsx_file_no_note_page_ids(conv_setting, caplog):
         nsx_fc.process_nsx_file()
 
     assert f"No note page ids found in nsx file '{nsx_fc._nsx_file_name}'. Skipping nsx file" in caplog.messages
+
+
+@pytest.mark.parametrize(
+    'silent', [True, False]
+)
+def test_process_nsx_file_using_worker_processes_matches_sequential_processing(conv_setting, tmp_path, silent):
+    config.yanom_globals.is_silent = silent
+    conv_setting.conversion_input = 'nsx'
+    conv_setting.export_format = 'gfm'
+    nsx_file_path = Path(Path(__file__).parent, 'fixtures', 'test.nsx')
+
+    exported = []
+    for workers in (0, 3):
+        conv_setting.export_folder = Path(f'notes{workers}')
+        nsx_fc = nsx_file_converter.NSXFile(nsx_file_path, conv_setting,
+                                            pandoc_converter.PandocConverter(conv_setting), workers)
+        nsx_fc.process_nsx_file()
+
+        export_folder = Path(tmp_path, config.yanom_globals.data_dir, f'notes{workers}')
+        exported.append({
+            'files': {path.relative_to(export_folder): path.read_bytes()
+                      for path in export_folder.rglob('*') if path.is_file()},
+            'counts': (nsx_fc.note_page_count, nsx_fc.note_book_count, nsx_fc.image_count, nsx_fc.attachment_count),
+            'null_attachments': nsx_fc.null_attachments,
+        })
+
+    assert exported[0]['files']
+    assert exported[0] == exported[1]
+
+
+@pytest.mark.parametrize(
+    'export_format', ['gfm', 'obsidian', 'html']
+)
+def test_process_nsx_file_lxml_html_parser_matches_html_parser(conv_setting, tmp_path, export_format):
+    pytest.importorskip('lxml')
+    config.yanom_globals.is_silent = True
+    conv_setting.conversion_input = 'nsx'
+    conv_setting.export_format = export_format
+    nsx_file_path = Path(Path(__file__).parent, 'fixtures', 'test.nsx')
+
+    exported = []
+    try:
+        for html_parser in ('html.parser', 'lxml'):
+            config.yanom_globals.html_parser = html_parser
+            conv_setting.export_folder = Path(f'notes_{html_parser}')
+            nsx_fc = nsx_file_converter.NSXFile(nsx_file_path, conv_setting,
+                                                pandoc_converter.PandocConverter(conv_setting))
+            nsx_fc.process_nsx_file()
+
+            export_folder = Path(tmp_path, config.yanom_globals.data_dir, f'notes_{html_parser}')
+            exported.append({path.relative_to(export_folder): path.read_bytes()
+                             for path in export_folder.rglob('*') if path.is_file()})
+    finally:
+        config.yanom_globals.html_parser = 'html.parser'
+
+    assert exported[0]
+    assert exported[0] == exported[1]
+
+
+@pytest.mark.parametrize(
+    'workers, chart_workers', [(0, 0), (2, 0), (0, 2)]
+)
+def test_process_nsx_file_resumed_after_interruption_matches_uninterrupted_conversion(conv_setting, tmp_path,
+                                                                                       workers, chart_workers):
+    config.yanom_globals.is_silent = True
+    conv_setting.chart_workers = chart_workers
+    conv_setting.conversion_input = 'nsx'
+    conv_setting.export_format = 'gfm'
+    nsx_file_path = Path(Path(__file__).parent, 'fixtures', 'test.nsx')
+
+    conv_setting.export_folder = Path('notes')
+    nsx_file_converter.NSXFile(nsx_file_path, conv_setting, pandoc_converter.PandocConverter(conv_setting),
+                               workers).process_nsx_file()
+
+    conv_setting.export_folder = Path('resumed')
+    checkpoint_note_page = nsx_file_converter.NSXFile.checkpoint_note_page
+    completed_note_pages = []
+
+    def interrupt_after_two_note_pages(nsx_fc, note_page):
+        checkpoint_note_page(nsx_fc, note_page)
+        completed_note_pages.append(note_page.note_id)
+        if len(completed_note_pages) == 2:
+            raise KeyboardInterrupt
+
+    with patch.object(nsx_file_converter.NSXFile, 'checkpoint_note_page', interrupt_after_two_note_pages):
+        with pytest.raises(KeyboardInterrupt):
+            nsx_file_converter.NSXFile(nsx_file_path, conv_setting, pandoc_converter.PandocConverter(conv_setting),
+                                       workers).process_nsx_file()
+
+    conv_setting.export_folder = Path('resumed')  # the folder holding the checkpoint is used again
+    nsx_fc = nsx_file_converter.NSXFile(nsx_file_path, conv_setting, pandoc_converter.PandocConverter(conv_setting),
+                                        workers, resume=True)
+    with patch.object(sn_note_page.NotePage, 'convert_note_content', autospec=True,
+                      side_effect=sn_note_page.NotePage.convert_note_content) as convert_note_content:
+        nsx_fc.process_nsx_file()
+
+    exported = []
+    for folder in ('notes', 'resumed'):
+        export_folder = Path(tmp_path, config.yanom_globals.data_dir, folder)
+        exported.append({path.relative_to(export_folder): path.read_bytes()
+                         for path in export_folder.rglob('*') if path.is_file()})
+
+    assert exported[0]
+    assert exported[0] == exported[1]
+    if not workers:
+        assert convert_note_content.call_count == len(nsx_fc.note_pages) - 2
+
+
+@pytest.mark.parametrize(
+    'workers', [0, 2]
+)
+def test_process_nsx_file_streamed_matches_conversion_held_in_memory(conv_setting, tmp_path, workers):
+    config.yanom_globals.is_silent = True
+    conv_setting.conversion_input = 'nsx'
+    conv_setting.export_format = 'gfm'
+    nsx_file_path = Path(Path(__file__).parent, 'fixtures', 'test.nsx')
+
+    conv_setting.export_folder = Path('notes')
+    nsx_file_converter.NSXFile(nsx_file_path, conv_setting, pandoc_converter.PandocConverter(conv_setting),
+                               workers).process_nsx_file()
+
+    conv_setting.export_folder = Path('streamed')
+    conv_setting.stream_nsx_notes = True
+    nsx_fc = nsx_file_converter.NSXFile(nsx_file_path, conv_setting, pandoc_converter.PandocConverter(conv_setting),
+                                        workers)
+    nsx_fc.process_nsx_file()
+
+    exported = []
+    for folder in ('notes', 'streamed'):
+        export_folder = Path(tmp_path, config.yanom_globals.data_dir, folder)
+        exported.append({path.relative_to(export_folder): path.read_bytes()
+                         for path in export_folder.rglob('*') if path.is_file()})
+
+    assert exported[0]
+    assert exported[0] == exported[1]
+    assert all(note_page.raw_content is None and note_page.converted_content is None
+               for note_page in nsx_fc.note_pages.values())
+
+
+def test_process_nsx_file_chart_images_rendered_on_worker_processes_match(conv_setting, tmp_path):
+    config.yanom_globals.is_silent = True
+    conv_setting.conversion_input = 'nsx'
+    conv_setting.export_format = 'gfm'
+    nsx_file_path = Path(Path(__file__).parent, 'fixtures', 'test.nsx')
+
+    exported = []
+    for folder, chart_workers in (('notes', 0), ('rendered', 2)):
+        conv_setting.export_folder = Path(folder)
+        conv_setting.chart_workers = chart_workers
+        nsx_file_converter.NSXFile(nsx_file_path, conv_setting,
+                                   pandoc_converter.PandocConverter(conv_setting)).process_nsx_file()
+        export_folder = Path(tmp_path, config.yanom_globals.data_dir, folder)
+        exported.append({path.relative_to(export_folder): path.read_bytes()
+                         for path in export_folder.rglob('*') if path.is_file()})
+
+    assert any(path.name.endswith('-chart-1.png') for path in exported[0])
+    assert exported[0] == exported[1]
+
+
+def test_process_nsx_file_reuses_charts_cached_on_disk_by_earlier_conversion(conv_setting, tmp_path):
+    config.yanom_globals.is_silent = True
+    conv_setting.conversion_input = 'nsx'
+    conv_setting.export_format = 'gfm'
+    conv_setting.chart_cache_size_mb = 1
+    nsx_file_path = Path(Path(__file__).parent, 'fixtures', 'test.nsx')
+
+    exported = []
+    nsx_files = []
+    for folder in ('notes', 'cached'):
+        conv_setting.export_folder = Path(folder)
+        nsx_files.append(nsx_file_converter.NSXFile(nsx_file_path, conv_setting,
+                                                    pandoc_converter.PandocConverter(conv_setting)))
+        nsx_files[-1].process_nsx_file()
+        export_folder = Path(tmp_path, config.yanom_globals.data_dir, folder)
+        exported.append({path.relative_to(export_folder): path.read_bytes()
+                         for path in export_folder.rglob('*') if path.is_file()})
+
+    assert exported[0] == exported[1]
+    assert nsx_files[0].chart_renders_avoided == 0
+    assert nsx_files[1].chart_renders_avoided == 3  # the charts in the fixture are all different
+    assert Path(tmp_path, config.yanom_globals.data_dir, 'chart_cache').is_dir()
@@ -184,6 +184,18 @@ def test_update_content(all_notes, use_all_notes_expected):
     assert message == 'The following link(s) could not be corrected.\nOn page - Page 11 title - <a href="notestation://remote/self/1234-10">Page 10 renamed</a>\n'
 
 
+def test_update_content_same_result_when_called_again(all_notes):
+    link_processor = nsx_inter_note_link_processor.NSXInterNoteLinkProcessor()
+    link_processor.make_list_of_links(all_notes)
+    link_processor.match_link_title_to_notes(all_notes)
+    link_processor.match_renamed_links_using_link_ref_id()
+
+    first_result = link_processor.update_content(all_notes[2].raw_content)
+    second_result = link_processor.update_content(all_notes[2].raw_content)
+
+    assert first_result == second_result
+
+
 # Test below use notes only where links are valid title matches
 def test_make_list_of_links_use_only_title_matched_notes(use_only_title_matched_notes):
     link_processor = nsx_inter_note_link_processor.NSXInterNoteLinkProcessor()
@@ -252,4 +264,47 @@ def test_update_content_use_only_title_matched_notes_content_with_valid_link_tha
 
     result = link_processor.update_content(content)
 
-    assert result == content
\ No newline at end of file
+    assert result == content
+
+
+def test_match_renamed_links_using_link_ref_id_keeps_link_order(all_notes):
+    link_processor = nsx_inter_note_link_processor.NSXInterNoteLinkProcessor()
+    link_processor.make_list_of_links(all_notes)
+    expected_order = [link for link in link_processor.replacement_links]
+    link_processor.match_link_title_to_notes(all_notes)
+    link_processor.match_renamed_links_using_link_ref_id()
+
+    unmatched = link_processor.renamed_links_not_corrected
+    assert link_processor.replacement_links == [link for link in expected_order if link not in unmatched]
+
+
+def test_match_renamed_links_using_link_ref_id_uses_targets_of_every_matched_link_with_same_id(all_notes):
+    link_processor = nsx_inter_note_link_processor.NSXInterNoteLinkProcessor()
+    link_processor.make_list_of_links(all_notes)
+    link_processor.match_link_title_to_notes(all_notes)
+    link_processor.match_renamed_links_using_link_ref_id()
+
+    renamed_link = [link for link in link_processor.replacement_links if link.text == 'Page 1 renamed'][0]
+    matched_links_with_same_id = [link for link in link_processor.replacement_links
+                                  if link.link_id == renamed_link.link_id and link.text != 'Page 1 renamed']
+
+    assert len(renamed_link.target_notes) > 1
+    assert renamed_link.target_notes == [note
+                                         for link in matched_links_with_same_id
+                                         for note in link.target_notes]
+
+
+def test_update_content_uses_replacement_html_generated_once(all_notes, mocker):
+    link_processor = nsx_inter_note_link_processor.NSXInterNoteLinkProcessor()
+    link_processor.make_list_of_links(all_notes)
+    link_processor.match_link_title_to_notes(all_notes)
+    link_processor.match_renamed_links_using_link_ref_id()
+
+    replacement_text_lengths = [len(link.replacement_text) for link in link_processor.replacement_links]
+    spy = mocker.spy(nsx_inter_note_link_processor.NSXInterNoteLinkProcessor.IntraPageLink, 'generate_new_links')
+
+    for note in all_notes:
+        link_processor.update_content(note.raw_content)
+
+    assert spy.call_count == 0
+    assert [len(link.replacement_text) for link in link_processor.replacement_links] == replacement_text_lengths
@@ -287,3 +287,124 @@ def test_set_pandoc_path(monkeypatch, is_linux, if_frozen, expected_ends_with):
 
     found_path_as_posix_string = helper_functions.path_to_posix_str(Path(pandoc_processor._pandoc_path))
     assert found_path_as_posix_string.endswith(expected_ends_with)
+
+
+def test_convert_using_strings_no_server_by_default():
+    cs = conversion_settings.ConversionSettings()
+    pandoc_processor = pandoc_converter.PandocConverter(cs)
+
+    pandoc_processor.convert_using_strings('<p>hello world</p>', 'my_note')
+
+    assert pandoc_processor._server is None
+
+
+def test_convert_using_strings_server_matches_subprocess_output():
+    cs = conversion_settings.ConversionSettings()
+    cs.pandoc_workers = 1
+    cs.html_fast_path = False
+    pandoc_processor = pandoc_converter.PandocConverter(cs)
+    if not pandoc_processor._find_pandoc_server_command():
+        pytest.skip('pandoc server is not available')
+    html = '<h2>Title</h2><p>hello <strong>world</strong></p><ul><li>one</li><li>two</li></ul>'
+
+    expected = pandoc_processor._convert_using_subprocess(html, 'my_note')
+    result = pandoc_processor.convert_using_strings(html, 'my_note')
+
+    assert pandoc_processor._server.is_alive()
+    pandoc_processor.close()
+    assert result == expected
+
+
+def test_convert_using_strings_starts_one_server_whatever_pandoc_workers_is(monkeypatch):
+    started_servers = []
+    cs = conversion_settings.ConversionSettings()
+    cs.pandoc_workers = 4
+    cs.html_fast_path = False
+    pandoc_processor = pandoc_converter.PandocConverter(cs)
+    monkeypatch.setattr(pandoc_converter.PandocConverter, '_find_pandoc_server_command', lambda _self: ['pandoc'])
+    monkeypatch.setattr(pandoc_converter.PandocServer, 'start', lambda server: started_servers.append(server) or True)
+    monkeypatch.setattr(pandoc_converter.PandocServer, 'convert', lambda *args: 'from server')
+
+    results = [pandoc_processor.convert_using_strings(f'<p>note {n}</p>', 'my_note') for n in range(3)]
+
+    assert results == ['from server'] * 3
+    assert len(started_servers) == 1
+
+
+def test_convert_using_strings_falls_back_to_subprocess_when_server_fails(caplog, monkeypatch):
+    def mock_request(_ignored, request_options, input_data):
+        raise ConnectionResetError('server crashed')
+
+    cs = conversion_settings.ConversionSettings()
+    cs.pandoc_workers = 1
+    cs.html_fast_path = False
+    pandoc_processor = pandoc_converter.PandocConverter(cs)
+    if not pandoc_processor._find_pandoc_server_command():
+        pytest.skip('pandoc server is not available')
+    monkeypatch.setattr(pandoc_converter.PandocServer, '_request', mock_request)
+    caplog.clear()
+
+    result = pandoc_processor.convert_using_strings('<p>hello world</p>', 'my_note')
+
+    assert pandoc_processor._server.is_alive()
+    pandoc_processor.close()
+    assert result == 'hello world\n'
+    assert 'Pandoc server failed, restarting server - server crashed' in caplog.messages
+    assert 'Pandoc server unable to convert note "my_note", using pandoc subprocess' in caplog.messages
+
+
+def test_pandoc_server_convert_returns_none_when_not_started():
+    server = pandoc_converter.PandocServer(['fake_pandoc_server'])
+
+    assert server.convert({}, 'hello world') is None
+
+
+def test_convert_using_strings_uses_result_cache(tmp_path, monkeypatch):
+    cs = conversion_settings.ConversionSettings()
+    cs.working_directory = tmp_path
+    cs.pandoc_cache_size_mb = 1
+    cs.html_fast_path = False
+    pandoc_processor = pandoc_converter.PandocConverter(cs)
+
+    first_result = pandoc_processor.convert_using_strings('<p>hello world</p>', 'my_note')
+    monkeypatch.setattr(pandoc_converter.PandocConverter, '_convert', lambda *args: 'not from cache')
+    second_result = pandoc_processor.convert_using_strings('<p>hello world</p>', 'my_note')
+
+    assert first_result == second_result == 'hello world\n'
+    assert pandoc_processor.cache_hits == 1
+    assert pandoc_processor.cache_misses == 1
+    assert len(list(Path(tmp_path, config.yanom_globals.data_dir, 'pandoc_cache').glob('*/*'))) == 1
+
+
+def test_convert_using_strings_result_cache_key_includes_pandoc_options(tmp_path):
+    key_gfm = pandoc_converter.PandocResultCache.make_key('<p>hello</p>', ['pandoc', '-t', 'gfm'], '2.19.2')
+    key_html = pandoc_converter.PandocResultCache.make_key('<p>hello</p>', ['pandoc', '-t', 'html'], '2.19.2')
+    key_version = pandoc_converter.PandocResultCache.make_key('<p>hello</p>', ['pandoc', '-t', 'gfm'], '3.1')
+
+    assert len({key_gfm, key_html, key_version}) == 3
+
+
+@pytest.mark.parametrize(
+    'export_format, html_fast_path, html, expected_pandoc_runs', [
+        ('gfm', True, '<p>hello world</p>', 0),
+        ('obsidian', True, '<p>hello world</p>', 0),
+        ('gfm', True, '<ul><li>hello world</li></ul>', 1),
+        ('gfm', False, '<p>hello world</p>', 1),
+        ('commonmark', True, '<p>hello world</p>', 1),
+    ]
+)
+def test_convert_using_strings_converts_simple_html_without_pandoc(monkeypatch, export_format, html_fast_path,
+                                                                   html, expected_pandoc_runs):
+    pandoc_runs = []
+    cs = conversion_settings.ConversionSettings()
+    cs.conversion_input = 'nsx'
+    cs.export_format = export_format
+    cs.html_fast_path = html_fast_path
+    pandoc_processor = pandoc_converter.PandocConverter(cs)
+    monkeypatch.setattr(pandoc_converter.PandocConverter, '_convert',
+                        lambda _self, input_data, note_title: pandoc_runs.append(input_data) or 'from pandoc')
+
+    result = pandoc_processor.convert_using_strings(html, 'my_note')
+
+    assert len(pandoc_runs) == expected_pandoc_runs
+    assert result == ('from pandoc' if expected_pandoc_runs else 'hello world\n')
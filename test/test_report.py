@@ -1,3 +1,5 @@
+from unittest.mock import MagicMock
+
 import config
 
 import pytest
@@ -42,3 +44,37 @@ def test_output_results_if_not_silent_mode_when_in_silent_mode(capsys, silent, r
     report_generator.output_results_if_not_silent_mode()
     captured = capsys.readouterr()
     assert captured.out == expected
+
+
+@pytest.mark.parametrize(
+    'hits, misses, expected_in_summary', [
+        (0, 0, False),
+        (3, 1, True),
+    ]
+)
+def test_get_conversion_summary_pandoc_cache_results(hits, misses, expected_in_summary):
+    note_converter = MagicMock(note_book_count=0, note_page_count=0, image_count=0, attachment_count=0,
+                               nsx_backups=[], pandoc_cache_hits=hits, pandoc_cache_misses=misses,
+                               unchanged_source_count=0, chart_renders_avoided=0)
+    report_generator = report.Report(note_converter)
+
+    result = report_generator.get_conversion_summary()
+
+    assert ('Pandoc cache - 3 hits and 1 misses' in result) is expected_in_summary
+
+
+@pytest.mark.parametrize(
+    'renders_avoided, expected_in_summary', [
+        (0, False),
+        (2, True),
+    ]
+)
+def test_get_conversion_summary_chart_renders_avoided(renders_avoided, expected_in_summary):
+    note_converter = MagicMock(note_book_count=0, note_page_count=0, image_count=0, attachment_count=0,
+                               nsx_backups=[], pandoc_cache_hits=0, pandoc_cache_misses=0,
+                               unchanged_source_count=0, chart_renders_avoided=renders_avoided)
+    report_generator = report.Report(note_converter)
+
+    result = report_generator.get_conversion_summary()
+
+    assert ('Chart cache - 2 chart renders avoided' in result) is expected_in_summary
@@ -160,7 +160,7 @@ def test_test_change_file_name_image_attachment_no_extension_on_file_name(mocker
     image_attachment = sn_attachment.ImageNSAttachment(note, attachment_id)
 
     image_attachment._name = 'ns_attach_image_my_file'
-    mocker.patch('zip_file_reader.read_binary_file', return_value=b'1234')
+    mocker.patch('zip_file_reader.read_file_header', return_value=b'1234')
     mocker.patch('helper_functions.file_extension_from_bytes', return_value='.png')
     image_attachment.create_file_name()
 
@@ -173,7 +173,7 @@ def test_test_change_file_name_image_attachment_no_extension_on_file_name_and_no
     image_attachment = sn_attachment.ImageNSAttachment(note, attachment_id)
 
     image_attachment._name = 'ns_attach_image_my_file'
-    mocker.patch('zip_file_reader.read_binary_file', return_value=b'1234')
+    mocker.patch('zip_file_reader.read_file_header', return_value=b'1234')
     mocker.patch('helper_functions.file_extension_from_bytes', return_value=None)
     image_attachment.create_file_name()
 
@@ -186,7 +186,7 @@ def test_test_change_file_name_file_attachment_no_extension_on_file_name(mocker)
     image_attachment = sn_attachment.FileNSAttachment(note, attachment_id)
 
     image_attachment._name = 'my_file'
-    mocker.patch('zip_file_reader.read_binary_file', return_value=b'1234')
+    mocker.patch('zip_file_reader.read_file_header', return_value=b'1234')
     mocker.patch('helper_functions.file_extension_from_bytes', return_value='.pdf')
     image_attachment.create_file_name()
 
@@ -199,7 +199,7 @@ def test_test_change_file_name_file_attachment_no_extension_on_file_name_and_not
     image_attachment = sn_attachment.FileNSAttachment(note, attachment_id)
 
     image_attachment._name = 'my_file'
-    mocker.patch('zip_file_reader.read_binary_file', return_value=b'1234')
+    mocker.patch('zip_file_reader.read_file_header', return_value=b'1234')
     mocker.patch('helper_functions.file_extension_from_bytes', return_value=None)
     image_attachment.create_file_name()
 
@@ -1,7 +1,9 @@
 from mock import patch
+import os
 from pathlib import Path
 import pytest
 import logging
+import subprocess
 import sys
 
 import config
@@ -45,6 +47,12 @@ def test_set_logging_level_invalid_arg(tmp_path, caplog):
         (['--cli'], ('cli', True)),
         (['-c'], ('cli', True)),
         (['--source', 'Notes'], ('source', 'Notes')),
+        (['--workers', '4'], ('workers', 4)),
+        (['-w', '4'], ('workers', 4)),
+        ([], ('workers', 0)),
+        (['--full'], ('full', True)),
+        (['--resume'], ('resume', True)),
+        ([], ('full', False)),
         ]
 )
 def test_command_line_parser(command_line_args, expected, tmp_path):
@@ -143,3 +151,16 @@ def test_handle_unhandled_exception_keyboard_interupt(caplog):
 
     assert len(caplog.records) == 1
     assert "Cancelled by User" in caplog.text
+
+
+def test_import_of_yanom_does_not_import_libraries_only_used_by_some_conversions():
+    source_folder = Path(Path(__file__).parent.parent, 'src')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import yanom'], cwd=source_folder,
+                            env={**os.environ, 'PYTHONPATH': str(source_folder)}, capture_output=True, text=True,
+                            check=True)
+
+    imported_packages = {line.split('|')[-1].strip().split('.')[0] for line in result.stderr.splitlines()
+                         if line.startswith('import time:')}
+
+    assert 'yanom' in imported_packages
+    assert not imported_packages & {'matplotlib', 'pandas', 'PyInquirer', 'pyfiglet'}
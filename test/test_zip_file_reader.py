@@ -1,8 +1,10 @@
+from concurrent.futures import ThreadPoolExecutor
 import json
 from pathlib import Path
 import zipfile
 
 import config
+import helper_functions
 import pytest
 
 import zip_file_reader
@@ -264,3 +266,115 @@ class TestListFilesInZipFile:
         assert result == expected
         assert f'Directory ' in caplog.messages[0]
         assert caplog.records[0].levelname == 'WARNING'
+
+
+def test_read_binary_file_reuses_open_zip_file_until_closed(tmp_path, monkeypatch):
+    zip_filename = Path(tmp_path, 'test_zip.zip')
+    with zipfile.ZipFile(str(zip_filename), 'w') as zip_file:
+        zip_file.writestr('file1.bin', b'file 1')
+        zip_file.writestr('file2.bin', b'file 2')
+
+    opened = []
+    original_zip_file = zipfile.ZipFile
+
+    def counting_zip_file(*args, **kwargs):
+        opened.append(args[0])
+        return original_zip_file(*args, **kwargs)
+
+    monkeypatch.setattr(zipfile, 'ZipFile', counting_zip_file)
+
+    assert zip_file_reader.read_binary_file(zip_filename, Path('file1.bin')) == b'file 1'
+    assert zip_file_reader.read_binary_file(zip_filename, Path('file2.bin')) == b'file 2'
+    assert zip_file_reader.read_text(zip_filename, Path('file1.bin')) == 'file 1'
+    assert len(opened) == 1
+
+    zip_file_reader.close_zip_file(zip_filename)
+    assert zip_file_reader.read_binary_file(zip_filename, Path('file1.bin')) == b'file 1'
+    zip_file_reader.close_zip_file(zip_filename)
+
+    assert len(opened) == 2
+
+
+def test_zip_file_reader_reopens_zip_file_changed_on_disk(tmp_path):
+    zip_filename = Path(tmp_path, 'test_zip.zip')
+    with zipfile.ZipFile(str(zip_filename), 'w') as zip_file:
+        zip_file.writestr('file.txt', 'old content')
+    reader = zip_file_reader.ZipFileReader(zip_filename)
+    assert reader.read(Path('file.txt')) == b'old content'
+
+    with zipfile.ZipFile(str(zip_filename), 'w') as zip_file:
+        zip_file.writestr('file.txt', 'new content that is longer')
+
+    assert reader.read(Path('file.txt')) == b'new content that is longer'
+    reader.close()
+
+
+def test_zip_file_reader_shared_between_threads(tmp_path):
+    zip_filename = Path(tmp_path, 'test_zip.zip')
+    with zipfile.ZipFile(str(zip_filename), 'w') as zip_file:
+        for n in range(20):
+            zip_file.writestr(f'file{n}.txt', f'content {n}' * 1000)
+    reader = zip_file_reader.ZipFileReader(zip_filename)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda n: reader.read(Path(f'file{n % 20}.txt')), range(200)))
+
+    reader.close()
+    assert results == [f'content {n % 20}'.encode('utf-8') * 1000 for n in range(200)]
+
+
+def test_open_binary_file(tmp_path):
+    zip_filename = Path(tmp_path, 'test_zip.zip')
+    expected = b'Hello World' * 100000
+
+    with zipfile.ZipFile(str(zip_filename), 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr('file.bin', expected)
+
+    with zip_file_reader.open_binary_file(zip_filename, Path('file.bin')) as stream:
+        first_chunk = stream.read(1024)
+        rest = stream.read()
+
+    zip_file_reader.close_zip_file(zip_filename)
+    assert first_chunk + rest == expected
+
+
+def test_open_binary_file_bad_file_name(tmp_path, caplog):
+    zip_filename = Path(tmp_path, 'test_zip.zip')
+
+    with zipfile.ZipFile(str(zip_filename), 'w') as zip_file:
+        zip_file.writestr('file.bin', b'Hello World')
+
+    result = zip_file_reader.open_binary_file(zip_filename, Path('bad_file_name'), 'note title')
+
+    zip_file_reader.close_zip_file(zip_filename)
+    assert result is None
+    assert f'Warning - For the note "note title" - unable to find the file "bad_file_name" in the zip file "{zip_filename}"' in caplog.messages
+
+
+def test_read_file_header_reads_only_start_of_file(tmp_path):
+    zip_filename = Path(tmp_path, 'test_zip.zip')
+    content = b'\x89PNG\r\n\x1a\n' + b'0' * 100000
+
+    with zipfile.ZipFile(str(zip_filename), 'w', compression=zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.writestr('image', content)
+
+    result = zip_file_reader.read_file_header(zip_filename, Path('image'))
+    short_result = zip_file_reader.read_file_header(zip_filename, Path('image'), size=4)
+
+    zip_file_reader.close_zip_file(zip_filename)
+    assert result == content[:helper_functions.FILE_TYPE_HEADER_SIZE]
+    assert short_result == b'\x89PNG'
+    assert helper_functions.file_extension_from_bytes(result) == '.png'
+
+
+def test_read_file_header_bad_file_name(tmp_path, caplog):
+    zip_filename = Path(tmp_path, 'test_zip.zip')
+
+    with zipfile.ZipFile(str(zip_filename), 'w') as zip_file:
+        zip_file.writestr('file.bin', b'Hello World')
+
+    result = zip_file_reader.read_file_header(zip_filename, Path('bad_file_name'), 'note title')
+
+    zip_file_reader.close_zip_file(zip_filename)
+    assert result is None
+    assert f'Warning - For the note "note title" - unable to find the file "bad_file_name" in the zip file "{zip_filename}"' in caplog.messages